@@ -80,6 +80,11 @@ CONFIG_DEFAULT: Dict[str, GSC] = {
         "二重螺旋API代理地址",
         "",
     ),
+    "DNAWsUrl": GsStrConfig(
+        "二重螺旋WebSocket地址",
+        "为空时使用官方地址，用于连接本地模拟服务，新建连接时生效",
+        "",
+    ),
     "LocalProxyUrl": GsStrConfig(
         "本地代理地址",
         "本地代理地址",
@@ -109,6 +114,99 @@ CONFIG_DEFAULT: Dict[str, GSC] = {
         5,
         30,
     ),
+    "ApiEndpointRateLimit": GsListStrConfig(
+        "接口限速",
+        "格式 路由名:每秒次数:突发次数，路由名为DNAApi方法名，all作用于用户请求，sign作用于自动签到请求",
+        [
+            "all:30:60",
+            "sign:20:40",
+            "login_log:5:10",
+            "game_sign:10:20",
+            "bbs_sign:10:20",
+            "get_post_detail:10:20",
+            "do_like:5:10",
+            "do_share:5:10",
+            "do_reply:2:5",
+        ],
+        options=[],
+    ),
+    "ApiBreakerFailureThreshold": GsIntConfig(
+        "API熔断失败次数",
+        "连续请求失败达到该次数后暂停请求二重螺旋API",
+        5,
+        100,
+    ),
+    "ApiBreakerCooldown": GsIntConfig(
+        "API熔断时间",
+        "熔断后暂停请求的时间(秒)",
+        30,
+        600,
+    ),
+    "HttpPoolLimit": GsIntConfig(
+        "HTTP连接池总连接数",
+        "请求二重螺旋API的最大并发连接数，重启生效",
+        100,
+        1000,
+    ),
+    "HttpPoolLimitPerHost": GsIntConfig(
+        "HTTP连接池单域名连接数",
+        "对同一域名的最大并发连接数，0为不限制，重启生效",
+        30,
+        1000,
+    ),
+    "HttpKeepaliveTimeout": GsIntConfig(
+        "HTTP空闲连接保持时间",
+        "空闲连接保持的秒数，重启生效",
+        30,
+        600,
+    ),
+    "HttpDnsCacheTTL": GsIntConfig(
+        "HTTP DNS缓存时间",
+        "DNS解析结果缓存秒数，重启生效",
+        300,
+        86400,
+    ),
+    "HttpConnectTimeout": GsIntConfig(
+        "HTTP连接超时",
+        "建立连接的超时时间(秒)",
+        5,
+        60,
+    ),
+    "HttpQueryTimeout": GsIntConfig(
+        "查询类接口超时",
+        "角色、便签、日历等查询接口的超时时间(秒)",
+        15,
+        120,
+    ),
+    "HttpTaskTimeout": GsIntConfig(
+        "任务类接口超时",
+        "签到、社区任务等接口的超时时间(秒)",
+        30,
+        120,
+    ),
+    "SignExecutorWorkers": GsIntConfig(
+        "签名执行池大小",
+        "同时执行签名的线程数，修改后立即生效",
+        4,
+        64,
+    ),
+    "DBLockMode": GsStrConfig(
+        "数据库写锁模式",
+        "keyed=按记录加锁，不同用户/群的写入互不等待;global=全局一把锁(SQLite 频繁出现 database is locked 时使用)",
+        "keyed",
+        options=["keyed", "global"],
+    ),
+    "ApiCassetteMode": GsStrConfig(
+        "接口录像模式",
+        "off=关闭;record=录制成功响应(已脱敏);replay=只从录像回放，不访问网络",
+        "off",
+        options=["off", "record", "replay"],
+    ),
+    "ApiCassetteName": GsStrConfig(
+        "接口录像名称",
+        "录像保存在 DNAUID/cassette/<名称>.jsonl.gz",
+        "default",
+    ),
     "RoleInfoCard": GsBoolConfig(
         "角色信息卡片是否显示未拥有的角色和武器",
         "开启就显示全部，关闭只显示已拥有的角色和武器",
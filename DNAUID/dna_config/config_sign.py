@@ -58,10 +58,28 @@ CONFIG_SIGN: Dict[str, GSC] = {
     ),
     "SignTime": _sign_time_config,
     "SigninConcurrentNum": GsIntConfig("自动签到并发数量", "自动签到并发数量", 1, max_value=50),
-    "SigninConcurrentNumInterval": GsListStrConfig(
-        "自动签到并发数量间隔，默认3-5秒",
-        "自动签到并发数量间隔，默认3-5秒",
-        ["3", "5"],
+    "SignWsPrewarmNum": GsIntConfig(
+        "自动签到预建连接数量",
+        "自动签到时提前为接下来的N个账号建立WebSocket连接",
+        5,
+        max_value=100,
+    ),
+    "SignWriteBatchSize": GsIntConfig(
+        "签到结果批量写入数量",
+        "签到结果在内存中累计N条后批量写入数据库",
+        100,
+        max_value=1000,
+    ),
+    "SignWriteFlushInterval": GsIntConfig(
+        "签到结果写入间隔",
+        "签到结果最多在内存中停留的秒数",
+        5,
+        max_value=60,
+    ),
+    "SignAccountRateLimit": GsListStrConfig(
+        "单账号请求限速",
+        "自动签到时同一账号每秒请求次数,突发次数，默认1,3",
+        ["1", "3"],
     ),
     "PrivateSignReport": GsBoolConfig(
         "签到私聊报告",
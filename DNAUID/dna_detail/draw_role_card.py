@@ -23,17 +23,21 @@ from ..utils.image import (
     get_paint_img,
     get_skill_img,
     get_weapon_img,
+    get_user_avatar,
     get_smooth_drawer,
     get_avatar_title_img,
 )
 from ..utils.utils import get_using_id, is_uid_hidden
 from ..utils.api.model import (
+    RoleDetail,
     WeaponDetail,
     RoleInsForTool,
+    RoleShowForTool,
     DNARoleDetailRes,
     DNARoleForToolRes,
     DNAWeaponDetailRes,
 )
+from ..utils.fetch_plan import FetchPlan
 from ..utils.msgs.notify import (
     dna_not_found,
     dna_uid_invalid,
@@ -107,17 +111,50 @@ async def draw_role_card(bot: Bot, ev: Event, char_name: str):
         return
     char_name = real_char_name
 
-    default_role = await dna_api.get_default_role_for_tool(dna_user.cookie, dna_user.dev_code)
-    if not default_role.is_success:
+    async def fetch_role_show() -> Optional[RoleShowForTool]:
+        res = await dna_api.get_default_role_for_tool(dna_user.cookie, dna_user.dev_code)
+        if not res.is_success:
+            return None
+        return res.parse_data(DNARoleForToolRes).roleInfo.roleShow
+
+    def find_role_char(role_show: RoleShowForTool) -> Optional[RoleInsForTool]:
+        return next((i for i in role_show.roleChars if str(i.charId) == char_id), None)
+
+    async def fetch_role_detail(role_char: RoleInsForTool) -> Optional[RoleDetail]:
+        if not role_char.unLocked or not role_char.charEid:
+            return None
+        res = await dna_api.get_role_detail(dna_user.cookie, char_id, role_char.charEid, dna_user.dev_code)
+        if not res.is_success:
+            return None
+        return res.parse_data(DNARoleDetailRes).charDetail
+
+    async def fetch_con_weapon(role_detail: RoleDetail) -> Optional[WeaponDetail]:
+        if not role_detail.conWeaponId or not role_detail.conWeaponEid:
+            return None
+        res = await dna_api.get_weapon_detail(
+            dna_user.cookie, role_detail.conWeaponId, role_detail.conWeaponEid, dna_user.dev_code
+        )
+        if not res.is_success:
+            return None
+        return res.parse_data(DNAWeaponDetailRes).weaponDetail
+
+    # 角色详情依赖展柜，武器与立绘依赖角色详情；隐私设置、头像与之并发获取
+    plan = FetchPlan()
+    plan.add("role_show", fetch_role_show)
+    plan.add("role_char", find_role_char, "role_show")
+    plan.add("role_detail", fetch_role_detail, "role_char")
+    plan.add("con_weapon", fetch_con_weapon, "role_detail")
+    plan.add("paint", lambda role_detail: get_paint_img(char_id, role_detail.paint), "role_detail")
+    plan.add("uid_hidden", lambda: is_uid_hidden(user_id, ev.bot_id, ev.group_id))
+    plan.add("avatar", lambda: get_user_avatar(ev, user_id))
+    results = await plan.run()
+
+    role_show: Optional[RoleShowForTool] = results["role_show"]
+    if not role_show:
         await dna_not_found(bot, ev, "角色列表信息")
         return
 
-    default_role = DNARoleForToolRes.model_validate(default_role.data)
-    role_show = default_role.roleInfo.roleShow
-
-    role_char_simple: Optional[RoleInsForTool] = next(
-        (i for i in role_show.roleChars if str(i.charId) == char_id), None
-    )
+    role_char_simple: Optional[RoleInsForTool] = results["role_char"]
     if not role_char_simple:
         await dna_not_found(bot, ev, f"展柜角色【{char_name}】")
         return
@@ -126,27 +163,15 @@ async def draw_role_card(bot: Bot, ev: Event, char_name: str):
         await dna_not_unlocked(bot, ev, f"当前展柜角色【{char_name}】")
         return
 
-    role_detail = await dna_api.get_role_detail(dna_user.cookie, char_id, role_char_simple.charEid, dna_user.dev_code)
-    if not role_detail.is_success:
+    role_detail: Optional[RoleDetail] = results["role_detail"]
+    if not role_detail:
         await dna_not_found(bot, ev, f"角色【{char_name}】详情")
         return
 
-    role_detail = DNARoleDetailRes.model_validate(role_detail.data)
-    role_detail = role_detail.charDetail
-
-    con_weapon_detail: Optional[WeaponDetail] = None
-    if role_detail.conWeaponId and role_detail.conWeaponEid:
-        con_weapon = await dna_api.get_weapon_detail(
-            dna_user.cookie, role_detail.conWeaponId, role_detail.conWeaponEid, dna_user.dev_code
-        )
-        if con_weapon.is_success:
-            con_weapon = DNAWeaponDetailRes.model_validate(con_weapon.data)
-            con_weapon_detail = con_weapon.weaponDetail
+    con_weapon_detail: Optional[WeaponDetail] = results["con_weapon"]
 
     # 提前获取头像与分割线，用于计算总高度
     div_img = get_div()
-    # 检查 UID 是否应该被隐藏
-    uid_hidden = await is_uid_hidden(user_id, ev.bot_id, ev.group_id)
     avatar_title = await get_avatar_title_img(
         ev,
         role_show.roleId,
@@ -154,7 +179,8 @@ async def draw_role_card(bot: Bot, ev: Event, char_name: str):
         user_level=role_show.level,
         other_info=[(i.paramKey, i.paramValue) for i in role_show.params if i.paramKey in ("总活跃天数", "游戏时长")],
         avatar_user_id=user_id,
-        uid_hidden=uid_hidden,
+        uid_hidden=results["uid_hidden"],
+        avatar=results["avatar"],
     )
     avatar_title = avatar_title.resize((1000, 1000 * avatar_title.height // avatar_title.width))
     con_weapon_h = 450 if con_weapon_detail else 0
@@ -162,7 +188,7 @@ async def draw_role_card(bot: Bot, ev: Event, char_name: str):
     card = get_dna_bg(1000, total_h, "bg2")
 
     # paint
-    paint_img = await get_paint_img(char_id, role_detail.paint)
+    paint_img = results["paint"]
     paint_img = paint_img.resize((int(1320 * 0.8), int(1320 * 0.8)))
     card.alpha_composite(paint_img, (-280, -100))
 
@@ -47,7 +47,7 @@ async def _fetch_and_update_cache(
     if not res.is_success:
         return
 
-    mh_result = DNAMHRes.model_validate(res.data).instanceInfo
+    mh_result = res.parse_data(DNAMHRes).instanceInfo
     if not mh_result:
         return
 
@@ -2,6 +2,7 @@ from gsuid_core.bot import Bot
 from gsuid_core.models import Event
 
 from ..utils.database.models import DNABind, DNAPrivacy, DNAGroupPrivacy
+from ..utils.database.privacy_cache import privacy_resolver
 
 
 async def _check_group_force_setting(
@@ -24,14 +25,13 @@ async def _check_group_force_setting(
         - 错误消息: 如果有强制设置且无法修改
         - None: 可以正常修改
     """
-    group_privacy = await DNAGroupPrivacy.get_group_privacy(group_id, bot_id)
-    if group_privacy is not None:
-        force_value = getattr(group_privacy, field_name, None)
-        if force_value is not None:
-            if force_value:
-                return enable_msg
-            else:
-                return disable_msg
+    group_privacy = await privacy_resolver.get_group(group_id, bot_id)
+    force_value = getattr(group_privacy, field_name, None)
+    if force_value is not None:
+        if force_value:
+            return enable_msg
+        else:
+            return disable_msg
     return None
 
 
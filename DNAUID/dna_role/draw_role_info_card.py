@@ -86,7 +86,7 @@ async def draw_role_info_card(bot: Bot, ev: Event):
         await dna_not_found(bot, ev, "角色列表信息")
         return
 
-    default_role = DNARoleForToolRes.model_validate(default_role.data)
+    default_role = default_role.parse_data(DNARoleForToolRes)
     role_show = default_role.roleInfo.roleShow
     # 解锁角色数量
     role_unlocked_count = len([i for i in role_show.roleChars if i.unLocked])
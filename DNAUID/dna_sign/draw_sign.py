@@ -1,4 +1,5 @@
 import math
+from typing import Optional
 from pathlib import Path
 
 from PIL import Image, ImageDraw
@@ -17,6 +18,7 @@ from ..utils.image import (
     get_div,
     add_footer,
     get_dna_bg,
+    get_user_avatar,
     get_smooth_drawer,
     get_avatar_title_img,
     download_pic_from_url,
@@ -28,6 +30,7 @@ from ..utils.api.model import (
     DNATaskProcessRes,
     DNACalendarSignRes,
 )
+from ..utils.fetch_plan import FetchPlan
 from ..utils.msgs.notify import dna_not_found
 from ..utils.database.models import DNABind
 from ..utils.fonts.dna_fonts import (
@@ -55,6 +58,7 @@ async def _draw_sign_calendar(
     task_process: DNATaskProcessRes,
     bbs_total_sign_in_day: int,
     uid_hidden: bool = False,
+    avatar: Optional[Image.Image] = None,
 ):
     task_list = task_process.dailyTask if task_process else None
 
@@ -79,6 +83,7 @@ async def _draw_sign_calendar(
         role_show.roleName,
         user_level=role_show.level,
         uid_hidden=uid_hidden,
+        avatar=avatar,
     )
     card.alpha_composite(avatar_title, (0, start_y))
     start_y += title_h
@@ -192,40 +197,48 @@ async def draw_sign_calendar(bot: Bot, ev: Event):
     if not dna_user:
         return
 
-    have_sign_in_resp = await dna_api.have_sign_in(dna_user.cookie, dna_user.dev_code)
+    # 签到日历所需的接口互不依赖，并发获取
+    plan = FetchPlan()
+    plan.add("have_sign_in", lambda: dna_api.have_sign_in(dna_user.cookie, dna_user.dev_code))
+    plan.add("sign_calendar", lambda: dna_api.sign_calendar(dna_user.cookie, dna_user.dev_code))
+    plan.add("task_process", lambda: dna_api.get_task_process(dna_user.cookie, dna_user.dev_code))
+    plan.add("default_role", lambda: dna_api.get_default_role_for_tool(dna_user.cookie, dna_user.dev_code))
+    plan.add("uid_hidden", lambda: is_uid_hidden(ev.user_id, ev.bot_id, ev.group_id))
+    plan.add("avatar", lambda: get_user_avatar(ev))
+    results = await plan.run()
+
+    have_sign_in_resp = results["have_sign_in"]
     if not have_sign_in_resp.is_success or not isinstance(have_sign_in_resp.data, dict):
         return
     bbs_total_sign_in_day = have_sign_in_resp.data.get("totalSignInDay", 0)
 
-    sign_resp = await dna_api.sign_calendar(dna_user.cookie, dna_user.dev_code)
+    sign_resp = results["sign_calendar"]
     if not sign_resp.is_success:
         return
 
     sign_raw_data = sign_resp.data if isinstance(sign_resp.data, dict) else {}
     sign_data = DNACalendarSignRes.model_validate(sign_raw_data)
 
-    task_process_resp = await dna_api.get_task_process(dna_user.cookie, dna_user.dev_code)
+    task_process_resp = results["task_process"]
     if not task_process_resp.is_success:
         return
 
-    task_process = DNATaskProcessRes.model_validate(task_process_resp.data)
+    task_process = task_process_resp.parse_data(DNATaskProcessRes)
 
-    default_role = await dna_api.get_default_role_for_tool(dna_user.cookie, dna_user.dev_code)
+    default_role = results["default_role"]
     if not default_role.is_success:
         await dna_not_found(bot, ev, "角色列表信息")
         return
-    default_role = DNARoleForToolRes.model_validate(default_role.data)
+    default_role = default_role.parse_data(DNARoleForToolRes)
     role_show = default_role.roleInfo.roleShow
 
-    # 检查 UID 是否应该被隐藏
-    uid_hidden = await is_uid_hidden(ev.user_id, ev.bot_id, ev.group_id)
-
     msg = await _draw_sign_calendar(
         ev,
         role_show,
         sign_data,
         task_process,
         bbs_total_sign_in_day,
-        uid_hidden,
+        results["uid_hidden"],
+        results["avatar"],
     )
     await bot.send(msg)
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Dict, List, Literal
+from typing import Dict, List, Tuple, Union, Literal, Optional
 
 from PIL import Image, ImageDraw
 
@@ -16,19 +16,23 @@ from .sign_service import (
     sched_sign,
     master_sign,
     can_bbs_sign,
-    get_sign_interval,
     sign_concurrent_num,
+    sign_ws_prewarm_num,
 )
 from ..utils.boardcast import send_board_cast_msg
 from ..utils.msgs.notify import send_dna_notify
+from ..utils.api.cassette import cassette_manager
+from ..utils.api.rate_limit import sign_traffic
+from ..utils.api.ws_manager import SignRunAdmission, get_ws_manager
 from ..dna_config.dna_config import DNASignConfig
-from ..utils.database.models import DNAUser
+from ..utils.database.models import DNAUser, DNAUserBrief
 from ..utils.fonts.dna_fonts import dna_font_24
 from ..utils.constants.boardcast import BoardcastTypeEnum
+from ..utils.database.sign_buffer import sign_buffer
 
 
 async def sign_task(
-    dna_user: DNAUser,
+    dna_user: Union[DNAUser, DNAUserBrief],
     is_manual: bool = True,
     private_msgs: Dict = {},
     group_msgs: Dict = {},
@@ -115,32 +119,46 @@ async def auto_sign():
         return "[二重螺旋]自动任务\n签到功能未开启"
     if not can_sign() and not can_bbs_sign():
         return "[二重螺旋]自动任务\n签到功能未开启"
-    dna_users: List[DNAUser] = await DNAUser.get_dna_all_user()
-    if not dna_users:
-        return "[二重螺旋]自动任务\n没有需要签到的用户"
 
-    need_sign_users = []
-    if master_sign():
-        need_sign_users = dna_users
-    else:
-        # 过滤需要签到的用户
-        for dna_user in dna_users:
-            if dna_user.sign_switch == "off":
-                continue
-            need_sign_users.append(dna_user)
-
-    async def process_user(
-        semaphore,
-        user: DNAUser,
-        private_sign_msgs: Dict,
-        group_sign_msgs: Dict,
-        all_sign_msgs: Dict,
-        private_bbs_msgs: Dict,
-        group_bbs_msgs: Dict,
-        all_bbs_msgs: Dict,
-    ):
-        async with semaphore:
-            return await sign_task(
+    private_sign_msgs = {}
+    group_sign_msgs = {}
+    all_sign_msgs = {"failed": 0, "success": 0}
+
+    private_bbs_msgs = {}
+    group_bbs_msgs = {}
+    all_bbs_msgs = {"failed": 0, "success": 0}
+
+    max_concurrent: int = max(1, sign_concurrent_num())
+    # 接口录像回放时不访问网络，不需要预热 WebSocket
+    lookahead: int = 0 if cassette_manager.replaying() else sign_ws_prewarm_num()
+    sign_all = master_sign()
+
+    # 流水线：读取协程分批读取用户放入有界队列，max_concurrent 个签到协程从队列中取出签到，
+    # 内存中只保留队列和 WebSocket 预热窗口内的账号，不随用户总数增长
+    queue: asyncio.Queue[Optional[Tuple[int, DNAUserBrief]]] = asyncio.Queue(maxsize=max_concurrent + lookahead)
+    window: Dict[int, Tuple[str, str]] = {}
+    total = 0
+
+    async def produce():
+        nonlocal total
+        try:
+            async for user in DNAUser.iter_dna_all_user():
+                # 过滤需要签到的用户
+                if not sign_all and user.sign_switch == "off":
+                    continue
+                window[total] = (user.cookie, user.dev_code or "")
+                await queue.put((total, user))
+                total += 1
+        except Exception as e:
+            logger.exception(f"[DNAUID] [自动签到] 读取用户失败，只签到已读取的 {total} 个账号: {e}")
+        finally:
+            for _ in range(max_concurrent):
+                await queue.put(None)
+
+    async def sign_one(admission: SignRunAdmission, index: int, user: DNAUserBrief):
+        try:
+            admission.start(index)
+            await sign_task(
                 user,
                 False,
                 private_sign_msgs,
@@ -150,40 +168,33 @@ async def auto_sign():
                 group_bbs_msgs,
                 all_bbs_msgs,
             )
+        finally:
+            admission.finish(index)
+
+    async def consume(admission: SignRunAdmission):
+        # 单个账号的任何异常都不能结束签到协程，否则队列满后读取协程会一直阻塞
+        while (item := await queue.get()) is not None:
+            index, user = item
+            try:
+                await sign_one(admission, index, user)
+            except Exception as e:
+                logger.exception(f"[DNAUID] [自动签到] 签到失败: {e}")
+            finally:
+                window.pop(index, None)
+                queue.task_done()
+        queue.task_done()
+
+    # 签到接口需要 WebSocket 连接，按签到顺序预建并固定连接，避免被连接池淘汰
+    # 自动签到的请求计入 sign 限速，不占用用户请求的 all 令牌
+    with get_ws_manager().sign_run(window, max_concurrent, lookahead) as admission, sign_traffic():
+        # 并发数由签到协程数量控制，请求节奏由接口/账号令牌桶控制
+        await asyncio.gather(produce(), *(consume(admission) for _ in range(max_concurrent)))
+    logger.info(f"[DNAUID] [自动签到] 共 {total} 个账号, WebSocket 连接池变动: {admission.churn}")
+    if not total:
+        return "[二重螺旋]自动任务\n没有需要签到的用户"
 
-    private_sign_msgs = {}
-    group_sign_msgs = {}
-    all_sign_msgs = {"failed": 0, "success": 0}
-
-    private_bbs_msgs = {}
-    group_bbs_msgs = {}
-    all_bbs_msgs = {"failed": 0, "success": 0}
-
-    max_concurrent: int = sign_concurrent_num()
-    semaphore = asyncio.Semaphore(max_concurrent)
-    tasks = [
-        process_user(
-            semaphore,
-            user,
-            private_sign_msgs,
-            group_sign_msgs,
-            all_sign_msgs,
-            private_bbs_msgs,
-            group_bbs_msgs,
-            all_bbs_msgs,
-        )
-        for user in need_sign_users
-    ]
-    for i in range(0, len(tasks), max_concurrent):
-        batch = tasks[i : i + max_concurrent]
-        results = await asyncio.gather(*batch, return_exceptions=True)
-        for result in results:
-            if isinstance(result, Exception):
-                logger.warning(f"[DNAUID] [自动签到] 签到失败: {result}")
-
-        delay = get_sign_interval()
-        logger.info(f"[DNAUID] [自动签到] 等待{delay:.2f}秒进行下一次签到")
-        await asyncio.sleep(delay)
+    # 签到结果写入数据库后再生成报告
+    await sign_buffer.flush()
 
     sign_result = await to_board_cast_msg(private_sign_msgs, group_sign_msgs, "游戏签到", theme="blue")
     if not DNASignConfig.get_config("PrivateSignReport").data:
@@ -1,13 +1,14 @@
 import random
-import asyncio
-from typing import Any, Dict, List, Tuple, Union, Optional
+from typing import Any, Dict, List, Union, Optional
 
 from gsuid_core.logger import logger
 
 from ..utils import dna_api
 from .reply_temps import get_random_reply
 from ..utils.api.model import DNABBSTask, DNATaskProcessRes, DNACalendarSignRes
+from ..utils.database.stats import dna_stats
 from ..utils.database.models import DNASign
+from ..utils.database.sign_buffer import sign_buffer
 from ..utils.constants.sign_target import SignTarget
 from ..utils.constants.sign_bbs_mark import BBSMarkName
 
@@ -20,20 +21,16 @@ SIGN_STATUS = {
 }
 
 
-def get_sign_interval():
+def sign_concurrent_num():
     from ..dna_config.dna_config import DNASignConfig
 
-    interval = DNASignConfig.get_config("SigninConcurrentNumInterval").data
-
-    min_interval = int(interval[0])
-    max_interval = int(interval[1])
-    return round(random.uniform(min_interval, max_interval), 2)
+    return DNASignConfig.get_config("SigninConcurrentNum").data
 
 
-def sign_concurrent_num():
+def sign_ws_prewarm_num():
     from ..dna_config.dna_config import DNASignConfig
 
-    return DNASignConfig.get_config("SigninConcurrentNum").data
+    return DNASignConfig.get_config("SignWsPrewarmNum").data
 
 
 def sched_sign():
@@ -80,7 +77,6 @@ class SignService:
         uid: str,
         token: str,
         dev_code: Optional[str] = None,
-        delay: Tuple[int, int] = (0, 1),
     ):
         self.uid = uid
         self.token = token
@@ -94,7 +90,7 @@ class SignService:
             BBSMarkName.BBS_REPLY: False,
         }
         self.error_msg: str = ""
-        self.delay: Tuple[int, int] = delay
+        self.is_new_record = False
         self._init_status()
 
     def _init_status(self):
@@ -165,7 +161,11 @@ class SignService:
         return "\n".join(msg_list)
 
     async def save_sign_data(self):
-        await DNASign.upsert_dna_sign(self.dna_sign)
+        sign_buffer.put(self.dna_sign)
+        if self.is_new_record:
+            # 今天第一次写入签到记录
+            dna_stats.add_sign(self.dna_sign.uid, self.dna_sign.date)
+            self.is_new_record = False
 
     async def check_status(self):
         """
@@ -173,9 +173,10 @@ class SignService:
         如果签到已完成（包括 True, "skip", "forbidden", "failed"），则返回 True
         如果签到未完成，则返回 False
         """
-        dna_sign: Optional[DNASign] = await DNASign.get_sign_data(self.uid)
+        dna_sign: Optional[DNASign] = await sign_buffer.get_sign_data(self.uid)
         if not dna_sign:
             self.dna_sign = DNASign.build(self.uid)
+            self.is_new_record = True
             return False
         else:
             self.dna_sign = dna_sign
@@ -198,11 +199,11 @@ class SignService:
         if self.dna_sign.game_sign == SignTarget.GAME_SIGN:
             return
 
-        res = await dna_api.sign_calendar(self.token, self.dev_code)
+        res = await dna_api.sign_calendar(self.token, self.dev_code, use_cache=False)
         if not res.is_success:
             return True
 
-        calendar_sign = DNACalendarSignRes.model_validate(res.data)
+        calendar_sign = res.parse_data(DNACalendarSignRes)
         if calendar_sign.todaySignin:
             self.msg_temp["signed"] = "skip"
             self.dna_sign.game_sign = SignTarget.GAME_SIGN
@@ -222,18 +223,16 @@ class SignService:
         else:
             self.msg_temp["signed"] = "failed"
 
-        await asyncio.sleep(random.uniform(self.delay[0], self.delay[1]))
-
     async def do_bbs_sign(self):
         if self.msg_temp["bbs_signed"]:
             return
 
         # 获取任务进度
-        res = await dna_api.get_task_process(self.token, self.dev_code)
+        res = await dna_api.get_task_process(self.token, self.dev_code, use_cache=False)
         if not res.is_success:
             return
 
-        task_process = DNATaskProcessRes.model_validate(res.data)
+        task_process = res.parse_data(DNATaskProcessRes)
         for task in task_process.dailyTask:
             markName = task.markName
             if not markName:
@@ -283,8 +282,6 @@ class SignService:
         else:
             self.bbs_states[BBSMarkName.BBS_SIGN] = "failed"
 
-        await asyncio.sleep(random.uniform(self.delay[0], self.delay[1]))
-
     async def _bbs_detail(self, dna_bbs_task: DNABBSTask, posts: List[Dict[str, Any]]):
         if self.dna_sign.bbs_detail >= SignTarget.BBS_DETAIL:
             self.bbs_states[BBSMarkName.BBS_DETAIL] = "skip"
@@ -313,8 +310,6 @@ class SignService:
             if self.dna_sign.bbs_detail >= dna_bbs_task.times:
                 break
 
-            await asyncio.sleep(random.uniform(self.delay[0], self.delay[1]))
-
         self.bbs_states[BBSMarkName.BBS_DETAIL] = self.dna_sign.bbs_detail >= dna_bbs_task.times
 
     async def _bbs_like(self, dna_bbs_task: DNABBSTask, posts: List[Dict[str, Any]]):
@@ -345,8 +340,6 @@ class SignService:
             if self.dna_sign.bbs_like >= dna_bbs_task.times:
                 break
 
-            await asyncio.sleep(random.uniform(self.delay[0], self.delay[1]))
-
         self.bbs_states[BBSMarkName.BBS_LIKE] = self.dna_sign.bbs_like >= dna_bbs_task.times
 
     async def _bbs_share(self, dna_bbs_task: DNABBSTask, posts: List[Dict[str, Any]]):
@@ -389,6 +382,4 @@ class SignService:
             if self.dna_sign.bbs_reply >= dna_bbs_task.times:
                 break
 
-            await asyncio.sleep(random.uniform(self.delay[0] + 1, self.delay[1] + 1))
-
         self.bbs_states[BBSMarkName.BBS_REPLY] = self.dna_sign.bbs_reply >= dna_bbs_task.times
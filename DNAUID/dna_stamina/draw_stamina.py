@@ -15,11 +15,13 @@ from ..utils.image import (
     COLOR_KHAKI,
     COLOR_WHITE,
     add_footer,
+    get_user_avatar,
     get_smooth_drawer,
     get_avatar_title_img,
 )
 from ..utils.utils import get_using_id, is_uid_hidden
 from ..utils.api.model import DNARoleForToolRes, DNARoleShortNoteRes
+from ..utils.fetch_plan import FetchPlan
 from ..utils.msgs.notify import (
     dna_not_found,
     dna_uid_invalid,
@@ -55,17 +57,25 @@ async def draw_stamina_img(bot: Bot, ev: Event):
         await dna_token_invalid(bot, ev)
         return
 
-    short_note_info = await dna_api.get_short_note_info(dna_user.cookie, dna_user.dev_code)
+    # 便签、角色信息、隐私设置、头像互不依赖，并发获取
+    plan = FetchPlan()
+    plan.add("short_note", lambda: dna_api.get_short_note_info(dna_user.cookie, dna_user.dev_code))
+    plan.add("role_for_tool", lambda: dna_api.get_default_role_for_tool(dna_user.cookie, dna_user.dev_code))
+    plan.add("uid_hidden", lambda: is_uid_hidden(user_id, ev.bot_id, ev.group_id))
+    plan.add("avatar", lambda: get_user_avatar(ev, user_id))
+    results = await plan.run()
+
+    short_note_info = results["short_note"]
     if not short_note_info.is_success:
         await dna_not_found(bot, ev, "日常便签数据")
         return
-    short_note_info = DNARoleShortNoteRes.model_validate(short_note_info.data)
+    short_note_info = short_note_info.parse_data(DNARoleShortNoteRes)
 
-    role_for_tool_info = await dna_api.get_default_role_for_tool(dna_user.cookie, dna_user.dev_code)
+    role_for_tool_info = results["role_for_tool"]
     if not role_for_tool_info.is_success:
         await dna_not_found(bot, ev, "角色列表信息")
         return
-    role_for_tool_info = DNARoleForToolRes.model_validate(role_for_tool_info.data)
+    role_for_tool_info = role_for_tool_info.parse_data(DNARoleForToolRes)
 
     card = Image.open(get_bg_list()).convert("RGBA")
     card = crop_center_img(card, 2000, 1100)
@@ -76,8 +86,6 @@ async def draw_stamina_img(bot: Bot, ev: Event):
     other_info = [
         (i.paramKey, i.paramValue) for i in role_show.params if i.paramKey in ("总活跃天数", "游戏时长", "获得角色数")
     ]
-    # 检查 UID 是否应该被隐藏
-    uid_hidden = await is_uid_hidden(user_id, ev.bot_id, ev.group_id)
     # title
     avatar_title = await get_avatar_title_img(
         ev,
@@ -86,7 +94,8 @@ async def draw_stamina_img(bot: Bot, ev: Event):
         user_level=role_show.level,
         other_info=other_info,
         avatar_user_id=user_id,
-        uid_hidden=uid_hidden,
+        uid_hidden=results["uid_hidden"],
+        avatar=results["avatar"],
     )
     card.alpha_composite(avatar_title, (-50, 30))
 
@@ -1,15 +1,42 @@
 from gsuid_core.logger import logger
-from gsuid_core.server import on_core_start
+from gsuid_core.server import on_core_start, on_core_shutdown
 
 from ..dna_resource import startup
+from ..utils.api.cassette import cassette_manager
+from ..utils.api.http_pool import http_pool
+from ..utils.api.ws_manager import get_ws_manager
+from ..utils.database.models import DNASign, DNABindUID
+from ..utils.api.sign_executor import sign_executor
+from ..utils.database.sign_buffer import sign_buffer
 
 
 @on_core_start
 async def all_start():
     logger.info("[二重螺旋] 启动中...")
+    try:
+        if merged := await DNASign.migrate_unique_index():
+            logger.info(f"[二重螺旋] 已合并 {merged} 条重复签到记录")
+        if filled := await DNABindUID.backfill():
+            logger.info(f"[二重螺旋] 已补全 {filled} 条UID绑定关系")
+    except Exception as e:
+        logger.exception(e)
+
     try:
         await startup()
     except Exception as e:
         logger.exception(e)
 
     logger.success("[二重螺旋] 启动完成✅")
+
+
+@on_core_shutdown
+async def all_shutdown():
+    logger.info("[二重螺旋] 正在关闭连接...")
+    try:
+        await sign_buffer.close()
+        await get_ws_manager().close()
+        await http_pool.close()
+        await cassette_manager.flush()
+        sign_executor.shutdown()
+    except Exception as e:
+        logger.exception(e)
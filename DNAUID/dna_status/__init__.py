@@ -2,23 +2,47 @@ from gsuid_core.status.plugin_status import register_status
 
 from ..utils.image import get_ICON
 from ..utils.utils import get_yesterday_date
-from ..utils.database.models import DNASign, DNAUser
+from ..utils.api.retry import circuit_breakers
+from ..utils.api.http_pool import http_pool
+from ..utils.database.locks import db_locks
+from ..utils.database.stats import dna_stats
+from ..utils.api.sign_executor import sign_executor
 
 
 async def get_today_sign_num():
-    datas = await DNASign.get_all_sign_data_by_date()
-    return len(datas)
+    return await dna_stats.sign_num()
 
 
 async def get_yesterday_sign_num():
-    yesterday = get_yesterday_date()
-    datas = await DNASign.get_all_sign_data_by_date(date=yesterday)
-    return len(datas)
+    return await dna_stats.sign_num(get_yesterday_date())
 
 
 async def get_user_num():
-    datas = await DNAUser.get_dna_all_user()
-    return len(datas)
+    return await dna_stats.user_num()
+
+
+async def get_http_pool_status():
+    info = http_pool.info()
+    return f"{info['active']}/{info['idle']}/{info['queued']}"
+
+
+async def get_sign_executor_status():
+    info = sign_executor.info()
+    return f"{info['queued']}/{info['in_flight']}"
+
+
+async def get_db_lock_status():
+    info = db_locks.info()
+    waits = [
+        f"{table}: {stats['contended']}/{stats['acquired']} {stats['max_wait_ms']}ms"
+        for table, stats in info["tables"].items()
+    ]
+    return "\n".join([f"{info['mode']} {info['waiting']}/{info['holders']}", *waits])
+
+
+async def get_api_breaker_status():
+    states = [f"{host}: {info['state']}" for host, info in circuit_breakers.info().items()]
+    return "\n".join(states) or "closed"
 
 
 register_status(
@@ -28,5 +52,9 @@ register_status(
         "登录账户": get_user_num,
         "今日签到": get_today_sign_num,
         "昨日签到": get_yesterday_sign_num,
+        "HTTP连接(活跃/空闲/排队)": get_http_pool_status,
+        "签名队列(排队/进行中)": get_sign_executor_status,
+        "数据库写锁(等待/持有)": get_db_lock_status,
+        "API熔断状态": get_api_breaker_status,
     },
 )
@@ -12,8 +12,10 @@ from ..utils.msgs.notify import (
     send_dna_notify,
     dna_bind_uid_result,
 )
+from ..utils.database.stats import dna_stats
 from ..dna_config.dna_config import DNAConfig
 from ..utils.database.models import DNABind, DNAUser
+from ..utils.api.response_cache import response_cache
 
 sv_dna_login = SV("dna登录")
 sv_dna_bind = SV("dna绑定")
@@ -60,7 +62,9 @@ async def send_dna_logout_msg(bot: Bot, ev: Event):
         await send_dna_notify(bot, ev, "当前并未登录")
         return
     else:
+        response_cache.invalidate_token(dna_user.cookie)
         await DNAUser.delete_cookie(ev.user_id, ev.bot_id, uid)
+        dna_stats.add_user(-1)
 
     await send_dna_notify(bot, ev, "成功退出登录")
 
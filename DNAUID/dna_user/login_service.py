@@ -7,7 +7,9 @@ from gsuid_core.models import Event
 from ..utils import dna_api
 from ..utils.utils import mask_uid_in_text
 from ..utils.api.model import DNALoginRes, DNARoleListRes
+from ..utils.database.stats import dna_stats
 from ..utils.database.models import DNABind, DNAUser
+from ..utils.api.response_cache import response_cache
 from ..utils.constants.constants import DNA_GAME_ID
 
 complete_error_msg = "您尚未注册二重螺旋账号，请先在【皎皎角】进行角色绑定"
@@ -28,7 +30,7 @@ class DNALoginService:
         result = await dna_api.login(mobile, code, dev_code)
         if not result.is_success:
             return result.throw_msg()
-        login_response = DNALoginRes.model_validate(result.data)
+        login_response = result.parse_data(DNALoginRes)
 
         if login_response.isComplete == 0:
             return complete_error_msg
@@ -43,7 +45,7 @@ class DNALoginService:
             return role_list_response.throw_msg()
         if not role_list_response.data:
             return role_error_msg
-        role_list = DNARoleListRes.model_validate(role_list_response.data)
+        role_list = role_list_response.parse_data(DNARoleListRes)
 
         ev = self.ev
         user_id = ev.user_id
@@ -60,6 +62,10 @@ class DNALoginService:
                 user = await DNAUser.get_user_by_attr(user_id, bot_id, "uid", uid)
 
                 if user:
+                    response_cache.invalidate_token(user.cookie)
+                    if user.status or not user.cookie:
+                        # 失效账号重新登录
+                        dna_stats.add_user()
                     await DNAUser.update_data_by_data(
                         select_data={"user_id": user_id, "bot_id": bot_id, "uid": uid},
                         update_data={
@@ -81,6 +87,7 @@ class DNALoginService:
                         d_num=login_response.dNum,
                         refresh_token=login_response.refreshToken,
                     )
+                    dna_stats.add_user()
 
                 res = await DNABind.insert_uid(user_id, bot_id, uid, group_id, lenth_limit=13)
                 if res == 0 or (res == -2 and show_vo.isDefault == 1):
@@ -1,9 +1,13 @@
 from .utils import (
     TZ,
     TimedCache,
+    SingleFlight,
+    AsyncTTLCache,
+    ConfigSnapshot,
     get_datetime,
     get_public_ip,
     get_today_date,
+    async_ttl_cache,
     mask_uid_in_text,
     timed_async_cache,
     get_yesterday_date,
@@ -14,7 +18,11 @@ from .dna_api import dna_api
 __all__ = [
     "dna_api",
     "timed_async_cache",
+    "async_ttl_cache",
     "TimedCache",
+    "AsyncTTLCache",
+    "SingleFlight",
+    "ConfigSnapshot",
     "get_public_ip",
     "get_today_date",
     "get_yesterday_date",
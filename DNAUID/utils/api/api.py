@@ -1,3 +1,8 @@
+from typing import Dict, Tuple, Optional
+
+from ..utils import ConfigSnapshot
+
+
 def get_main_url():
     from ...dna_config.dna_config import DNAConfig
 
@@ -72,3 +77,43 @@ def get_no_need_proxy_func():
     if NoNeedProxyFunc:
         return NoNeedProxyFunc
     return []
+
+
+class ProxyRouter:
+    """按路由名（DNAApi 方法名）决定请求走代理还是直连
+
+    路由表由 LocalProxyUrl / NeedProxyFunc / NoNeedProxyFunc 编译而成，
+    配置变化后才会重新编译。
+    """
+
+    def __init__(self):
+        self._snapshot: ConfigSnapshot[Tuple[Dict[str, Optional[str]], Optional[str]]] = ConfigSnapshot(
+            lambda: (
+                get_local_proxy_url(),
+                tuple(get_need_proxy_func()),
+                tuple(get_no_need_proxy_func()),
+            ),
+            self._compile,
+        )
+
+    @staticmethod
+    def _compile(source) -> Tuple[Dict[str, Optional[str]], Optional[str]]:
+        proxy_url, need_proxy, no_need_proxy = source
+        if not proxy_url:
+            return {}, None
+
+        default = proxy_url if "all" in need_proxy else None
+        routes: Dict[str, Optional[str]] = {name: proxy_url for name in need_proxy if name != "all"}
+        # NoNeedProxyFunc 优先级更高
+        routes.update({name: None for name in no_need_proxy})
+        return routes, default
+
+    def resolve(self, route: str) -> Optional[str]:
+        routes, default = self._snapshot.get()
+        return routes.get(route, default)
+
+    def invalidate(self):
+        self._snapshot.invalidate()
+
+
+proxy_router = ProxyRouter()
@@ -0,0 +1,240 @@
+import gzip
+import json
+import asyncio
+import hashlib
+from typing import Any, Set, Dict, List, Tuple, Union, Mapping, Optional
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from gsuid_core.logger import logger
+
+from ..utils import ConfigSnapshot
+from ..resource.RESOURCE_PATH import CASSETTE_PATH
+
+# 录制模式：off 关闭，record 录制成功响应，replay 只从录像回放、不访问网络
+CASSETTE_MODES = ("off", "record", "replay")
+
+# 响应中需要脱敏的字段
+SCRUBBED_FIELDS = {
+    "token",
+    "refreshToken",
+    "devCode",
+    "mobile",
+    "phone",
+}
+# 请求中不参与匹配的字段：账号凭据、短信验证码、一次性签名
+REQUEST_SCRUBBED_FIELDS = SCRUBBED_FIELDS | {"code", "sa", "tn", "rk"}
+SCRUBBED_VALUE = "***"
+
+# 每新增多少条响应追加写一次盘，其余在关闭时写入
+FLUSH_EVERY = 50
+# 同一匹配键最多保留的不同响应数
+MAX_RESPONSES_PER_KEY = 20
+
+
+def get_cassette_config() -> Tuple[str, str]:
+    from ...dna_config.dna_config import DNAConfig
+
+    mode = DNAConfig.get_config("ApiCassetteMode").data or "off"
+    name = DNAConfig.get_config("ApiCassetteName").data or "default"
+    return (mode if mode in CASSETTE_MODES else "off"), name
+
+
+def _dump(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def scrub(value: Any, fields=SCRUBBED_FIELDS) -> Any:
+    """递归替换敏感字段的值"""
+    if isinstance(value, dict):
+        return {k: SCRUBBED_VALUE if k in fields and v else scrub(v, fields) for k, v in value.items()}
+    if isinstance(value, list):
+        return [scrub(v, fields) for v in value]
+    return value
+
+
+def match_key(
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]],
+    json_data: Optional[Dict[str, Any]],
+    data: Optional[Union[str, Dict[str, Any]]],
+) -> str:
+    """匹配键：请求方法 + 接口路径 + 脱敏后的请求体，不含域名（DNAUrlProxyUrl 变化不影响回放）"""
+    payload = json.dumps(
+        [scrub(i, REQUEST_SCRUBBED_FIELDS) for i in (params, json_data, data)],
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    digest = hashlib.sha1(payload.encode()).hexdigest()[:16]
+    return f"{method} {urlsplit(url).path} {digest}"
+
+
+class Cassette:
+    """接口录像
+
+    录制模式下保存脱敏后的成功响应，回放模式下按 匹配键 返回录制的响应，
+    同一匹配键录制了多条时按顺序循环回放。
+    文件为 gzip 压缩的 JSON Lines，每行一条响应：{"key", "route", "response"}；
+    新录制的响应只追加写入（gzip 多成员），写盘在线程中执行，不阻塞事件循环。
+    """
+
+    def __init__(self, name: str, path: Path = CASSETTE_PATH):
+        self.name = name
+        self.file = path / f"{name}.jsonl.gz"
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._seen: Dict[str, Set[str]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._loaded = False
+        self._pending: List[str] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.recorded = 0
+        self.replayed = 0
+        self.missed = 0
+
+    def _add(self, key: str, route: str, response: Dict[str, Any]) -> Optional[str]:
+        """加入一条响应，相同的响应只保留一份；新增时返回序列化后的响应"""
+        entry = self._entries.setdefault(key, {"key": key, "route": route, "responses": []})
+        seen = self._seen.setdefault(key, set())
+        dumped = _dump(response)
+        if dumped in seen:
+            return None
+        seen.add(dumped)
+        entry["responses"].append(response)
+        if len(entry["responses"]) > MAX_RESPONSES_PER_KEY:
+            seen.discard(_dump(entry["responses"].pop(0)))
+        return dumped
+
+    def load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.file.exists():
+            return
+        try:
+            with gzip.open(self.file, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        item = json.loads(line)
+                        self._add(item["key"], item.get("route", ""), item["response"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"[DNA] 读取接口录像失败 {self.file}: {e}")
+        logger.info(f"[DNA] 已加载接口录像 {self.name}: {len(self._entries)} 个接口")
+
+    def record(self, key: str, route: str, response: Dict[str, Any]):
+        self.load()
+        # 只脱敏 data，外层 code/msg 保持原样
+        response = {**response, "data": scrub(response.get("data"))}
+        self.recorded += 1
+        if self._add(key, route, response) is None:
+            return
+        self._pending.append(_dump({"key": key, "route": route, "response": response}))
+        if len(self._pending) >= FLUSH_EVERY and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    def replay(self, key: str) -> Optional[Dict[str, Any]]:
+        self.load()
+        if not (entry := self._entries.get(key)) or not entry["responses"]:
+            self.missed += 1
+            return None
+        responses: List[Dict[str, Any]] = entry["responses"]
+        index = self._cursor.get(key, 0) % len(responses)
+        self._cursor[key] = (index + 1) % len(responses)
+        self.replayed += 1
+        return responses[index]
+
+    def rewind(self):
+        self._cursor.clear()
+
+    def _append(self, lines: List[str]):
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.file, "at", encoding="utf-8") as f:
+            f.write("".join(f"{line}\n" for line in lines))
+
+    async def flush(self):
+        """把新录制的响应追加到录像文件"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            lines, self._pending = self._pending, []
+            try:
+                await asyncio.to_thread(self._append, lines)
+            except OSError as e:
+                # 放回缓冲，下次写入时重试
+                self._pending[:0] = lines
+                logger.warning(f"[DNA] 写入接口录像失败 {self.file}: {e}")
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "keys": len(self._entries),
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "missed": self.missed,
+            "pending": len(self._pending),
+        }
+
+
+class CassetteManager:
+    """按配置选择当前录像，切换录像名时写入旧录像"""
+
+    def __init__(self):
+        self._cassette: Optional[Cassette] = None
+        self._config: ConfigSnapshot[Tuple[str, str]] = ConfigSnapshot(get_cassette_config, tuple)
+        self._closing: Set[asyncio.Task] = set()
+
+    def current(self) -> Tuple[str, Optional[Cassette]]:
+        mode, name = self._config.get()
+        if mode == "off":
+            return mode, None
+        if self._cassette is None or self._cassette.name != name:
+            if self._cassette is not None:
+                task = asyncio.create_task(self._cassette.flush())
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+            self._cassette = Cassette(name)
+        return mode, self._cassette
+
+    def replaying(self) -> bool:
+        """是否处于回放模式（回放时不访问网络，也不需要签名和 WebSocket）"""
+        return self._config.get()[0] == "replay"
+
+    def replay(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json_data: Optional[Dict[str, Any]],
+        data: Optional[Union[str, Dict[str, Any]]],
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """返回 (是否处于回放模式, 录制的响应)"""
+        mode, cassette = self.current()
+        if mode != "replay" or cassette is None:
+            return False, None
+        return True, cassette.replay(match_key(method, url, params, json_data, data))
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json_data: Optional[Dict[str, Any]],
+        data: Optional[Union[str, Dict[str, Any]]],
+        route: str,
+        response: Mapping[str, Any],
+    ):
+        mode, cassette = self.current()
+        if mode != "record" or cassette is None:
+            return
+        cassette.record(match_key(method, url, params, json_data, data), route, dict(response))
+
+    async def flush(self):
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        if self._cassette is not None:
+            await self._cassette.flush()
+
+
+cassette_manager = CassetteManager()
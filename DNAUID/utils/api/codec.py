@@ -0,0 +1,27 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+
+    def json_loads(data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+except ImportError:
+
+    def json_loads(data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+def decode_body(body: Union[bytes, str]) -> Any:
+    """解析响应体，同时解析嵌套在 data 字段中的 JSON 字符串
+
+    解析失败时抛出 ValueError
+    """
+    raw = json_loads(body)
+    if isinstance(raw, dict) and isinstance(data := raw.get("data"), str) and data:
+        try:
+            raw["data"] = json_loads(data)
+        except ValueError:
+            pass
+    return raw
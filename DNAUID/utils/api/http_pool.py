@@ -0,0 +1,178 @@
+import time
+import asyncio
+from typing import Any, Dict, Tuple, Optional
+
+import aiohttp
+
+from gsuid_core.logger import logger
+
+from ..utils import ConfigSnapshot
+
+# 批量任务类接口（签到、社区任务），其余均按查询类接口处理
+TASK_ROUTES = {
+    "game_sign",
+    "bbs_sign",
+    "get_task_process",
+    "get_post_list",
+    "get_post_detail",
+    "do_like",
+    "do_share",
+    "do_reply",
+}
+
+
+def get_http_pool_config() -> Dict[str, int]:
+    from ...dna_config.dna_config import DNAConfig
+
+    return {
+        "limit": DNAConfig.get_config("HttpPoolLimit").data,
+        "limit_per_host": DNAConfig.get_config("HttpPoolLimitPerHost").data,
+        "keepalive_timeout": DNAConfig.get_config("HttpKeepaliveTimeout").data,
+        "ttl_dns_cache": DNAConfig.get_config("HttpDnsCacheTTL").data,
+    }
+
+
+def get_http_timeouts() -> Tuple[int, int, int]:
+    from ...dna_config.dna_config import DNAConfig
+
+    return (
+        DNAConfig.get_config("HttpConnectTimeout").data or 5,
+        DNAConfig.get_config("HttpQueryTimeout").data or 15,
+        DNAConfig.get_config("HttpTaskTimeout").data or 30,
+    )
+
+
+class PoolStats:
+    """通过 aiohttp TraceConfig 统计连接池使用情况"""
+
+    def __init__(self):
+        self.active = 0
+        self.queued = 0
+        self.queued_total = 0
+        self.queued_wait = 0.0
+        self.created = 0
+        self.reused = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_done)
+        trace.on_request_exception.append(self._on_request_done)
+        trace.on_connection_queued_start.append(self._on_queued_start)
+        trace.on_connection_queued_end.append(self._on_queued_end)
+        trace.on_connection_create_end.append(self._on_create_end)
+        trace.on_connection_reuseconn.append(self._on_reuseconn)
+        return trace
+
+    async def _on_request_start(self, session, ctx, params):
+        self.active += 1
+
+    async def _on_request_done(self, session, ctx, params):
+        self.active -= 1
+
+    async def _on_queued_start(self, session, ctx, params):
+        self.queued += 1
+        self.queued_total += 1
+        ctx.queued_at = time.monotonic()
+
+    async def _on_queued_end(self, session, ctx, params):
+        self.queued -= 1
+        self.queued_wait += time.monotonic() - getattr(ctx, "queued_at", time.monotonic())
+
+    async def _on_create_end(self, session, ctx, params):
+        self.created += 1
+
+    async def _on_reuseconn(self, session, ctx, params):
+        self.reused += 1
+
+
+class HttpPoolManager:
+    """DNA API 的 HTTP 连接池
+
+    每个代理地址（None 为直连）一个 ClientSession，连接数、keepalive、DNS 缓存
+    由配置决定（重启生效）；超时按接口类别区分，修改后立即生效。
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._lock = asyncio.Lock()
+        self.stats = PoolStats()
+        self._timeouts: ConfigSnapshot[Dict[str, aiohttp.ClientTimeout]] = ConfigSnapshot(
+            get_http_timeouts,
+            self._compile_timeouts,
+        )
+
+    @staticmethod
+    def _compile_timeouts(source) -> Dict[str, aiohttp.ClientTimeout]:
+        connect, query, task = source
+        return {
+            "query": aiohttp.ClientTimeout(total=query, sock_connect=connect, sock_read=query),
+            "task": aiohttp.ClientTimeout(total=task, sock_connect=connect, sock_read=task),
+        }
+
+    def timeout_for(self, route: str) -> aiohttp.ClientTimeout:
+        return self._timeouts.get()["task" if route in TASK_ROUTES else "query"]
+
+    async def get_session(self, proxy: Optional[str] = None, ssl: Any = True) -> aiohttp.ClientSession:
+        # 使用代理 URL 作为 key，None 表示直连
+        key = proxy or "no_proxy"
+
+        # 检查是否已有可用的 session
+        if (session := self._sessions.get(key)) and not session.closed:
+            return session
+
+        async with self._lock:
+            # 双重检查，避免并发创建多个 session
+            if (session := self._sessions.get(key)) and not session.closed:
+                return session
+
+            config = get_http_pool_config()
+            connector = aiohttp.TCPConnector(
+                ssl=ssl,
+                limit=config["limit"],
+                limit_per_host=config["limit_per_host"],
+                keepalive_timeout=config["keepalive_timeout"],
+                ttl_dns_cache=config["ttl_dns_cache"],
+                use_dns_cache=True,
+            )
+            session = aiohttp.ClientSession(connector=connector, trace_configs=[self.stats.trace_config()])
+            self._sessions[key] = session
+            return session
+
+    def _idle_connections(self) -> int:
+        idle = 0
+        for session in self._sessions.values():
+            # aiohttp 未公开空闲连接数，读取失败时忽略
+            conns = getattr(session.connector, "_conns", None) or {}
+            try:
+                idle += sum(len(v) for v in conns.values())
+            except Exception:
+                pass
+        return idle
+
+    def info(self) -> Dict[str, Any]:
+        stats = self.stats
+        return {
+            "sessions": sum(1 for s in self._sessions.values() if not s.closed),
+            "active": stats.active,
+            "idle": self._idle_connections(),
+            "queued": stats.queued,
+            "queued_total": stats.queued_total,
+            "queued_wait": round(stats.queued_wait, 3),
+            "created": stats.created,
+            "reused": stats.reused,
+        }
+
+    async def close(self):
+        async with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            if session.closed:
+                continue
+            try:
+                await session.close()
+            except Exception as e:
+                logger.warning(f"[DNA] 关闭 HTTP session 失败: {e}")
+
+
+http_pool = HttpPoolManager()
@@ -0,0 +1,156 @@
+import time
+import asyncio
+from typing import Dict, List, Tuple, Optional
+from contextlib import contextmanager
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from gsuid_core.logger import logger
+
+from ..utils import ConfigSnapshot
+
+# 路由名为 all 的规则作用于交互请求，sign 的规则作用于自动签到请求，两者互不占用
+ALL_ROUTES = "all"
+SIGN_ROUTES = "sign"
+
+_sign_traffic: ContextVar[bool] = ContextVar("dna_sign_traffic", default=False)
+
+
+@contextmanager
+def sign_traffic():
+    """将当前上下文（包括其中创建的任务）发出的请求计入 sign 限速"""
+    token = _sign_traffic.set(True)
+    try:
+        yield
+    finally:
+        _sign_traffic.reset(token)
+
+
+def get_endpoint_rate_limit() -> List[str]:
+    from ...dna_config.dna_config import DNAConfig
+
+    return DNAConfig.get_config("ApiEndpointRateLimit").data or []
+
+
+def get_account_rate_limit() -> List[str]:
+    from ...dna_config.dna_config import DNASignConfig
+
+    return DNASignConfig.get_config("SignAccountRateLimit").data or []
+
+
+class TokenBucket:
+    """令牌桶，rate 为每秒生成令牌数，burst 为桶容量
+
+    令牌允许透支：获取时先扣减，再按欠下的令牌数等待，
+    因此同一事件循环内无需加锁，且请求按到达顺序排队。
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """预定一个令牌，返回需要等待的秒数"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def acquire(self):
+        if (wait := self.reserve()) > 0:
+            await asyncio.sleep(wait)
+
+
+def _parse_rate(rate: str, burst: str) -> Optional[Tuple[float, float]]:
+    try:
+        rate_f, burst_f = float(rate), float(burst)
+    except ValueError:
+        return None
+    if rate_f <= 0:
+        return None
+    return rate_f, burst_f
+
+
+def _compile_endpoint_rules(source: Tuple[str, ...]) -> Dict[str, Tuple[float, float]]:
+    rules: Dict[str, Tuple[float, float]] = {}
+    for item in source:
+        parts = [i.strip() for i in item.split(":")]
+        if len(parts) != 3 or not (rule := _parse_rate(parts[1], parts[2])):
+            logger.warning(f"[DNA] 接口限速配置格式错误: {item}")
+            continue
+        rules[parts[0]] = rule
+    return rules
+
+
+def _compile_account_rule(source: Tuple[str, ...]) -> Optional[Tuple[float, float]]:
+    if len(source) != 2:
+        return None
+    return _parse_rate(*source)
+
+
+class RateLimiter:
+    """按接口（路由名）和账号（token）限速
+
+    - 接口限速：ApiEndpointRateLimit，格式 路由名:每秒次数:突发次数
+    - 全局限速：交互请求共享 all，自动签到请求共享 sign，签到高峰不会挤占用户查询
+    - 账号限速：SignAccountRateLimit，只作用于自动签到，同一个 token 的签到请求共享
+    """
+
+    MAX_ACCOUNT_BUCKETS = 4096
+
+    def __init__(self):
+        self._endpoint_rules = ConfigSnapshot(lambda: tuple(get_endpoint_rate_limit()), _compile_endpoint_rules)
+        self._account_rule = ConfigSnapshot(lambda: tuple(get_account_rate_limit()), _compile_account_rule)
+        self._endpoint_buckets: Dict[str, Tuple[Tuple[float, float], TokenBucket]] = {}
+        self._account_buckets: OrderedDict[str, Tuple[Tuple[float, float], TokenBucket]] = OrderedDict()
+        self.waited = 0
+        self.wait_time = 0.0
+
+    def _endpoint_bucket(self, route: str, rules: Dict[str, Tuple[float, float]]) -> Optional[TokenBucket]:
+        if not (rule := rules.get(route)):
+            return None
+        item = self._endpoint_buckets.get(route)
+        if not item or item[0] != rule:
+            item = (rule, TokenBucket(*rule))
+            self._endpoint_buckets[route] = item
+        return item[1]
+
+    def _account_bucket(self, token: str) -> Optional[TokenBucket]:
+        if not token or not (rule := self._account_rule.get()):
+            return None
+        item = self._account_buckets.get(token)
+        if not item or item[0] != rule:
+            item = (rule, TokenBucket(*rule))
+            self._account_buckets[token] = item
+        self._account_buckets.move_to_end(token)
+        while len(self._account_buckets) > self.MAX_ACCOUNT_BUCKETS:
+            self._account_buckets.popitem(last=False)
+        return item[1]
+
+    async def acquire(self, route: str, token: Optional[str] = None):
+        rules = self._endpoint_rules.get()
+        # 用户查询会并发请求同一账号的多个接口，只给自动签到加账号限速
+        is_sign = _sign_traffic.get()
+        buckets = [
+            self._endpoint_bucket(SIGN_ROUTES if is_sign else ALL_ROUTES, rules),
+            self._endpoint_bucket(route, rules),
+            self._account_bucket(token or "") if is_sign else None,
+        ]
+        wait = max((bucket.reserve() for bucket in buckets if bucket), default=0)
+        if wait > 0:
+            self.waited += 1
+            self.wait_time += wait
+            await asyncio.sleep(wait)
+
+    def info(self) -> Dict[str, float]:
+        return {
+            "waited": self.waited,
+            "wait_time": round(self.wait_time, 3),
+            "accounts": len(self._account_buckets),
+        }
+
+
+rate_limiter = RateLimiter()
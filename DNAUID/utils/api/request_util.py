@@ -1,8 +1,9 @@
 import copy
+import functools
 from enum import IntEnum
-from typing import Union, Generic, TypeVar, Optional
+from typing import Any, Dict, Type, Union, Generic, TypeVar, Optional
 
-from pydantic import Field, BaseModel, ConfigDict, computed_field
+from pydantic import Field, BaseModel, ConfigDict, PrivateAttr, TypeAdapter, computed_field
 
 CONTENT_TYPE = "application/x-www-form-urlencoded; charset=utf-8"
 
@@ -58,6 +59,12 @@ def is_h5(d: Union[str, dict]) -> bool:
 
 
 T = TypeVar("T")
+M = TypeVar("M")
+
+
+@functools.lru_cache(maxsize=None)
+def get_type_adapter(tp: Any) -> TypeAdapter:
+    return TypeAdapter(tp)
 
 
 class ThrowMsg(str):
@@ -81,6 +88,9 @@ class DNAApiResp(BaseModel, Generic[T]):
     success: bool = Field(False, description="是否成功")
     data: Optional[T] = Field(None, description="数据")
 
+    # 已解析的 data，按目标类型缓存，缓存/合并的响应不会重复校验
+    _parsed: Dict[Any, Any] = PrivateAttr(default_factory=dict)
+
     @computed_field
     @property
     def is_success(self) -> bool:
@@ -102,6 +112,12 @@ class DNAApiResp(BaseModel, Generic[T]):
     def err(cls, msg: str, code: int = RespCode.ERROR) -> "DNAApiResp[T]":
         return cls(code=code, msg=msg, data=None, success=False)
 
+    def parse_data(self, tp: Type[M]) -> M:
+        """将 data 校验为目标类型（结果会缓存在响应上）"""
+        if tp not in self._parsed:
+            self._parsed[tp] = get_type_adapter(tp).validate_python(self.data)
+        return self._parsed[tp]
+
     def throw_msg(self) -> str:
         if isinstance(self.msg, str):
             return self.msg
@@ -1,8 +1,7 @@
 import json
 import random
 import asyncio
-import inspect
-from typing import Any, Dict, List, Union, Literal, Mapping, Optional
+from typing import Any, Dict, List, Union, Literal, Mapping, TypeVar, Hashable, Optional
 from datetime import datetime
 
 import aiohttp
@@ -33,43 +32,34 @@ from .api import (
     GET_POST_DETAIL_URL,
     GET_TASK_PROCESS_URL,
     GET_RSA_PUBLIC_KEY_URL,
-    get_local_proxy_url,
-    get_need_proxy_func,
-    get_no_need_proxy_func,
+    proxy_router,
 )
 from .dnum import check_decrypt_dnum
-from .sign import get_dev_code, get_signed_headers_and_body
-from ..utils import timed_async_cache
+from .sign import get_dev_code
+from .codec import decode_body
+from .retry import RETRYABLE_EXCEPTIONS, retry_policy, circuit_breakers
+from ..utils import SingleFlight, async_ttl_cache
+from .cassette import cassette_manager
+from .http_pool import http_pool
+from .rate_limit import rate_limiter
 from .ws_manager import get_ws_manager
 from .request_util import RespCode, DNAApiResp, get_base_header
-from ..database.models import DNAUser
+from .sign_executor import sign_executor
+from .response_cache import copy_resp, response_cache
+from ..database.stats import dna_stats
+from ..database.models import DNAUser, DNAUserBrief
 from ..constants.constants import DNA_GAME_ID
 
+T_User = TypeVar("T_User", DNAUser, DNAUserBrief)
+
 
 class DNAApi:
     ssl_verify = True
     ann_list_data = []
-    _sessions: Dict[str, aiohttp.ClientSession] = {}
-    _session_lock = asyncio.Lock()
+    _singleflight = SingleFlight()
 
     async def get_session(self, proxy: Optional[str] = None) -> aiohttp.ClientSession:
-        # 使用代理 URL 作为 key，None 表示直连
-        key = proxy or "no_proxy"
-
-        # 检查是否已有可用的 session
-        if key in self._sessions and not self._sessions[key].closed:
-            return self._sessions[key]
-
-        async with self._session_lock:
-            # 双重检查，避免并发创建多个 session
-            if key in self._sessions and not self._sessions[key].closed:
-                return self._sessions[key]
-
-            session = aiohttp.ClientSession(
-                connector=aiohttp.TCPConnector(ssl=self.ssl_verify),
-            )
-            self._sessions[key] = session
-            return session
+        return await http_pool.get_session(proxy, ssl=self.ssl_verify)
 
     async def get_dna_user(self, uid: str, user_id: str, bot_id: str) -> Optional[DNAUser]:
         dna_user = await DNAUser.select_dna_user(uid, user_id, bot_id)
@@ -92,17 +82,16 @@ class DNAApi:
                         return check_cookie
 
         # 如果 WebSocket 连接池中没有可用用户，回退到数据库查询
-        dna_users = await DNAUser.get_dna_all_user()
+        dna_users = await DNAUser.get_random_dna_users(3)
         if not dna_users:
             return
-        random.shuffle(dna_users)
-        for dna_user in dna_users[:3]:
+        for dna_user in dna_users:
             check_cookie = await self.check_cookie(dna_user)
             if check_cookie:
                 return check_cookie
         return None
 
-    async def check_cookie(self, dna_user: DNAUser) -> Optional[DNAUser]:
+    async def check_cookie(self, dna_user: T_User) -> Optional[T_User]:
         if not dna_user:
             return
 
@@ -126,6 +115,7 @@ class DNAApi:
         if dr == 0 and dna_user.refresh_token:
             res = await self.refresh_token(dna_user.cookie, dna_user.refresh_token, dna_user.dev_code)
             if res.success and res.data and isinstance(res.data, dict):
+                response_cache.invalidate_token(dna_user.cookie)
                 dna_user.cookie = res.data["token"]
                 dna_user.d_num = res.data["dNum"]
                 await DNAUser.update_data_by_data(
@@ -139,17 +129,24 @@ class DNAApi:
                 return dna_user
 
         login_log = await self.login_log(dna_user.cookie, dna_user.dev_code)
+        if not login_log.success and cassette_manager.replaying():
+            # 回放时只会因为缺少录像而失败，不能据此判断 token 失效
+            return dna_user
         if not login_log.success:
+            response_cache.invalidate_token(dna_user.cookie)
             await DNAUser.mark_cookie_invalid(dna_user.uid, dna_user.cookie, "无效")
+            dna_stats.add_user(-1)
             return
 
         return dna_user
 
-    @timed_async_cache(86400, lambda x: x and len(x) > 0)
+    @async_ttl_cache(86400, lambda x: x and len(x) > 0, key_args=(), maxsize=1)
     async def get_rsa_public_key(self) -> str:
         dev_code = get_dev_code()
         headers = await get_base_header(dev_code=dev_code)
-        res = await self._dna_request(url=GET_RSA_PUBLIC_KEY_URL, method="POST", header=headers)
+        res = await self._dna_request(
+            url=GET_RSA_PUBLIC_KEY_URL, method="POST", header=headers, route="get_rsa_public_key", coalesce=True
+        )
 
         rsa_pub = (
             "MIGfMA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQDGpdbezK+eknQZQzPOjp8mr/dP+"
@@ -169,145 +166,166 @@ class DNAApi:
         payload = {"isCaptcha": 1, "mobile": mobile, "vJson": v_json}
 
         rsa_pub = await self.get_rsa_public_key()
-        headers, payload = get_signed_headers_and_body(
+        headers, payload = await sign_executor.sign(
             url=GET_SMS_CODE_URL,
             header=headers,
             data=payload,
             rsa_public_key=rsa_pub,
         )
-        return await self._dna_request(GET_SMS_CODE_URL, "POST", headers, data=payload)
+        return await self._dna_request(GET_SMS_CODE_URL, "POST", headers, data=payload, route="get_sms_code")
 
     async def login(self, mobile: Union[int, str], code: str, dev_code: str):
         header = await get_base_header(dev_code)
         payload = {"code": code, "devCode": dev_code, "gameList": DNA_GAME_ID, "loginType": 1, "mobile": mobile}
         rsa_pub = await self.get_rsa_public_key()
-        headers, payload = get_signed_headers_and_body(
+        headers, payload = await sign_executor.sign(
             url=LOGIN_URL,
             header=header,
             data=payload,
             rsa_public_key=rsa_pub,
         )
-        return await self._dna_request(LOGIN_URL, "POST", headers, data=payload)
+        return await self._dna_request(LOGIN_URL, "POST", headers, data=payload, route="login")
 
     async def refresh_token(self, token: str, refresh_token: str, dev_code: str):
         headers = await get_base_header(dev_code=dev_code, token=token)
         payload = {"refreshToken": refresh_token}
         rsa_pub = await self.get_rsa_public_key()
-        headers, payload = get_signed_headers_and_body(
+        headers, payload = await sign_executor.sign(
             url=REFRESH_TOKEN_URL,
             header=headers,
             data=payload,
             rsa_public_key=rsa_pub,
         )
-        return await self._dna_request(REFRESH_TOKEN_URL, "POST", headers, data=payload)
+        return await self._dna_request(REFRESH_TOKEN_URL, "POST", headers, data=payload, route="refresh_token")
 
-    @timed_async_cache(86400, lambda x: x and x.success)
+    @async_ttl_cache(86400, lambda x: x and x.success, key_args=("token", "dev_code"), maxsize=4096, negative_ttl=60)
     async def login_log(self, token: str, dev_code: Optional[str] = None):
         headers = await get_base_header(dev_code=dev_code, token=token)
-        res = await self._dna_request(LOGIN_LOG_URL, "POST", headers)
-        await asyncio.sleep(1 + random.uniform(0, 0.5))
-        return res
+        return await self._dna_request(LOGIN_LOG_URL, "POST", headers, route="login_log")
 
     async def get_role_list(self, token: str, dev_code: str):
         headers = await get_base_header(dev_code=dev_code, token=token)
         payload = {}
         rsa_pub = await self.get_rsa_public_key()
-        headers, payload = get_signed_headers_and_body(
+        headers, payload = await sign_executor.sign(
             url=ROLE_LIST_URL,
             header=headers,
             data=payload,
             rsa_public_key=rsa_pub,
         )
-        return await self._dna_request(ROLE_LIST_URL, "POST", headers, data=payload)
+        return await self._dna_request(
+            ROLE_LIST_URL, "POST", headers, data=payload, route="get_role_list", coalesce=True
+        )
 
     async def get_mh(self):
         dna_user = await self.get_random_dna_user()
         if not dna_user:
             return DNAApiResp[Any].err("获取DNA用户失败")
 
-        return await self.get_default_role_for_tool(dna_user.cookie, dna_user.dev_code)
+        # 密函每小时刷新，不使用缓存
+        return await self.get_default_role_for_tool(dna_user.cookie, dna_user.dev_code, use_cache=False)
 
+    @response_cache.cached("/role/defaultRoleForTool")
     async def get_default_role_for_tool(self, token: str, dev_code: str):
         header = await get_base_header(dev_code, token=token)
         payload = {"type": 1}
         rsa_pub = await self.get_rsa_public_key()
-        headers, payload = get_signed_headers_and_body(
+        headers, payload = await sign_executor.sign(
             url=ROLE_FOR_TOOL_URL,
             header=header,
             data=payload,
             rsa_public_key=rsa_pub,
         )
-        return await self._dna_request(ROLE_FOR_TOOL_URL, "POST", headers, data=payload)
+        return await self._dna_request(
+            ROLE_FOR_TOOL_URL, "POST", headers, data=payload, route="get_default_role_for_tool", coalesce=True
+        )
 
+    @response_cache.cached("/role/getCharDetail")
     async def get_role_detail(self, token: str, char_id: str, char_eid: str, dev_code: str):
         headers = await get_base_header(dev_code=dev_code, token=token)
         data = {"charId": char_id, "charEid": char_eid, "type": 1}
-        return await self._dna_request(ROLE_DETAIL_URL, "POST", headers, data=data)
+        return await self._dna_request(
+            ROLE_DETAIL_URL, "POST", headers, data=data, route="get_role_detail", coalesce=True
+        )
 
+    @response_cache.cached("/role/getWeaponDetail")
     async def get_weapon_detail(self, token: str, weapon_id: int, weapon_eid: str, dev_code: str):
         headers = await get_base_header(dev_code=dev_code, token=token)
         data = {"weaponId": weapon_id, "weaponEid": weapon_eid, "type": 1}
-        return await self._dna_request(WEAPON_DETAIL_URL, "POST", headers, data=data)
+        return await self._dna_request(
+            WEAPON_DETAIL_URL, "POST", headers, data=data, route="get_weapon_detail", coalesce=True
+        )
 
+    @response_cache.cached("/role/getShortNoteInfo")
     async def get_short_note_info(self, token: str, dev_code: str):
         headers = await get_base_header(dev_code=dev_code, token=token)
         payload = {}
         rsa_pub = await self.get_rsa_public_key()
-        headers, payload = get_signed_headers_and_body(
+        headers, payload = await sign_executor.sign(
             url=SHORT_NOTE_URL,
             header=headers,
             data=payload,
             rsa_public_key=rsa_pub,
         )
-        return await self._dna_request(SHORT_NOTE_URL, "POST", headers)
+        return await self._dna_request(SHORT_NOTE_URL, "POST", headers, route="get_short_note_info", coalesce=True)
 
     async def have_sign_in(self, token: str, dev_code: Optional[str] = None):
         headers = await get_base_header(dev_code=dev_code, token=token)
         data = {"gameId": DNA_GAME_ID}
-        return await self._dna_request(HAVE_SIGN_IN_URL, "POST", headers, data=data)
+        return await self._dna_request(
+            HAVE_SIGN_IN_URL, "POST", headers, data=data, route="have_sign_in", coalesce=True
+        )
 
+    @response_cache.cached("/encourage/signin/show")
     async def sign_calendar(self, token: str, dev_code: Optional[str] = None):
         headers = await get_base_header(dev_code=dev_code, token=token)
         data = {"gameId": DNA_GAME_ID}
-        return await self._dna_request(SIGN_CALENDAR_URL, "POST", headers, data=data)
+        return await self._dna_request(
+            SIGN_CALENDAR_URL, "POST", headers, data=data, route="sign_calendar", coalesce=True
+        )
 
     async def game_sign(self, token: str, day_award_id: int, period: int, dev_code: Optional[str] = None):
         headers = await get_base_header(dev_code, token=token)
         payload = {"dayAwardId": day_award_id, "periodId": period, "signinType": 1}
         rsa_pub = await self.get_rsa_public_key()
-        headers, payload = get_signed_headers_and_body(
+        headers, payload = await sign_executor.sign(
             url=GAME_SIGN_URL,
             header=headers,
             data=payload,
             rsa_public_key=rsa_pub,
         )
-        return await self._dna_request(GAME_SIGN_URL, "POST", headers, data=payload)
+        return await self._dna_request(GAME_SIGN_URL, "POST", headers, data=payload, route="game_sign")
 
     async def bbs_sign(self, token: str, dev_code: Optional[str] = None):
         headers = await get_base_header(dev_code=dev_code, token=token)
         payload = {"gameId": DNA_GAME_ID}
         rsa_pub = await self.get_rsa_public_key()
-        headers, payload = get_signed_headers_and_body(
+        headers, payload = await sign_executor.sign(
             url=BBS_SIGN_URL,
             header=headers,
             data=payload,
             rsa_public_key=rsa_pub,
         )
-        return await self._dna_request(BBS_SIGN_URL, "POST", headers, data=payload)
+        return await self._dna_request(BBS_SIGN_URL, "POST", headers, data=payload, route="bbs_sign")
 
+    @response_cache.cached("/encourage/level/getTaskProcess")
     async def get_task_process(self, token: str, dev_code: Optional[str] = None):
         """获取任务进度"""
         headers = await get_base_header(dev_code=dev_code, token=token)
         data = {"gameId": DNA_GAME_ID}
         try:
-            return await self._dna_request(GET_TASK_PROCESS_URL, "POST", headers, data=data)
+            return await self._dna_request(
+                GET_TASK_PROCESS_URL, "POST", headers, data=data, route="get_task_process", coalesce=True
+            )
         except Exception as e:
             logger.exception("get_task_process", e)
             return DNAApiResp[Any].err("请求皎皎角服务失败")
 
-    @timed_async_cache(
+    @async_ttl_cache(
         3600,
         lambda x: x and isinstance(x, DNAApiResp) and x.is_success,
+        key_args=("token", "dev_code"),
+        maxsize=1024,
     )
     async def get_post_list(self, token: str, dev_code: Optional[str] = None):
         """获取帖子列表"""
@@ -321,7 +339,9 @@ class DNAApi:
             "timeType": 0,
         }
         try:
-            return await self._dna_request(GET_POST_LIST_URL, "POST", headers, data=data)
+            return await self._dna_request(
+                GET_POST_LIST_URL, "POST", headers, data=data, route="get_post_list", coalesce=True
+            )
         except Exception as e:
             logger.exception("get_post_list", e)
             return DNAApiResp[Any].err("请求皎皎角服务失败")
@@ -331,7 +351,9 @@ class DNAApi:
         header = await get_base_header(dev_code=dev_code, token=token)
         data = {"postId": post_id}
         try:
-            return await self._dna_request(GET_POST_DETAIL_URL, "POST", header, data=data)
+            return await self._dna_request(
+                GET_POST_DETAIL_URL, "POST", header, data=data, route="get_post_detail", coalesce=True
+            )
         except Exception as e:
             logger.exception("get_post_detail", e)
             return DNAApiResp[Any].err("请求皎皎角服务失败")
@@ -357,14 +379,14 @@ class DNAApi:
             "toUserId": post.get("userId"),
         }
         rsa_pub = await self.get_rsa_public_key()
-        headers, payload = get_signed_headers_and_body(
+        headers, payload = await sign_executor.sign(
             url=LIKE_POST_URL,
             header=headers,
             data=payload,
             rsa_public_key=rsa_pub,
         )
         try:
-            return await self._dna_request(LIKE_POST_URL, "POST", headers, data=payload)
+            return await self._dna_request(LIKE_POST_URL, "POST", headers, data=payload, route="do_like")
         except Exception as e:
             logger.exception("do_like", e)
             return DNAApiResp[Any].err("请求皎皎角服务失败")
@@ -374,7 +396,7 @@ class DNAApi:
         header = await get_base_header(dev_code=dev_code, token=token)
         data = {"gameId": DNA_GAME_ID}
         try:
-            return await self._dna_request(SHARE_POST_URL, "POST", header, data=data)
+            return await self._dna_request(SHARE_POST_URL, "POST", header, data=data, route="do_share")
         except Exception as e:
             logger.exception("do_share", e)
             return DNAApiResp[Any].err("请求皎皎角服务失败")
@@ -397,13 +419,13 @@ class DNAApi:
             "content": content_json,
             "toUserId": post.get("userId"),
         }
-        headers, payload = get_signed_headers_and_body(
+        headers, payload = await sign_executor.sign(
             url=REPLY_POST_URL,
             header=header,
             data=payload,
             rsa_public_key=rsa_pub,
         )
-        return await self._dna_request(REPLY_POST_URL, "POST", headers, data=payload)
+        return await self._dna_request(REPLY_POST_URL, "POST", headers, data=payload, route="do_reply")
 
     async def get_ann_list(self, is_cache: bool = False):
         if is_cache and self.ann_list_data:
@@ -415,7 +437,7 @@ class DNAApi:
             "searchType": 1,
             "type": 2,
         }
-        res = await self._dna_request(ANN_LIST_URL, "POST", headers, data=data)
+        res = await self._dna_request(ANN_LIST_URL, "POST", headers, data=data, route="get_ann_list", coalesce=True)
         if res.is_success and isinstance(res.data, dict):
             self.ann_list_data = res.data.get("postList", [])
         return self.ann_list_data
@@ -423,7 +445,9 @@ class DNAApi:
     async def get_calendar_info(self):
         headers = await get_base_header(is_h5=True, is_need_origin=True, is_need_refer=True)
         data = {}
-        res = await self._dna_request(CALENDAR_LIST_URL, "POST", headers, data=data)
+        res = await self._dna_request(
+            CALENDAR_LIST_URL, "POST", headers, data=data, route="get_calendar_info", coalesce=True
+        )
         if res.is_success and isinstance(res.data, dict):
             return res.data.get("vos", [])
         return []
@@ -437,13 +461,15 @@ class DNAApi:
             "endTime": "2026-04-05 23:59:59",
             "startTime": "2025-12-01 00:00:00",
         }
-        headers, payload = get_signed_headers_and_body(
+        headers, payload = await sign_executor.sign(
             url=ACTIVITY_LIST_URL,
             header=headers,
             data=payload,
             rsa_public_key=rsa_pub,
         )
-        return await self._dna_request(ACTIVITY_LIST_URL, "POST", headers, data=payload)
+        return await self._dna_request(
+            ACTIVITY_LIST_URL, "POST", headers, data=payload, route="get_activity_info", coalesce=True
+        )
 
     async def _dna_request(
         self,
@@ -455,24 +481,90 @@ class DNAApi:
         data: Optional[Union[str, Dict[str, Any]]] = None,
         max_retries: int = 3,
         retry_delay: float = 1.0,
+        coalesce: bool = False,
+        route: str = "",
     ) -> DNAApiResp[Union[str, Dict[str, Any], List[Any]]]:
+        """发送请求
+
+        route: 路由名（即调用方方法名），按 NeedProxyFunc/NoNeedProxyFunc 决定是否走代理
+        coalesce: 并发的相同请求（地址、token、请求体一致）共享同一次上游请求的结果，
+        只用于幂等的查询接口；签到、点赞、回复等写接口每次都必须真正发出请求。
+        签名接口由发起请求的协程携带自己新生成的 sa/tn，其余协程不会重放旧签名。
+        ApiCassetteMode 为 record 时录制成功响应，为 replay 时只从录像回放。
+        """
         if header is None:
             header = await get_base_header()
 
-        proxy_func = get_need_proxy_func()
-        func = inspect.stack()[1].function
-        if func in proxy_func or "all" in proxy_func:
-            proxy_url = get_local_proxy_url()
-        else:
-            proxy_url = None
-
-        if proxy_url and func in get_no_need_proxy_func():
-            proxy_url = None
+        replaying, recorded = cassette_manager.replay(method, url, params, json_data, data)
+        if replaying:
+            if recorded is None:
+                logger.warning(f"[DNA] 接口录像中没有该请求 route:[{route}] url:[{url}]")
+                return DNAApiResp[Any].err("接口录像中没有该请求")
+            return DNAApiResp[Any].model_validate(recorded)
+
+        proxy_url = proxy_router.resolve(route)
+
+        key = self._coalesce_key(url, method, header, params, json_data, data) if coalesce else None
+        res = await self._singleflight.do(
+            key,
+            lambda: self._send_request(
+                url,
+                method,
+                header,
+                params,
+                json_data,
+                data,
+                max_retries,
+                retry_delay,
+                proxy_url,
+                route,
+            ),
+        )
+        if key is not None:
+            # 合并的请求共享同一个响应对象，各自拿一份拷贝
+            res = copy_resp(res)
+        if res.is_success:
+            response_cache.on_request_done(url, header.get("token"))
+            cassette_manager.record(method, url, params, json_data, data, route, res.model_dump())
+        return res
 
+    @staticmethod
+    def _coalesce_key(
+        url: str,
+        method: str,
+        header: Mapping[str, str],
+        params: Optional[Dict[str, Any]],
+        json_data: Optional[Dict[str, Any]],
+        data: Optional[Union[str, Dict[str, Any]]],
+    ) -> Hashable:
+        """合并键：请求地址 + token + 规范化后的请求体（不含 sa/tn/rk 等一次性签名头）"""
+        payload = json.dumps([params, json_data, data], sort_keys=True, ensure_ascii=False, default=str)
+        return (method, url, header.get("token", ""), payload)
+
+    async def _send_request(
+        self,
+        url: str,
+        method: Literal["GET", "POST"],
+        header: Mapping[str, str],
+        params: Optional[Dict[str, Any]],
+        json_data: Optional[Dict[str, Any]],
+        data: Optional[Union[str, Dict[str, Any]]],
+        max_retries: int,
+        retry_delay: float,
+        proxy_url: Optional[str],
+        route: str,
+    ) -> DNAApiResp[Union[str, Dict[str, Any], List[Any]]]:
         is_proxy = proxy_url is not None
         session = await self.get_session(proxy=proxy_url)
+        breaker = circuit_breakers.get(url)
+        # 一个请求的多次重试只计一次熔断失败
+        failure_recorded = False
         for attempt in range(max_retries):
+            if not breaker.allow():
+                logger.warning(f"[DNA] {breaker.host} 已熔断，跳过请求 route:[{route}]")
+                return DNAApiResp[Any].err("皎皎角服务暂时不可用，请稍后再试")
             try:
+                await rate_limiter.acquire(route, header.get("token"))
                 async with session.request(
                     method,
                     url,
@@ -481,42 +573,44 @@ class DNAApi:
                     json=json_data,
                     data=data,
                     proxy=proxy_url,
-                    timeout=aiohttp.ClientTimeout(total=30),
+                    timeout=http_pool.timeout_for(route),
                 ) as response:
+                    retry_policy.check_status(response.status)
+                    body = await response.read()
                     try:
-                        raw_res = await response.json()
-                    except aiohttp.ContentTypeError:
-                        _raw_data = await response.text()
+                        raw_res = decode_body(body)
+                    except ValueError:
                         raw_res = {
                             "code": RespCode.ERROR.value,
-                            "data": _raw_data,
+                            "data": body.decode("utf-8", errors="replace"),
                         }
-                    if isinstance(raw_res, dict):
-                        try:
-                            raw_res["data"] = json.loads(raw_res.get("data", ""))
-                        except Exception:
-                            pass
 
                     logger.debug(
-                        f"[DNA] url:[{url}] func:[{func}] is_proxy:[{is_proxy}]  params:[{params}] headers:[{header}] data:[{data}] raw_res:{raw_res}"  # noqa: E501
+                        f"[DNA] url:[{url}] route:[{route}] is_proxy:[{is_proxy}]  params:[{params}] headers:[{header}] data:[{data}] raw_res:{raw_res}"  # noqa: E501
                     )
+            except RETRYABLE_EXCEPTIONS as e:
+                if not failure_recorded and retry_policy.is_breaker_failure(e):
+                    failure_recorded = True
+                    breaker.record_failure()
+                logger.warning(f"[DNA] 请求失败 route:[{route}] attempt:[{attempt + 1}/{max_retries}]", e)
+                if attempt < max_retries - 1:  # 最后一次重试不需要等待
+                    await asyncio.sleep(retry_policy.backoff(attempt, retry_delay))
+                continue
+            except Exception as e:
+                logger.warning(f"[DNA] 请求失败 route:[{route}]", e)
+                return DNAApiResp[Any].err("请求服务器失败，请稍后再试")
 
-                    res = DNAApiResp[Any].model_validate(raw_res)
-                    if res.code == 10100 and res.msg == "业务异常":
-                        raise Exception(f"{url} 业务异常: {json.dumps(raw_res, ensure_ascii=False)}")
-                    elif res.code == 200 and res.msg == "请求成功" and not res.data:
-                        if (
-                            url.endswith("/user/login/log")
-                            or url.endswith("/user/getSmsCode")
-                            or url.endswith("/encourage/level/shareTask")
-                        ):
-                            return res
-                        raise Exception(f"{url} 请求成功，但数据为空: {json.dumps(raw_res, ensure_ascii=False)}")
-
-                    return res
+            # 上游有响应即视为可用，业务错误不计入熔断
+            breaker.record_success()
+            try:
+                res = DNAApiResp[Any].model_validate(raw_res)
             except Exception as e:
-                logger.warning("请求失败", e)
-                if attempt < max_retries - 1:  # 最后一次重试不需要等待
-                    await asyncio.sleep(retry_delay * (2**attempt))
+                logger.warning(f"[DNA] 响应解析失败 route:[{route}]", e)
+                return DNAApiResp[Any].err("请求服务器失败，请稍后再试")
+
+            if terminal := retry_policy.terminal_error(url, res):
+                logger.warning(f"[DNA] {url} {terminal.msg}: {json.dumps(raw_res, ensure_ascii=False)}")
+                return terminal
+            return res
 
         return DNAApiResp[Any].err("请求服务器失败，请稍后再试")
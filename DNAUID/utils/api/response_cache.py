@@ -0,0 +1,223 @@
+import time
+import asyncio
+import inspect
+import functools
+from typing import Any, Set, Dict, Tuple, Hashable, Optional, NamedTuple
+from collections import Counter, OrderedDict
+
+from gsuid_core.logger import logger
+
+
+class CacheRule(NamedTuple):
+    """接口缓存规则
+
+    fresh: 新鲜期（秒），期间直接返回缓存
+    stale: 新鲜期过后仍可返回旧数据的时长（秒），同时在后台刷新
+    invalidated_by: 同一 token 请求这些接口成功后，缓存立即失效
+    """
+
+    fresh: float
+    stale: float
+    invalidated_by: Tuple[str, ...] = ()
+
+
+_BBS_TASK_APIS = (
+    "/user/signIn",
+    "/forum/like",
+    "/forum/getPostDetail",
+    "/encourage/level/shareTask",
+    "/forum/comment/createComment",
+)
+
+# 只读接口缓存表，key 为接口路径
+RESPONSE_CACHE_RULES: Dict[str, CacheRule] = {
+    "/role/defaultRoleForTool": CacheRule(60, 600),
+    "/role/getCharDetail": CacheRule(60, 600),
+    "/role/getWeaponDetail": CacheRule(60, 600),
+    "/role/getShortNoteInfo": CacheRule(30, 300),
+    "/encourage/signin/show": CacheRule(30, 300, ("/encourage/signin/signin",)),
+    "/encourage/level/getTaskProcess": CacheRule(30, 300, _BBS_TASK_APIS),
+}
+
+
+def copy_resp(resp: Any) -> Any:
+    """返回响应的浅拷贝
+
+    data 和 parse_data 的结果与原响应共享，每种类型只校验一次；
+    调用方可以修改 code/msg 等字段，但不能修改 data 及解析结果。
+    """
+    return resp.model_copy() if hasattr(resp, "model_copy") else resp
+
+
+class ResponseCache:
+    """按 接口 + token + 参数 缓存只读接口的成功响应（stale-while-revalidate）
+
+    - 每次返回缓存的浅拷贝，data 和已解析的结果在命中之间共享（调用方只读），不会重复校验
+    - 失效时递增 token 的代数，失效前开始、失效后才完成的加载（包括后台刷新）不再写入缓存
+    """
+
+    def __init__(self, rules: Dict[str, CacheRule], maxsize: int = 2048):
+        self.rules = rules
+        self.maxsize = maxsize
+        # key -> (resp, stored_at)
+        self._data: OrderedDict[Hashable, Tuple[Any, float]] = OrderedDict()
+        self._token_keys: Dict[str, Set[Hashable]] = {}
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        # 进行中的加载数与 token 代数，只为有加载进行中的 token 记录代数
+        self._loading: Counter[str] = Counter()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.dropped = 0
+
+    def _lookup(self, key: Hashable, rule: CacheRule) -> Tuple[Optional[Any], bool]:
+        """返回 (缓存值, 是否需要刷新)，无可用缓存时返回 (None, True)"""
+        if not (item := self._data.get(key)):
+            self.misses += 1
+            return None, True
+
+        resp, stored_at = item
+        age = time.monotonic() - stored_at
+        if age <= rule.fresh:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return resp, False
+        if age <= rule.fresh + rule.stale:
+            self._data.move_to_end(key)
+            self.stale_hits += 1
+            return resp, True
+
+        self._discard(key)
+        self.misses += 1
+        return None, True
+
+    def _begin_load(self, token: str) -> Tuple[int, int]:
+        self._loading[token] += 1
+        return self._epoch, self._generations.get(token, 0)
+
+    def _end_load(self, key: Hashable, token: str, generation: Tuple[int, int], resp: Any):
+        """加载完成，加载期间没有失效时才写入缓存"""
+        if generation == (self._epoch, self._generations.get(token, 0)):
+            self._store(key, token, resp)
+        else:
+            self.dropped += 1
+        self._loading[token] -= 1
+        if self._loading[token] <= 0:
+            del self._loading[token]
+            self._generations.pop(token, None)
+
+    def _store(self, key: Hashable, token: str, resp: Any):
+        if not getattr(resp, "is_success", False):
+            return
+        self._data[key] = (resp, time.monotonic())
+        self._data.move_to_end(key)
+        self._token_keys.setdefault(token, set()).add(key)
+        while len(self._data) > self.maxsize:
+            self._discard(next(iter(self._data)))
+
+    def _discard(self, key: Hashable):
+        if self._data.pop(key, None) is None:
+            return
+        token = key[1]  # type: ignore[index]
+        if (keys := self._token_keys.get(token)) is not None:
+            keys.discard(key)
+            if not keys:
+                del self._token_keys[token]
+
+    def invalidate_token(self, token: Optional[str], paths: Optional[Set[str]] = None):
+        """使 token 的缓存失效，paths 为空时清除该 token 的全部缓存（登录、登出、失效时调用）"""
+        if not token:
+            return
+        if token in self._loading:
+            self._generations[token] = self._generations.get(token, 0) + 1
+        for key in list(self._token_keys.get(token, ())):
+            if paths is None or key[0] in paths:  # type: ignore[index]
+                self._discard(key)
+
+    def on_request_done(self, url: str, token: Optional[str]):
+        """写接口请求成功后，使依赖它的缓存失效"""
+        if not token or (token not in self._token_keys and token not in self._loading):
+            return
+        paths = {path for path, rule in self.rules.items() if any(url.endswith(w) for w in rule.invalidated_by)}
+        if paths:
+            self.invalidate_token(token, paths)
+
+    def clear(self):
+        self._epoch += 1
+        self._data.clear()
+        self._token_keys.clear()
+
+    def _refresh_in_background(self, key: Hashable, token: str, loader):
+        if key in self._refreshing:
+            return
+
+        async def _refresh():
+            generation = self._begin_load(token)
+            resp = None
+            try:
+                resp = await loader()
+            except Exception as e:
+                logger.warning(f"[DNA] 后台刷新缓存失败: {key[0]} {e}")  # type: ignore[index]
+            finally:
+                self._end_load(key, token, generation, resp)
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(_refresh())
+
+    def cached(self, path: str):
+        """DNAApi 方法装饰器，方法需要有 token 参数
+
+        调用时可传入 use_cache=False 跳过读取缓存（结果仍会写入缓存）
+        """
+        rule = self.rules[path]
+
+        def decorator(func):
+            sig = inspect.signature(func)
+            names = tuple(name for name in sig.parameters if name != "self")
+
+            @functools.wraps(func)
+            async def wrapper(*args, use_cache: bool = True, **kwargs):
+                bound = sig.bind(*args, **kwargs)
+                bound.apply_defaults()
+                token = bound.arguments.get("token") or ""
+                key = (path, token, tuple(bound.arguments.get(name) for name in names))
+
+                def loader():
+                    return func(*args, **kwargs)
+
+                if not token:
+                    return await loader()
+
+                if use_cache:
+                    resp, need_refresh = self._lookup(key, rule)
+                    if resp is not None:
+                        if need_refresh:
+                            self._refresh_in_background(key, token, loader)
+                        return copy_resp(resp)
+
+                generation = self._begin_load(token)
+                resp = None
+                try:
+                    resp = await loader()
+                finally:
+                    self._end_load(key, token, generation, resp)
+                return copy_resp(resp)
+
+            return wrapper
+
+        return decorator
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshing": len(self._refreshing),
+            "dropped": self.dropped,
+        }
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_RULES)
@@ -0,0 +1,164 @@
+import time
+import random
+import asyncio
+from enum import Enum
+from typing import Any, Dict, Tuple, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from gsuid_core.logger import logger
+
+from ..utils import ConfigSnapshot
+from .request_util import DNAApiResp
+
+# 可重试的 HTTP 状态码（其余 4xx 视为确定性失败）
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+# 只退避重试、不计入熔断的状态码：上游可用，只是限流
+BACKOFF_ONLY_STATUS = {429}
+
+# 数据为空也算成功的接口
+EMPTY_DATA_OK_APIS = (
+    "/user/login/log",
+    "/user/getSmsCode",
+    "/encourage/level/shareTask",
+)
+
+
+def get_breaker_config() -> Tuple[int, int]:
+    from ...dna_config.dna_config import DNAConfig
+
+    return (
+        DNAConfig.get_config("ApiBreakerFailureThreshold").data or 5,
+        DNAConfig.get_config("ApiBreakerCooldown").data or 30,
+    )
+
+
+breaker_config: ConfigSnapshot[Tuple[int, int]] = ConfigSnapshot(get_breaker_config, tuple)
+
+
+class RetryableStatusError(Exception):
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+# 可重试的异常：网络错误、超时、可重试状态码
+RETRYABLE_EXCEPTIONS: Tuple[type, ...] = (aiohttp.ClientError, asyncio.TimeoutError, RetryableStatusError)
+
+
+class RetryPolicy:
+    """请求重试策略"""
+
+    @staticmethod
+    def check_status(status: int):
+        """状态码可重试时抛出 RetryableStatusError"""
+        if status in RETRYABLE_STATUS:
+            raise RetryableStatusError(status)
+
+    @staticmethod
+    def is_breaker_failure(e: BaseException) -> bool:
+        """限流（429）说明上游可用，只退避不计入熔断"""
+        return not (isinstance(e, RetryableStatusError) and e.status in BACKOFF_ONLY_STATUS)
+
+    @staticmethod
+    def terminal_error(url: str, res: DNAApiResp[Any]) -> Optional[DNAApiResp[Any]]:
+        """业务层面的确定性失败，重试也不会成功，直接返回错误响应"""
+        if res.code == 10100 and res.msg == "业务异常":
+            return DNAApiResp[Any].err(res.msg, code=res.code)
+        if res.code == 200 and res.msg == "请求成功" and not res.data:
+            if any(url.endswith(api) for api in EMPTY_DATA_OK_APIS):
+                return None
+            return DNAApiResp[Any].err("请求成功，但数据为空")
+        return None
+
+    @staticmethod
+    def backoff(attempt: int, base_delay: float, max_delay: float = 10) -> float:
+        """指数退避 + 全抖动"""
+        return random.uniform(0, min(max_delay, base_delay * (2**attempt)))
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """单个上游域名的熔断器
+
+    连续 failure_threshold 个请求失败后熔断 cooldown 秒，期间请求直接失败；
+    冷却结束后放行一个探测请求，成功则恢复，失败则继续熔断。
+    一个请求的多次重试只计一次失败，限流（429）不计入。
+    """
+
+    def __init__(self, host: str):
+        self.host = host
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probing = False
+        self._probe_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == BreakerState.CLOSED:
+            return True
+
+        _, cooldown = breaker_config.get()
+        if self.state == BreakerState.OPEN and time.monotonic() - self.opened_at >= cooldown:
+            self.state = BreakerState.HALF_OPEN
+            self._probing = False
+
+        # 探测请求被取消时不会回报结果，超过冷却时间后允许重新探测
+        if self.state == BreakerState.HALF_OPEN and (
+            not self._probing or time.monotonic() - self._probe_at >= cooldown
+        ):
+            self._probing = True
+            self._probe_at = time.monotonic()
+            return True
+
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        if self.state != BreakerState.CLOSED:
+            logger.info(f"[DNA] {self.host} 已恢复，关闭熔断")
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        threshold, cooldown = breaker_config.get()
+        if self.state == BreakerState.HALF_OPEN or self.failures >= threshold:
+            if self.state != BreakerState.OPEN:
+                logger.warning(f"[DNA] {self.host} 连续失败{self.failures}次，熔断{cooldown}秒")
+            self.state = BreakerState.OPEN
+            self.opened_at = time.monotonic()
+            self._probing = False
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+
+class CircuitBreakers:
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        if (breaker := self._breakers.get(host)) is None:
+            breaker = self._breakers[host] = CircuitBreaker(host)
+        return breaker
+
+    def info(self) -> Dict[str, Dict[str, Any]]:
+        return {host: breaker.info() for host, breaker in self._breakers.items()}
+
+
+retry_policy = RetryPolicy()
+circuit_breakers = CircuitBreakers()
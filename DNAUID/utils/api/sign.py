@@ -28,23 +28,44 @@ def get_dev_code() -> str:
     return str(uuid.uuid4()).upper()
 
 
-def get_signed_headers_and_body(
-    url: str,
+def need_sign(url: str) -> bool:
+    return any(url.endswith(api) for api in SIGN_API_LIST)
+
+
+def sign_request(
     header: Dict[str, str],
     data: Dict[str, Any],
     rsa_public_key: str,
 ) -> Tuple[Dict[str, str], Dict[str, Any]]:
-    if not any(url.endswith(api) for api in SIGN_API_LIST):
-        return header, data
-
-    token = header.get("token", "")
-    dev_code = header.get("devCode", "")
-    from .ws_manager import get_ws_manager, get_ws_wait_time
-
-    get_ws_manager().get_connection(token, dev_code, wait_ready=True, timeout=get_ws_wait_time())
-
+    """只做签名计算（纯 CPU），不检查 WebSocket 连接"""
     version = header.get("version", "")
     # source = header.get("source", "")
     if version == "1.2.2":
         return generate_headers_122(header, data, rsa_public_key)
     return generate_headers_120(header, data, rsa_public_key)
+
+
+def wait_ws_ready(token: str, dev_code: str):
+    """阻塞等待 WebSocket 连接就绪，仅供非异步调用方使用"""
+    from .ws_manager import get_ws_manager, get_ws_wait_time
+
+    get_ws_manager().get_connection(token, dev_code, wait_ready=True, timeout=get_ws_wait_time())
+
+
+async def wait_ws_ready_async(token: str, dev_code: str):
+    from .ws_manager import get_ws_manager, get_ws_wait_time
+
+    await get_ws_manager().get_connection_async(token, dev_code, timeout=get_ws_wait_time())
+
+
+def get_signed_headers_and_body(
+    url: str,
+    header: Dict[str, str],
+    data: Dict[str, Any],
+    rsa_public_key: str,
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    if not need_sign(url):
+        return header, data
+
+    wait_ws_ready(header.get("token", ""), header.get("devCode", ""))
+    return sign_request(header, data, rsa_public_key)
@@ -0,0 +1,141 @@
+import time
+import asyncio
+import threading
+from typing import Any, Dict, List, Tuple, Union, TypeVar, Callable, Optional, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+from gsuid_core.logger import logger
+
+from .sign import need_sign, sign_request, wait_ws_ready_async
+from ..utils import ConfigSnapshot
+from .cassette import cassette_manager
+
+T = TypeVar("T")
+
+
+def get_sign_executor_workers() -> int:
+    from ...dna_config.dna_config import DNAConfig
+
+    return DNAConfig.get_config("SignExecutorWorkers").data or 4
+
+
+class SignExecutor:
+    """在线程池中执行请求签名，避免 RSA 加密阻塞事件循环
+
+    签名前在事件循环上异步等待 WebSocket 就绪，不占用签名线程。
+    接口录像回放时不访问网络，跳过等待和签名（sa/tn/rk 不参与录像匹配）。
+    修改线程数后，下一次签名时重建线程池，旧池中已提交的任务继续执行完。
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._workers_config = ConfigSnapshot(get_sign_executor_workers, lambda workers: max(1, workers))
+        self._workers = 0
+        # queued 在签名线程中也会修改，需要加锁
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.in_flight = 0
+        self.max_queued = 0
+        self.total = 0
+        self.total_time = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        workers = self._workers_config.get()
+        if self._executor is None or workers != self._workers:
+            old = self._executor
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dna-sign")
+            self._workers = workers
+            if old is not None:
+                old.shutdown(wait=False)
+            logger.debug(f"[DNA] 签名线程池: x{workers}")
+        return self._executor
+
+    async def sign(
+        self,
+        url: str,
+        header: Dict[str, str],
+        data: Dict[str, Any],
+        rsa_public_key: str,
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """异步版 get_signed_headers_and_body"""
+        if not need_sign(url) or cassette_manager.replaying():
+            return header, data
+
+        await wait_ws_ready_async(header.get("token", ""), header.get("devCode", ""))
+        return await self._run(lambda: sign_request(header, data, rsa_public_key))
+
+    async def sign_batch(
+        self,
+        requests: Sequence[Tuple[str, Dict[str, str], Dict[str, Any]]],
+        rsa_public_key: str,
+    ) -> List[Tuple[Dict[str, str], Dict[str, Any]]]:
+        """批量签名 [(url, header, data), ...]，返回顺序与输入一致
+
+        每个账号只等待一次 WebSocket 就绪（不同账号并发等待），全部签名在一次线程池提交中完成。
+        """
+        results = [(header, data) for _, header, data in requests]
+        if cassette_manager.replaying():
+            return results
+        pending = [i for i, (url, _, _) in enumerate(requests) if need_sign(url)]
+        if not pending:
+            return results
+
+        accounts = {(requests[i][1].get("token", ""), requests[i][1].get("devCode", "")) for i in pending}
+        await asyncio.gather(*(wait_ws_ready_async(token, dev_code) for token, dev_code in accounts))
+
+        def run():
+            # 调用方可能对多个请求复用同一个 header，签名头写在各自的拷贝上
+            return [sign_request(dict(requests[i][1]), requests[i][2], rsa_public_key) for i in pending]
+
+        for i, signed in zip(pending, await self._run(run, len(pending))):
+            results[i] = signed
+        return results
+
+    async def _run(self, fn: Callable[[], T], count: int = 1) -> T:
+        """在签名线程池中执行 fn，count 为其中包含的签名次数"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        start = time.monotonic()
+        # 已提交但还没有线程开始执行；开始执行或被取消时恰好减一次
+        waiting = [True]
+
+        def leave_queue():
+            with self._lock:
+                if waiting[0]:
+                    waiting[0] = False
+                    self.queued -= 1
+
+        def run():
+            leave_queue()
+            return fn()
+
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(executor, run)
+        finally:
+            leave_queue()
+            self.in_flight -= 1
+            self.total += count
+            self.total_time += time.monotonic() - start
+
+    def info(self) -> Dict[str, Union[str, int, float]]:
+        return {
+            "workers": self._workers,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "total": self.total,
+            "avg_ms": round(self.total_time / self.total * 1000, 2) if self.total else 0,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = None
+        self._workers = 0
+
+
+sign_executor = SignExecutor()
@@ -1,7 +1,7 @@
 import base64
 import random
 import hashlib
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 
 def rand_str(length: int) -> str:
@@ -9,15 +9,45 @@ def rand_str(length: int) -> str:
     return "".join(random.choice(chars) for _ in range(length))
 
 
+class RSACipherCache:
+    """缓存解析后的 RSA 公钥与 PKCS1_v1_5 cipher
+
+    只保留当前公钥，get_rsa_public_key 返回新公钥时自动重建。
+    (公钥, cipher) 作为一个整体替换，多线程同时使用时不会取到错配的 cipher。
+    """
+
+    def __init__(self):
+        self._current: Tuple[str, Any] = ("", None)
+        self.builds = 0
+
+    def get(self, public_key_base64: str):
+        key, cipher = self._current
+        if cipher is not None and key == public_key_base64:
+            return cipher
+
+        try:
+            from Crypto.Cipher import PKCS1_v1_5
+            from Crypto.PublicKey import RSA
+        except Exception:
+            raise RuntimeError("[DNA] 缺少依赖: 需要 pycryptodome 执行 RSA 加密。请安装: uv add pycryptodome")
+        try:
+            cipher = PKCS1_v1_5.new(RSA.importKey(base64.b64decode(public_key_base64)))
+        except Exception as e:
+            raise RuntimeError(f"RSA Encrypt Error: {e}")
+        self._current = (public_key_base64, cipher)
+        self.builds += 1
+        return cipher
+
+    def clear(self):
+        self._current = ("", None)
+
+
+rsa_cipher_cache = RSACipherCache()
+
+
 def rsa_encrypt(data: str, public_key_base64: str) -> str:
+    cipher = rsa_cipher_cache.get(public_key_base64)
     try:
-        from Crypto.Cipher import PKCS1_v1_5
-        from Crypto.PublicKey import RSA
-    except Exception:
-        raise RuntimeError("[DNA] 缺少依赖: 需要 pycryptodome 执行 RSA 加密。请安装: uv add pycryptodome")
-    try:
-        key = RSA.importKey(base64.b64decode(public_key_base64))
-        cipher = PKCS1_v1_5.new(key)
         return base64.b64encode(cipher.encrypt(data.encode("utf-8"))).decode("utf-8")
     except Exception as e:
         raise RuntimeError(f"RSA Encrypt Error: {e}")
@@ -1,15 +1,16 @@
-import ssl
 import json
 import time
+import heapq
 import base64
-import threading
-from typing import Any, Optional
-from collections import OrderedDict
+import asyncio
+from typing import Any, Dict, List, Tuple, Union, Mapping, Optional, Sequence
+from collections import Counter, OrderedDict
 
-import websocket
+import aiohttp
 
 from gsuid_core.logger import logger
 
+from ..utils import ConfigSnapshot
 from .request_util import ios_base_header
 
 
@@ -19,27 +20,69 @@ def get_ws_continue_time() -> int:
     return DNAConfig.get_config("WebSocketContinueTime").data or 300
 
 
+def get_ws_url_override() -> str:
+    from ...dna_config.dna_config import DNAConfig
+
+    return DNAConfig.get_config("DNAWsUrl").data or ""
+
+
 def get_ws_wait_time() -> int:
     from ...dna_config.dna_config import DNAConfig
 
     return DNAConfig.get_config("WebSocketWaitTime").data or 5
 
 
+class _Connection:
+    """连接池中的一个连接，ws 为 None 表示正在建立"""
+
+    def __init__(self, key: Tuple[str, str], user_id: str, loop: asyncio.AbstractEventLoop):
+        self.key = key
+        self.user_id = user_id
+        self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        # 建立完成（成功为 True，失败为 False）
+        self.opened: asyncio.Future = loop.create_future()
+        self.task: Optional[asyncio.Task] = None
+        self.touched = time.time()
+
+    @property
+    def is_open(self) -> bool:
+        return self.ws is not None and not self.ws.closed
+
+    def close(self):
+        # 任务可能还没开始运行就被取消，这里直接通知等待方
+        if not self.opened.done():
+            self.opened.set_result(False)
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+
 class WebSocketManager:
     """WebSocket 连接池管理器
 
-    心跳：业务层心跳（每10秒发送 {"event": "ping", "data": {"userId": ...}}）
+    所有连接都运行在 bot 的事件循环上（aiohttp websockets），不再为每个连接创建线程。
+    心跳：业务层心跳，由一个共享的调度任务每10秒向所有连接发送 {"event": "ping", "data": {"userId": ...}}
     """
 
     WS_URL = "wss://dnabbs-api.yingxiong.com:8180/ws-community-websocket"
     MAX_POOL_SIZE = 20
     HEARTBEAT_INTERVAL = 10
 
-    def __init__(self):
-        # _pool 存储 (ws, timestamp) 元组
-        self._pool: OrderedDict[tuple[str, str], tuple[Any, float]] = OrderedDict()
-        self._lock = threading.Lock()
-        self._ready_events: dict[tuple[str, str], threading.Event] = {}
+    def __init__(self, ws_url: Optional[str] = None):
+        # ws_url 优先，其次是 DNAWsUrl 配置，最后是 WS_URL
+        self._ws_url = ws_url
+        self._pool: OrderedDict[Tuple[str, str], _Connection] = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        # 过期索引：按最后续时时间排序的最小堆 (touched, key)，续时只追加，旧条目出堆时跳过
+        self._expiry: List[Tuple[float, Tuple[str, str]]] = []
+        self._continue_time = ConfigSnapshot(get_ws_continue_time, int)
+        # 固定的连接（引用计数），不会被过期清理或 LRU 淘汰
+        self._pins: Dict[Tuple[str, str], int] = {}
+        # 连接池上限，批量签到期间按并发数临时调大
+        self.max_pool_size = self.MAX_POOL_SIZE
+        # opened: 新建连接 reused: 复用连接 evicted: LRU 淘汰 expired: 过期关闭
+        self.stats: Counter[str] = Counter()
 
     def _extract_user_id(self, token: str) -> str:
         try:
@@ -53,169 +96,330 @@ class WebSocketManager:
             pass
         return ""
 
-    def _start_heartbeat(self, ws: Any, user_id: str):
-        def heartbeat_loop():
-            while True:
-                time.sleep(self.HEARTBEAT_INTERVAL)
+    @property
+    def ws_url(self) -> str:
+        return self._ws_url or get_ws_url_override() or self.WS_URL
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            # 与原 websocket-client 的 CERT_NONE 一致，不校验证书
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=False))
+        return self._session
+
+    # ---------- 心跳 ----------
+
+    def _ensure_heartbeat(self):
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+    async def _heartbeat_loop(self):
+        """共享心跳调度：每个周期关闭过期连接并向其余连接发送一次 ping，连接池为空时退出"""
+        while self._pool:
+            await asyncio.sleep(self.HEARTBEAT_INTERVAL)
+            self._evict_expired()
+            conns = [conn for conn in self._pool.values() if conn.is_open]
+            await asyncio.gather(*(self._send_ping(conn) for conn in conns), return_exceptions=True)
+
+    async def _send_ping(self, conn: _Connection):
+        if conn.ws is None:
+            return
+        try:
+            await conn.ws.send_str(json.dumps({"event": "ping", "data": {"userId": conn.user_id}}))
+        except Exception as e:
+            logger.debug(f"[DNA WebSocket] heartbeat failed (error: {e})")
+            conn.close()
+
+    # ---------- 连接 ----------
+
+    async def _run_connection(self, conn: _Connection):
+        token, dev_code = conn.key
+        headers = {
+            "sourse": "ios",
+            "appVersion": ios_base_header.get("version", "1.2.0"),
+            "token": token,
+            "devCode": dev_code,
+        }
+        try:
+            conn.ws = await self._get_session().ws_connect(self.ws_url, headers=headers, heartbeat=None)
+            logger.debug("[DNA WebSocket] on_open is successed")
+            self._touch(conn)
+            if not conn.opened.done():
+                conn.opened.set_result(True)
+            self._ensure_heartbeat()
+
+            async for msg in conn.ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    logger.debug(f"[DNA WebSocket] received message: {msg.data}")
+                    # 快速过期检查，签到中固定的连接只续时不关闭
+                    if self._is_expired(conn):
+                        if conn.key not in self._pins:
+                            break
+                        self._touch(conn)
+                elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                    break
+        except Exception as e:
+            logger.debug(f"[DNA WebSocket] on_error is called (error: {e})")
+        finally:
+            if not conn.opened.done():
+                conn.opened.set_result(False)
+            if self._pool.get(conn.key) is conn:
+                del self._pool[conn.key]
+            if conn.ws is not None and not conn.ws.closed:
                 try:
-                    if ws.sock and ws.sock.connected:
-                        ws.send(json.dumps({"event": "ping", "data": {"userId": user_id}}))
-                    else:
-                        break
+                    await conn.ws.close()
                 except Exception:
-                    break
+                    pass
+            logger.debug("[DNA WebSocket] on_close is called")
+
+    def _is_expired(self, conn: _Connection) -> bool:
+        return time.time() - conn.touched > self._continue_time.get()
+
+    def _touch(self, conn: _Connection):
+        """续时，O(log n)"""
+        conn.touched = time.time()
+        heapq.heappush(self._expiry, (conn.touched, conn.key))
+        # 旧条目过多时重建索引，堆大小保持在连接数的常数倍
+        if len(self._expiry) > 2 * len(self._pool) + 64:
+            self._expiry = [(c.touched, k) for k, c in self._pool.items()]
+            heapq.heapify(self._expiry)
+
+    def _evict_expired(self):
+        """从堆顶弹出并关闭所有过期连接，每个过期连接 O(log n)"""
+        deadline = time.time() - self._continue_time.get()
+        while self._expiry and self._expiry[0][0] < deadline:
+            touched, key = heapq.heappop(self._expiry)
+            if not (conn := self._pool.get(key)) or conn.touched != touched:
+                continue
+            if key in self._pins:
+                # 固定的连接直接续时
+                self._touch(conn)
+                continue
+            self._cleanup_connection(key)
+            self.stats["expired"] += 1
+
+    def _cleanup_connection(self, key: Tuple[str, str]):
+        if conn := self._pool.pop(key, None):
+            conn.close()
+
+    def _acquire(self, token: str, dev_code: str) -> _Connection:
+        """取出或新建连接（必须在事件循环中调用）"""
+        key = (token, dev_code)
 
-        threading.Thread(target=heartbeat_loop, daemon=True).start()
+        # 清理过期连接（包括当前请求的）
+        self._evict_expired()
+
+        # 检查连接是否存在且有效（未过期）
+        if conn := self._pool.get(key):
+            # 续时：更新时间戳以延长连接过期时间
+            self._touch(conn)
+            self._pool.move_to_end(key)
+            self.stats["reused"] += 1
+            return conn
+
+        # LRU 淘汰：超过上限则移除最老的未固定连接，全部固定时允许暂时超出上限
+        while len(self._pool) >= self.max_pool_size:
+            if (victim := next((k for k in self._pool if k not in self._pins), None)) is None:
+                break
+            self._cleanup_connection(victim)
+            self.stats["evicted"] += 1
+
+        # 创建新连接
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        conn = _Connection(key, self._extract_user_id(token), loop)
+        conn.task = asyncio.create_task(self._run_connection(conn))
+        self._pool[key] = conn
+        self._touch(conn)
+        self.stats["opened"] += 1
+        return conn
+
+    def pin(self, token: str, dev_code: str):
+        key = (token, dev_code)
+        self._pins[key] = self._pins.get(key, 0) + 1
 
-    def _create_connection(self, token: str, dev_code: str, ready_event: threading.Event) -> Optional[Any]:
-        try:
-            key = (token, dev_code)
-            user_id = self._extract_user_id(token)
-
-            def _remove_from_pool():
-                with self._lock:
-                    self._pool.pop(key, None)
-                    self._ready_events.pop(key, None)
-
-            def on_message(ws, message):
-                # 快速过期检查
-                logger.debug(f"[DNA WebSocket] received message: {message}")
-                with self._lock:
-                    if (item := self._pool.get(key)) and time.time() - item[1] > get_ws_continue_time():
-                        try:
-                            ws.close()
-                        except Exception:
-                            pass
-
-            def on_error(ws, error):
-                logger.debug(f"[DNA WebSocket] on_error is called (error: {error})")
-                _remove_from_pool()
-                ready_event.set()  # 即使出错也要释放等待
-
-            def on_close(ws, close_status_code, close_msg):
-                logger.debug(f"[DNA WebSocket] on_close is called (code: {close_status_code}, message: {close_msg})")
-                _remove_from_pool()
-
-            def on_open(ws):
-                logger.debug("[DNA WebSocket] on_open is successed")
-                with self._lock:
-                    self._pool[key] = (ws, time.time())
-                self._start_heartbeat(ws, user_id)
-                ready_event.set()  # 连接成功，释放等待
-
-            ws = websocket.WebSocketApp(
-                self.WS_URL,
-                header=[
-                    f"{k}:{v}"
-                    for k, v in {
-                        "sourse": "ios",
-                        "appVersion": ios_base_header.get("version", "1.2.0"),
-                        "token": token,
-                        "devCode": dev_code,
-                    }.items()
-                ],
-                on_open=on_open,
-                on_message=on_message,
-                on_error=on_error,
-                on_close=on_close,
-            )
-
-            threading.Thread(target=lambda: ws.run_forever(sslopt={"cert_reqs": ssl.CERT_NONE}), daemon=True).start()
-            return ws
-        except Exception as e:
-            logger.warning(f"[DNA WebSocket] connection failed (error: {e})")
-            ready_event.set()
+    def unpin(self, token: str, dev_code: str):
+        key = (token, dev_code)
+        if (count := self._pins.get(key, 0)) <= 1:
+            self._pins.pop(key, None)
+        else:
+            self._pins[key] = count - 1
+
+    def prewarm(self, token: str, dev_code: str):
+        """提前建立连接，不等待就绪"""
+        if token and dev_code:
+            self._acquire(token, dev_code)
+
+    def sign_run(
+        self,
+        accounts: Union[Sequence[Tuple[str, str]], Mapping[int, Tuple[str, str]]],
+        concurrency: int,
+        lookahead: int,
+    ) -> "SignRunAdmission":
+        return SignRunAdmission(self, accounts, concurrency, lookahead)
+
+    async def get_connection_async(
+        self, token: str, dev_code: str, timeout: float = 5
+    ) -> Optional[aiohttp.ClientWebSocketResponse]:
+        """获取连接，等待连接建立或超时"""
+        if not token or not dev_code:
             return None
 
-    def _is_expired(self, key: tuple[str, str]) -> bool:
-        if not (item := self._pool.get(key)):
-            return True
-        return time.time() - item[1] > get_ws_continue_time()
+        conn = self._acquire(token, dev_code)
+        if conn.is_open:
+            return conn.ws
 
-    def _cleanup_connection(self, key: tuple[str, str]):
-        if item := self._pool.pop(key, None):
-            try:
-                item[0].close()
-            except Exception:
-                pass
+        logger.debug(f"[DNA WebSocket] waiting for connection to be established (timeout {timeout}s)...")
+        try:
+            # shield：等待超时不影响其他等待同一连接的协程
+            opened = await asyncio.wait_for(asyncio.shield(conn.opened), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"[DNA WebSocket] waiting for connection to be established timeout ({timeout}s)")
+            # 超时后清理连接
+            if self._pool.get(conn.key) is conn:
+                self._cleanup_connection(conn.key)
+            return None
+
+        if not opened:
+            logger.warning("[DNA WebSocket] connection is failed")
+            return None
+        logger.debug("[DNA WebSocket] connection is ready")
+        return conn.ws
 
     def get_connection(self, token: str, dev_code: str, wait_ready: bool = False, timeout: float = 5) -> Optional[Any]:
+        """同步获取连接，仅供非异步调用方（其他线程）使用
+
+        在事件循环线程中调用时不能阻塞等待：wait_ready=False 时只触发建立连接并返回当前可用的连接，
+        wait_ready=True 时抛出 RuntimeError，请改用 get_connection_async。
+        """
         if not token or not dev_code:
             return None
-        key = (token, dev_code)
 
-        with self._lock:
-            # 检查连接是否存在且有效（未过期）
-            if (item := self._pool.get(key)) and time.time() - item[1] <= get_ws_continue_time():
-                # 续时：更新时间戳以延长连接过期时间
-                self._pool[key] = (item[0], time.time())
-                self._pool.move_to_end(key)
-                return item[0]
-
-            # 清理当前请求的无效连接
-            if key in self._pool:
-                self._cleanup_connection(key)
-
-            # 批量清理其他过期连接
-            for expired_key in [k for k in self._pool if self._is_expired(k)]:
-                self._cleanup_connection(expired_key)
-
-            # LRU 淘汰：超过上限则移除最老的
-            while len(self._pool) >= self.MAX_POOL_SIZE:
-                self._cleanup_connection(self._pool.popitem(last=False)[0])
-
-            # 创建新连接
-            ready_event = threading.Event()
-            self._ready_events[key] = ready_event
-
-            ws = self._create_connection(token, dev_code, ready_event)
-            if not ws:
-                self._ready_events.pop(key, None)
-                return None
-
-            self._pool[key] = (ws, time.time())  # on_open 会更新为实际建立时间
-
-        # 等待连接建立
-        if wait_ready:
-            logger.debug(f"[DNA WebSocket] waiting for connection to be established (timeout {timeout}s)...")
-            if ready_event.wait(timeout):
-                with self._lock:
-                    if key in self._pool:
-                        logger.debug("[DNA WebSocket] connection is ready")
-                        return self._pool[key][0]
-                    else:
-                        logger.warning("[DNA WebSocket] connection is failed")
-                        return None
-            else:
-                logger.warning(f"[DNA WebSocket] waiting for connection to be established timeout ({timeout}s)")
-                # 超时后清理连接
-                with self._lock:
-                    self._cleanup_connection(key)
-                    self._ready_events.pop(key, None)
-                return None
-
-        return ws
-
-    def get_active_tokens(self, limit: Optional[int] = 3) -> list[tuple[str, str]]:
-        with self._lock:
-            current_time = time.time()
-            active_tokens = []
-            for key, item in self._pool.items():
-                if current_time - item[1] <= get_ws_continue_time():
-                    token, dev_code = key
-                    active_tokens.append((token, dev_code))
-                    if limit is not None and len(active_tokens) >= limit:
-                        break
-            return active_tokens
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is not None:
+            if wait_ready:
+                raise RuntimeError("不能在事件循环线程中同步等待 WebSocket 连接，请使用 get_connection_async")
+            conn = self._acquire(token, dev_code)
+            return conn.ws if conn.is_open else None
+
+        if self._loop is None or self._loop.is_closed():
+            logger.warning("[DNA WebSocket] 事件循环未启动，无法建立连接")
+            return None
+
+        future = asyncio.run_coroutine_threadsafe(self.get_connection_async(token, dev_code, timeout), self._loop)
+        if not wait_ready:
+            return None
+        try:
+            return future.result(timeout + 1)
+        except Exception:
+            return None
+
+    def get_active_tokens(self, limit: Optional[int] = 3) -> List[Tuple[str, str]]:
+        active_tokens = []
+        for key, conn in list(self._pool.items()):
+            if conn.is_open and not self._is_expired(conn):
+                active_tokens.append(key)
+                if limit is not None and len(active_tokens) >= limit:
+                    break
+        return active_tokens
 
     def close_all(self):
-        with self._lock:
-            while self._pool:
-                key, item = self._pool.popitem()
-                try:
-                    item[0].close()
-                except Exception:
-                    pass
+        while self._pool:
+            self._pool.popitem()[1].close()
+        self._expiry.clear()
+
+    async def close(self):
+        """关闭全部连接与 session（关闭插件时调用）"""
+        tasks = [conn.task for conn in self._pool.values() if conn.task]
+        self.close_all()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "size": len(self._pool),
+            "open": sum(1 for conn in self._pool.values() if conn.is_open),
+            "pinned": len(self._pins),
+            **self.stats,
+        }
+
+
+class SignRunAdmission:
+    """批量签到的连接池准入策略
+
+    - 第 i 个账号开始签到时，提前建立第 i+1 ~ i+lookahead 个账号的连接
+    - 预热和正在签到的账号连接被固定，签到结束前不会被淘汰
+    - 运行期间连接池上限调整为 max(MAX_POOL_SIZE, 并发数 + lookahead)
+    - 结束时统计本次运行的连接池变动（新建/复用/淘汰/过期）
+    accounts 可以是完整列表，也可以是流式签到时只保存窗口内账号的 {序号: 账号} 字典
+
+        with manager.sign_run(accounts, concurrency, lookahead) as admission:
+            admission.start(i)
+            ...
+            admission.finish(i)
+    """
+
+    def __init__(
+        self,
+        manager: WebSocketManager,
+        accounts: Union[Sequence[Tuple[str, str]], Mapping[int, Tuple[str, str]]],
+        concurrency: int,
+        lookahead: int,
+    ):
+        self.manager = manager
+        self.accounts = accounts
+        self.concurrency = max(1, concurrency)
+        self.lookahead = max(0, lookahead)
+        # 序号 -> 固定时的账号，解除固定时不再读取 accounts（流式签到时窗口内的账号可能已被移除）
+        self._pinned: Dict[int, Tuple[str, str]] = {}
+        self._baseline: Counter[str] = Counter()
+        self._max_pool_size = manager.max_pool_size
+        self.churn: Dict[str, int] = {}
+
+    def __enter__(self) -> "SignRunAdmission":
+        manager = self.manager
+        self._baseline = manager.stats.copy()
+        self._max_pool_size = manager.max_pool_size
+        manager.max_pool_size = max(manager.max_pool_size, self.concurrency + self.lookahead)
+        return self
+
+    def __exit__(self, *exc):
+        for index in list(self._pinned):
+            self.finish(index)
+        self.manager.max_pool_size = self._max_pool_size
+        self.churn = {k: self.manager.stats[k] - self._baseline[k] for k in ("opened", "reused", "evicted", "expired")}
+
+    def _pin(self, index: int, prewarm: bool):
+        if index in self._pinned:
+            return
+        try:
+            token, dev_code = self.accounts[index]
+        except (IndexError, KeyError):
+            # 还没读取到的账号
+            return
+        if not token or not dev_code:
+            return
+        self.manager.pin(token, dev_code)
+        self._pinned[index] = (token, dev_code)
+        if prewarm:
+            self.manager.prewarm(token, dev_code)
+
+    def start(self, index: int):
+        """第 index 个账号开始签到"""
+        self._pin(index, prewarm=False)
+        for next_index in range(index + 1, index + 1 + self.lookahead):
+            self._pin(next_index, prewarm=True)
+
+    def finish(self, index: int):
+        """第 index 个账号签到结束，解除固定"""
+        if (account := self._pinned.pop(index, None)) is not None:
+            self.manager.unpin(*account)
 
 
 # 全局单例
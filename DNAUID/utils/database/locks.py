@@ -0,0 +1,192 @@
+import time
+import asyncio
+import inspect
+import functools
+from typing import Any, Dict, Tuple, Mapping, Callable, Hashable, Iterable, Optional, Sequence
+from contextlib import AsyncExitStack, asynccontextmanager
+from collections import defaultdict
+
+from ..utils import ConfigSnapshot
+
+DB_LOCK_MODES = ("keyed", "global")
+
+
+def _load_db_lock_mode() -> str:
+    from ...dna_config.dna_config import DNAConfig
+
+    return DNAConfig.get_config("DBLockMode").data or "keyed"
+
+
+_db_lock_mode = ConfigSnapshot(_load_db_lock_mode, lambda mode: mode if mode in DB_LOCK_MODES else "keyed")
+
+
+def get_db_lock_mode() -> str:
+    return _db_lock_mode.get()
+
+
+class _LockStats:
+    __slots__ = ("acquired", "contended", "wait_total", "wait_max")
+
+    def __init__(self):
+        self.acquired = 0
+        self.contended = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class KeyedLock:
+    """按 (表, 自然键) 加锁的数据库写锁
+
+    - keyed（默认）：不同记录的写入互不等待，例如某个群的隐私设置不用等另一个用户的签到写入
+    - global：所有写入共用一把锁，SQLite 频繁出现 database is locked 时使用
+    同时统计每张表的等待次数与等待时间，用于判断数据库写入是否仍是瓶颈。
+    """
+
+    def __init__(self):
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._refs: Dict[Hashable, int] = {}
+        self._global = asyncio.Lock()
+        self._stats: Dict[str, _LockStats] = defaultdict(_LockStats)
+        self.waiting = 0
+        self.holders = 0
+        self.max_holders = 0
+
+    @asynccontextmanager
+    async def hold(self, table: str, key: Hashable, mode: Optional[str] = None):
+        lock_key = (table, key) if (mode or get_db_lock_mode()) == "keyed" else None
+        if lock_key is None:
+            lock = self._global
+        else:
+            lock = self._locks.setdefault(lock_key, asyncio.Lock())
+            self._refs[lock_key] = self._refs.get(lock_key, 0) + 1
+
+        stats = self._stats[table]
+        contended = lock.locked()
+        start = time.monotonic()
+        self.waiting += 1
+        waited = False
+        try:
+            async with lock:
+                self.waiting -= 1
+                waited = True
+                wait = time.monotonic() - start
+                stats.acquired += 1
+                stats.wait_total += wait
+                stats.wait_max = max(stats.wait_max, wait)
+                if contended:
+                    stats.contended += 1
+
+                self.holders += 1
+                self.max_holders = max(self.max_holders, self.holders)
+                try:
+                    yield
+                finally:
+                    self.holders -= 1
+        finally:
+            if not waited:
+                # 等待锁时被取消
+                self.waiting -= 1
+            if lock_key is not None:
+                self._refs[lock_key] -= 1
+                if not self._refs[lock_key]:
+                    del self._refs[lock_key]
+                    self._locks.pop(lock_key, None)
+
+    @asynccontextmanager
+    async def hold_many(self, table: str, keys: Iterable[Hashable]):
+        """批量写入时获取多条记录的锁
+
+        keyed 模式下去重后按顺序逐个获取，避免两次批量写入互相等待；global 模式下只获取一次全局锁。
+        """
+        mode = get_db_lock_mode()
+        async with AsyncExitStack() as stack:
+            if mode == "keyed":
+                for key in sorted(set(keys)):
+                    await stack.enter_async_context(self.hold(table, key, mode))
+            else:
+                await stack.enter_async_context(self.hold(table, None, mode))
+            yield
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "mode": get_db_lock_mode(),
+            "waiting": self.waiting,
+            "holders": self.holders,
+            "max_holders": self.max_holders,
+            "keys": len(self._locks),
+            "tables": {
+                table: {
+                    "acquired": stats.acquired,
+                    "contended": stats.contended,
+                    "avg_wait_ms": round(stats.wait_total / stats.acquired * 1000, 2) if stats.acquired else 0,
+                    "max_wait_ms": round(stats.wait_max * 1000, 2),
+                }
+                for table, stats in self._stats.items()
+            },
+        }
+
+
+db_locks = KeyedLock()
+
+
+def call_key_getter(func, key_fields: Sequence[str]) -> Callable[[Tuple, Dict], Tuple]:
+    """从 with_session 方法的调用参数中取键
+
+    key_fields 为参数名，可以用 `参数.属性` 取属性，例如 `dna_sign_data.uid`。
+    """
+    signature = inspect.signature(func)
+    signature = signature.replace(parameters=[p for p in signature.parameters.values() if p.name != "session"])
+
+    def get_key(args: Tuple, kwargs: Dict) -> Tuple:
+        arguments = signature.bind(*args, **kwargs).arguments
+        key = []
+        for field in key_fields:
+            name, *attrs = field.split(".")
+            value = arguments.get(name)
+            for attr in attrs:
+                value = getattr(value, attr, None)
+            key.append(value)
+        return tuple(key)
+
+    return get_key
+
+
+def with_lock(*key_fields: str):
+    """按参数取自然键加写锁，需放在 with_session 外层"""
+
+    def decorator(func):
+        get_key = call_key_getter(func, key_fields)
+
+        @functools.wraps(func)
+        async def wrapper(cls, *args, **kwargs):
+            async with db_locks.hold(cls.__name__, get_key((cls, *args), kwargs)):
+                return await func(cls, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _item_value(item: Any, field: str) -> Any:
+    return item.get(field) if isinstance(item, Mapping) else getattr(item, field, None)
+
+
+def with_locks(items_field: str, *key_fields: str):
+    """批量写入时按列表参数中每一项的自然键加写锁，需放在 with_session 外层
+
+    items_field 为列表参数名，key_fields 为每一项中的键名（字典）或属性名。
+    """
+
+    def decorator(func):
+        get_items = call_key_getter(func, (items_field,))
+
+        @functools.wraps(func)
+        async def wrapper(cls, *args, **kwargs):
+            (items,) = get_items((cls, *args), kwargs)
+            keys = [tuple(_item_value(item, field) for field in key_fields) for item in items or ()]
+            async with db_locks.hold_many(cls.__name__, keys):
+                return await func(cls, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,9 +1,9 @@
-import asyncio
-import functools
-from typing import Any, Dict, List, Type, Union, TypeVar, Optional
+import random
+from typing import Any, Dict, List, Type, Tuple, Union, TypeVar, ClassVar, Optional, AsyncIterator
+from dataclasses import dataclass
 
 from sqlmodel import Field, col, select
-from sqlalchemy import null, delete, update
+from sqlalchemy import Index, UniqueConstraint, func, null, delete, update, inspect
 from sqlalchemy.sql import or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -16,36 +16,152 @@ from gsuid_core.utils.database.base_models import (
     with_session,
 )
 
+from .locks import with_lock, with_locks
 from ..utils import get_today_date
+from .privacy_cache import invalidates_user_privacy, invalidates_group_privacy
 
 NO_CHANGE = object()
 
+SIGN_FIELDS = (
+    "game_sign",
+    "bbs_sign",
+    "bbs_detail",
+    "bbs_like",
+    "bbs_share",
+    "bbs_reply",
+)
+SIGN_UNIQUE_INDEX = "ux_dnasign_uid_date"
+# 单条 INSERT 的最大行数，避免超过 SQLite 的变量数量限制
+BULK_UPSERT_CHUNK = 100
+# 首次补全绑定关系表时每批读取的 DNABind 行数
+BIND_BACKFILL_BATCH = 1000
+
 exec_list.extend(
     [
         "ALTER TABLE DNAUser ADD COLUMN d_num TEXT DEFAULT ''",
         "ALTER TABLE DNAUser ADD COLUMN refresh_token TEXT DEFAULT ''",
         "ALTER TABLE dnaprivacy ADD COLUMN uid_hidden BOOLEAN DEFAULT 0",
         "ALTER TABLE dna_group_privacy ADD COLUMN force_uid_hidden BOOLEAN DEFAULT NULL",
+        # 热点查询的复合索引
+        "CREATE INDEX IF NOT EXISTS ix_dnauser_uid_user_bot ON DNAUser (uid, user_id, bot_id)",
+        "CREATE INDEX IF NOT EXISTS ix_dnauser_cookie ON DNAUser (cookie)",
+        "CREATE INDEX IF NOT EXISTS ix_dnauser_uid_cookie ON DNAUser (uid, cookie)",
+        "CREATE INDEX IF NOT EXISTS ix_dnaprivacy_user_bot ON dnaprivacy (user_id, bot_id)",
+        "CREATE INDEX IF NOT EXISTS ix_dnabind_user_bot ON DNABind (user_id, bot_id)",
     ]
 )
 
+
+@dataclass(slots=True)
+class DNAUserBrief:
+    """批量任务（自动签到等）使用的用户投影，只包含需要的列"""
+
+    COLUMNS: ClassVar[Tuple[str, ...]] = (
+        "uid",
+        "user_id",
+        "bot_id",
+        "cookie",
+        "dev_code",
+        "d_num",
+        "refresh_token",
+        "sign_switch",
+    )
+
+    uid: str
+    user_id: str
+    bot_id: str
+    cookie: str
+    dev_code: str
+    d_num: str
+    refresh_token: str
+    sign_switch: str
+    # 只读取有效用户，状态恒为空
+    status: str = ""
+
+
 T_DNABind = TypeVar("T_DNABind", bound="DNABind")
+T_DNABindUID = TypeVar("T_DNABindUID", bound="DNABindUID")
 T_DNAUser = TypeVar("T_DNAUser", bound="DNAUser")
 T_DNASign = TypeVar("T_DNASign", bound="DNASign")
 T_DNAPrivacy = TypeVar("T_DNAPrivacy", bound="DNAPrivacy")
 T_DNAGroupPrivacy = TypeVar("T_DNAGroupPrivacy", bound="DNAGroupPrivacy")
 
 
-_DB_WRITE_LOCK = asyncio.Lock()
+def split_uids(uid: Optional[str]) -> List[str]:
+    """拆分 DNABind.uid（_ 连接的多个 UID），去掉空值和重复值，保持顺序"""
+    return list(dict.fromkeys(filter(None, (uid or "").split("_"))))
 
 
-def with_lock(func):
-    @functools.wraps(func)
-    async def wrapper(*args, **kwargs):
-        async with _DB_WRITE_LOCK:
-            return await func(*args, **kwargs)
+class DNABindUID(BaseIDModel, table=True):
+    """UID 绑定关系表：DNABind.uid 按 _ 拆分后每个 UID 一行，只用于按群组查询的索引
 
-    return wrapper
+    DNABind 仍是数据来源，单个用户的绑定查询直接读 DNABind；
+    DNABind 的每次写入都在同一事务中重写该用户的行，首次启动时由 backfill 从 DNABind 补全。
+    position 为 UID 在 DNABind.uid 中的顺序，0 为当前使用的 UID。
+    """
+
+    __tablename__ = "dna_bind_uid"
+    __table_args__ = (
+        UniqueConstraint("user_id", "bot_id", "uid", name="ux_dna_bind_uid_user_bot_uid"),
+        {"extend_existing": True},
+    )
+    user_id: str = Field(title="用户ID")
+    bot_id: str = Field(title="Bot ID")
+    uid: str = Field(title="二重螺旋uid", index=True)
+    group_id: Optional[str] = Field(default=None, title="群组ID", index=True)
+    position: int = Field(default=0, title="顺序")
+
+    @classmethod
+    async def _sync_bind(
+        cls: Type[T_DNABindUID],
+        session: AsyncSession,
+        user_id: str,
+        bot_id: Optional[str],
+    ):
+        """按 DNABind 当前的 uid/group_id 重写该用户的行（内部方法，与 DNABind 的写入在同一事务中）"""
+        sql = select(DNABind).where(DNABind.user_id == user_id, DNABind.bot_id == bot_id).order_by(DNABind.id).limit(1)
+        bind = (await session.execute(sql)).scalars().first()
+        await session.execute(delete(cls).where(and_(col(cls.user_id) == user_id, col(cls.bot_id) == bot_id)))
+        if bind is None or bot_id is None:
+            return
+        session.add_all(
+            cls(user_id=user_id, bot_id=bot_id, uid=uid, group_id=bind.group_id, position=position)
+            for position, uid in enumerate(split_uids(bind.uid))
+        )
+
+    @classmethod
+    @with_session
+    async def backfill(cls: Type[T_DNABindUID], session: AsyncSession) -> int:
+        """一次性从 DNABind 补全该表，表中已有数据时直接返回 0，否则返回写入的行数"""
+        if (await session.execute(select(cls.id).limit(1))).first() is not None:
+            return 0
+
+        inserted = 0
+        after_id = 0
+        seen = set()
+        while True:
+            sql = (
+                select(DNABind.id, DNABind.user_id, DNABind.bot_id, DNABind.uid, DNABind.group_id)
+                .where(col(DNABind.id) > after_id)
+                .order_by(col(DNABind.id))
+                .limit(BIND_BACKFILL_BATCH)
+            )
+            rows = (await session.execute(sql)).all()
+            if not rows:
+                return inserted
+            after_id = rows[-1][0]
+            for _, user_id, bot_id, uids, group_id in rows:
+                # 与 select_data 一致，同一用户只取第一条
+                if (user_id, bot_id) in seen:
+                    continue
+                seen.add((user_id, bot_id))
+                items = [
+                    cls(user_id=user_id, bot_id=bot_id, uid=uid, group_id=group_id, position=position)
+                    for position, uid in enumerate(split_uids(uids))
+                ]
+                session.add_all(items)
+                inserted += len(items)
+            await session.flush()
 
 
 class DNABind(Bind, table=True):
@@ -55,9 +171,37 @@ class DNABind(Bind, table=True):
     @classmethod
     @with_session
     async def get_group_all_uid(cls: Type[T_DNABind], session: AsyncSession, group_id: str) -> List[T_DNABind]:
-        result = await session.scalars(select(cls).where(col(cls.group_id).contains(group_id)))
+        """群内的所有绑定（覆盖 Bind.get_group_all_uid），走绑定关系表的群组索引"""
+        sql = (
+            select(cls)
+            .join(
+                DNABindUID,
+                and_(col(DNABindUID.user_id) == col(cls.user_id), col(DNABindUID.bot_id) == col(cls.bot_id)),
+            )
+            .where(col(DNABindUID.group_id) == group_id)
+            .distinct()
+        )
+        result = await session.scalars(sql)
         return list(result.all()) if result else []
 
+    @classmethod
+    @with_session
+    async def insert_data(cls, session: AsyncSession, user_id: str, bot_id: Optional[str] = None, **data) -> int:
+        session.add(cls(user_id=user_id, bot_id=bot_id, **data))
+        await session.flush()
+        await DNABindUID._sync_bind(session, user_id, bot_id)
+        return 0
+
+    @classmethod
+    @with_session
+    async def update_data(cls, session: AsyncSession, user_id: str, bot_id: Optional[str] = None, **data) -> int:
+        sql = update(cls).where(and_(col(cls.user_id) == user_id, col(cls.bot_id) == bot_id)).values(**data)
+        await session.execute(sql)
+        # 切换、追加、删除 UID 和修改群组都经过这里
+        if "uid" in data or "group_id" in data:
+            await DNABindUID._sync_bind(session, user_id, bot_id)
+        return 0
+
     @classmethod
     async def insert_uid(
         cls: Type[T_DNABind],
@@ -85,15 +229,14 @@ class DNABind(Bind, table=True):
 
         # 第一次绑定
         if not await cls.bind_exists(user_id, bot_id):
-            code = await cls.insert_data(user_id=user_id, bot_id=bot_id, **{"uid": uid, "group_id": group_id})
-            return code
+            return await cls.insert_data(user_id=user_id, bot_id=bot_id, **{"uid": uid, "group_id": group_id})
 
         # 获取历史
         result: Optional[T_DNABind] = await cls.select_data(user_id, bot_id)
         if not result:
             return -1
 
-        current_uids = list(dict.fromkeys(filter(None, result.uid.split("_"))))
+        current_uids = split_uids(result.uid)
         if uid in current_uids:
             return -2
 
@@ -114,12 +257,12 @@ class DNABind(Bind, table=True):
             return -1
 
         result.remove(uid)
-        result = [i for i in result if i] if result else []
 
         if not result:
             # 没有剩余uid，使用 SQL DELETE 删除记录
             sql = delete(cls).where(and_(col(cls.user_id) == user_id, col(cls.bot_id) == bot_id))
             await session.execute(sql)
+            await DNABindUID._sync_bind(session, user_id, bot_id)
             return 0
         else:
             # 还有剩余uid，更新记录
@@ -130,6 +273,7 @@ class DNABind(Bind, table=True):
     async def delete_all_uid(cls: Type[T_DNABind], session: AsyncSession, user_id: str, bot_id: str) -> int:
         sql = delete(cls).where(and_(col(cls.user_id) == user_id, col(cls.bot_id) == bot_id))
         await session.execute(sql)
+        await DNABindUID._sync_bind(session, user_id, bot_id)
         return 0
 
 
@@ -162,9 +306,9 @@ class DNAUser(User, table=True):
             cls.uid == uid,
             cls.bot_id == bot_id,
         )
-        result = await session.execute(sql)
-        data = result.scalars().all()
-        return data[0].cookie if data else None
+        result = await session.execute(sql.limit(1))
+        data = result.scalars().first()
+        return data.cookie if data else None
 
     @classmethod
     @with_session
@@ -180,9 +324,8 @@ class DNAUser(User, table=True):
             cls.uid == uid,
             cls.bot_id == bot_id,
         )
-        result = await session.execute(sql)
-        data = result.scalars().all()
-        return data[0] if data else None
+        result = await session.execute(sql.limit(1))
+        return result.scalars().first()
 
     @classmethod
     @with_session
@@ -223,9 +366,8 @@ class DNAUser(User, table=True):
     @with_session
     async def select_data_by_cookie(cls: Type[T_DNAUser], session: AsyncSession, cookie: str) -> Optional[T_DNAUser]:
         sql = select(cls).where(cls.cookie == cookie)
-        result = await session.execute(sql)
-        data = result.scalars().all()
-        return data[0] if data else None
+        result = await session.execute(sql.limit(1))
+        return result.scalars().first()
 
     @classmethod
     @with_session
@@ -233,9 +375,8 @@ class DNAUser(User, table=True):
         cls: Type[T_DNAUser], session: AsyncSession, cookie: str, uid: str
     ) -> Optional[T_DNAUser]:
         sql = select(cls).where(cls.cookie == cookie, cls.uid == uid)
-        result = await session.execute(sql)
-        data = result.scalars().all()
-        return data[0] if data else None
+        result = await session.execute(sql.limit(1))
+        return result.scalars().first()
 
     @classmethod
     async def get_user_by_attr(
@@ -253,22 +394,99 @@ class DNAUser(User, table=True):
                 continue
             return user
 
+    @classmethod
+    def _valid_user_clause(cls):
+        return and_(
+            or_(col(cls.status) == null(), col(cls.status) == ""),
+            col(cls.cookie) != null(),
+            col(cls.cookie) != "",
+        )
+
     @classmethod
     @with_session
     async def get_dna_all_user(cls: Type[T_DNAUser], session: AsyncSession) -> List[T_DNAUser]:
         """获取所有有效用户"""
-        sql = select(cls).where(
-            and_(
-                or_(col(cls.status) == null(), col(cls.status) == ""),
-                col(cls.cookie) != null(),
-                col(cls.cookie) != "",
-            )
-        )
+        sql = select(cls).where(cls._valid_user_clause())
 
         result = await session.execute(sql)
         data = result.scalars().all()
         return list(data)
 
+    @classmethod
+    @with_session
+    async def count_dna_all_user(cls: Type[T_DNAUser], session: AsyncSession) -> int:
+        """有效用户数"""
+        result = await session.execute(select(func.count()).select_from(cls).where(cls._valid_user_clause()))
+        return result.scalar_one()
+
+    @classmethod
+    async def _iter_valid_user_rows(cls, columns: Tuple[str, ...], batch_size: int) -> AsyncIterator[Tuple]:
+        """按主键分批（keyset）读取有效用户的指定列，每行为 (id, *columns)
+
+        每批使用独立的短会话，不会在整个批量任务期间占用数据库；
+        内存占用只和 batch_size 有关，与用户总数无关。
+        """
+        last_id = 0
+        while True:
+            rows = await cls._select_valid_user_batch(last_id, batch_size, columns)
+            for row in rows:
+                yield row
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
+
+    @classmethod
+    @with_session
+    async def _select_valid_user_batch(
+        cls,
+        session: AsyncSession,
+        after_id: int,
+        limit: int,
+        columns: Tuple[str, ...],
+    ) -> List[Tuple]:
+        sql = (
+            select(col(cls.id), *(col(getattr(cls, field)) for field in columns))
+            .where(cls._valid_user_clause(), col(cls.id) > after_id)
+            .order_by(col(cls.id))
+            .limit(limit)
+        )
+        result = await session.execute(sql)
+        return [tuple(row) for row in result.all()]
+
+    @classmethod
+    async def iter_dna_all_user(cls, batch_size: int = 500) -> AsyncIterator[DNAUserBrief]:
+        """逐批读取所有有效用户，只取批量任务需要的列"""
+        async for row in cls._iter_valid_user_rows(DNAUserBrief.COLUMNS, batch_size):
+            yield DNAUserBrief(*row[1:])
+
+    @classmethod
+    async def get_random_dna_users(cls: Type[T_DNAUser], count: int, batch_size: int = 500) -> List[T_DNAUser]:
+        """随机取 count 个有效用户
+
+        分批读取主键做蓄水池抽样，内存中只保留 count 个主键和一批主键，不加载全部用户。
+        """
+        if count <= 0:
+            return []
+        sample: List[int] = []
+        seen = 0
+        async for (user_id,) in cls._iter_valid_user_rows((), batch_size):
+            seen += 1
+            if len(sample) < count:
+                sample.append(user_id)
+            elif (index := random.randrange(seen)) < count:
+                sample[index] = user_id
+        if not sample:
+            return []
+        users = await cls._select_users_by_ids(sample)
+        random.shuffle(users)
+        return users
+
+    @classmethod
+    @with_session
+    async def _select_users_by_ids(cls: Type[T_DNAUser], session: AsyncSession, ids: List[int]) -> List[T_DNAUser]:
+        result = await session.execute(select(cls).where(col(cls.id).in_(ids)))
+        return list(result.scalars().all())
+
     @classmethod
     @with_session
     async def delete_all_invalid_cookie(cls, session: AsyncSession):
@@ -323,41 +541,22 @@ class DNASign(BaseIDModel, table=True):
         date: str,
     ) -> Optional[T_DNASign]:
         """查找指定UID和日期的签到记录（内部方法）"""
-        query = select(cls).where(cls.uid == uid).where(cls.date == date)
+        query = select(cls).where(cls.uid == uid).where(cls.date == date).limit(1)
         result = await session.execute(query)
         return result.scalars().first()
 
     @classmethod
-    @with_lock
-    @with_session
-    async def upsert_dna_sign(
+    async def _upsert_sign_record(
         cls: Type[T_DNASign],
         session: AsyncSession,
         dna_sign_data: T_DNASign,
-    ) -> Optional[T_DNASign]:
-        """
-        插入或更新签到数据
-        返回更新后的记录或新插入的记录
-        """
-        if not dna_sign_data.uid:
-            return None
-
-        # 确保日期有值
-        dna_sign_data.date = dna_sign_data.date or get_today_date()
-
-        # 查询是否存在记录
+    ) -> T_DNASign:
+        """查询后插入或更新单条签到记录（内部方法）"""
         record = await cls._find_sign_record(session, dna_sign_data.uid, dna_sign_data.date)
 
         if record:
             # 更新已有记录
-            for field in [
-                "game_sign",
-                "bbs_sign",
-                "bbs_detail",
-                "bbs_like",
-                "bbs_share",
-                "bbs_reply",
-            ]:
+            for field in SIGN_FIELDS:
                 value = getattr(dna_sign_data, field)
                 if value:
                     setattr(record, field, value)
@@ -369,6 +568,84 @@ class DNASign(BaseIDModel, table=True):
 
         return result
 
+    @classmethod
+    @with_locks("rows", "uid", "date")
+    @with_session
+    async def bulk_upsert_dna_sign(
+        cls: Type[T_DNASign],
+        session: AsyncSession,
+        rows: List[Dict[str, Any]],
+        on_conflict: bool = True,
+    ) -> int:
+        """批量插入或更新签到数据，返回写入行数
+
+        rows 为包含 uid、date 与签到字段的字典，只覆盖非 0 的签到字段。
+        SQLite/PostgreSQL 使用多行 INSERT ... ON CONFLICT（依赖 (uid, date) 唯一索引），
+        其他数据库或 on_conflict=False 时逐行查询后写入，均在同一事务中完成。
+        """
+        if not rows:
+            return 0
+
+        dialect = session.bind.dialect.name if session.bind else ""
+        if on_conflict and dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        elif on_conflict and dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            for row in rows:
+                await cls._upsert_sign_record(session, cls(**row))
+            return len(rows)
+
+        for start in range(0, len(rows), BULK_UPSERT_CHUNK):
+            sql = insert(cls).values(rows[start : start + BULK_UPSERT_CHUNK])
+            sql = sql.on_conflict_do_update(
+                index_elements=["uid", "date"],
+                set_={
+                    field: func.coalesce(func.nullif(sql.excluded[field], 0), getattr(cls, field))
+                    for field in SIGN_FIELDS
+                },
+            )
+            await session.execute(sql)
+        return len(rows)
+
+    @classmethod
+    @with_session
+    async def migrate_unique_index(cls: Type[T_DNASign], session: AsyncSession) -> int:
+        """一次性迁移：合并 (uid, date) 重复的签到记录后建立唯一索引，返回合并的重复行数
+
+        bulk_upsert_dna_sign 依赖该唯一索引。已有索引时直接返回，不扫描全表；
+        重复记录保留 id 最大的一行，各签到字段取所有重复行的最大值，不丢失任何签到状态。
+        """
+        index = Index(SIGN_UNIQUE_INDEX, cls.uid, cls.date, unique=True)
+
+        def has_index(sync_session) -> bool:
+            indexes = inspect(sync_session.connection()).get_indexes(cls.__tablename__)
+            return any(item["name"] == SIGN_UNIQUE_INDEX for item in indexes)
+
+        if await session.run_sync(has_index):
+            return 0
+
+        sql = (
+            select(
+                cls.uid,
+                cls.date,
+                func.max(cls.id),
+                *(func.max(getattr(cls, field)) for field in SIGN_FIELDS),
+            )
+            .group_by(cls.uid, cls.date)
+            .having(func.count() > 1)
+        )
+        merged = 0
+        for uid, date, keep_id, *flags in (await session.execute(sql)).all():
+            await session.execute(update(cls).where(col(cls.id) == keep_id).values(dict(zip(SIGN_FIELDS, flags))))
+            result = await session.execute(
+                delete(cls).where(col(cls.uid) == uid, col(cls.date) == date, col(cls.id) != keep_id)
+            )
+            merged += result.rowcount or 0
+
+        await session.run_sync(lambda sync_session: index.create(sync_session.connection(), checkfirst=True))
+        return merged
+
     @classmethod
     @with_session
     async def get_sign_data(
@@ -395,7 +672,19 @@ class DNASign(BaseIDModel, table=True):
         return list(result.scalars().all())
 
     @classmethod
-    @with_lock
+    @with_session
+    async def count_sign_by_date(
+        cls: Type[T_DNASign],
+        session: AsyncSession,
+        date: Optional[str] = None,
+    ) -> int:
+        """根据日期统计签到数量"""
+        actual_date = date or get_today_date()
+        result = await session.execute(select(func.count()).select_from(cls).where(cls.date == actual_date))
+        return result.scalar_one()
+
+    @classmethod
+    @with_lock("date")
     @with_session
     async def clear_sign_record(
         cls: Type[T_DNASign],
@@ -430,12 +719,34 @@ class DNAPrivacy(BaseIDModel, table=True):
             cls.user_id == user_id,
             cls.bot_id == bot_id,
         )
+        result = await session.execute(sql.limit(1))
+        return result.scalars().first()
+
+    @classmethod
+    @with_session
+    async def get_privacy_flags(
+        cls: Type[T_DNAPrivacy],
+        session: AsyncSession,
+        user_id: str,
+        bot_id: str,
+    ) -> Tuple[bool, bool]:
+        """一次查询同时取得 (允许被窥屏, 隐藏UID)
+
+        与 get_privacy_setting / is_uid_hidden 的结果一致，未设置时为 (True, False)。
+        """
+        sql = select(cls).where(cls.user_id == user_id, cls.bot_id == bot_id).order_by(col(cls.id))
         result = await session.execute(sql)
-        data = result.scalars().all()
-        return data[0] if data else None
+        records = result.scalars().all()
+        if not records:
+            return True, False
+
+        allow_peek = records[0].allow_peek
+        uid_hidden = next((i.uid_hidden for i in reversed(records) if i.group_id is None), False)
+        return allow_peek, uid_hidden
 
     @classmethod
-    @with_lock
+    @with_lock("user_id", "bot_id")
+    @invalidates_user_privacy
     @with_session
     async def set_privacy_setting(
         cls: Type[T_DNAPrivacy],
@@ -457,12 +768,11 @@ class DNAPrivacy(BaseIDModel, table=True):
             cls.user_id == user_id,
             cls.bot_id == bot_id,
         )
-        result = await session.execute(sql)
-        data = result.scalars().all()
+        result = await session.execute(sql.limit(1))
+        record = result.scalars().first()
 
-        if data:
+        if record:
             # 更新现有记录
-            record = data[0]
             if allow_peek is not None:
                 record.allow_peek = allow_peek
             if uid_hidden is not None:
@@ -535,12 +845,12 @@ class DNAGroupPrivacy(BaseIDModel, table=True):
             cls.group_id == group_id,
             cls.bot_id == bot_id,
         )
-        result = await session.execute(sql)
-        data = result.scalars().all()
-        return data[0] if data else None
+        result = await session.execute(sql.limit(1))
+        return result.scalars().first()
 
     @classmethod
-    @with_lock
+    @with_lock("group_id", "bot_id")
+    @invalidates_group_privacy
     @with_session
     async def set_group_force_privacy(
         cls: Type[T_DNAGroupPrivacy],
@@ -562,12 +872,11 @@ class DNAGroupPrivacy(BaseIDModel, table=True):
             cls.group_id == group_id,
             cls.bot_id == bot_id,
         )
-        result = await session.execute(sql)
-        data = result.scalars().all()
+        result = await session.execute(sql.limit(1))
+        record = result.scalars().first()
 
-        if data:
+        if record:
             # 更新现有记录
-            record = data[0]
             if force_allow_peek is not NO_CHANGE:
                 record.force_allow_peek = force_allow_peek
             if force_uid_hidden is not NO_CHANGE:
@@ -603,10 +912,10 @@ class DNAGroupPrivacy(BaseIDModel, table=True):
             cls.group_id == group_id,
             cls.bot_id == bot_id,
         )
-        result = await session.execute(sql)
-        data = result.scalars().all()
-        if data:
-            return data[0].force_allow_peek
+        result = await session.execute(sql.limit(1))
+        record = result.scalars().first()
+        if record:
+            return record.force_allow_peek
         return None
 
     @classmethod
@@ -630,10 +939,10 @@ class DNAGroupPrivacy(BaseIDModel, table=True):
             cls.group_id == group_id,
             cls.bot_id == bot_id,
         )
-        result = await session.execute(sql)
-        data = result.scalars().all()
-        if data:
-            return data[0].force_uid_hidden
+        result = await session.execute(sql.limit(1))
+        record = result.scalars().first()
+        if record:
+            return record.force_uid_hidden
         return None
 
 
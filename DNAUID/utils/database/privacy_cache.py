@@ -0,0 +1,122 @@
+import functools
+from typing import Dict, Tuple, Optional, NamedTuple
+
+from .locks import call_key_getter
+from ..utils import AsyncTTLCache
+
+
+class UserPrivacy(NamedTuple):
+    allow_peek: bool = True
+    uid_hidden: bool = False
+
+
+class GroupPrivacy(NamedTuple):
+    force_allow_peek: Optional[bool] = None
+    force_uid_hidden: Optional[bool] = None
+
+
+class ResolvedPrivacy(NamedTuple):
+    """群强制设置优先于个人设置后的结果"""
+
+    allow_peek: bool
+    uid_hidden: bool
+
+
+class PrivacyResolver:
+    """用户/群隐私设置的内存缓存
+
+    两张隐私表按 (user_id, bot_id) / (group_id, bot_id) 缓存，一次 resolve 同时给出
+    是否允许被查看和是否隐藏UID，命中时不访问数据库。
+    通过 set_privacy_setting / set_group_force_privacy 写入后立即失效对应条目；
+    TTL 只用于兜底网页控制台等绕过这两个方法的修改。
+    """
+
+    MAX_SIZE = 10000
+    TTL = 600
+
+    def __init__(self):
+        self._users = AsyncTTLCache(self.TTL, maxsize=self.MAX_SIZE)
+        self._groups = AsyncTTLCache(self.TTL, maxsize=self.MAX_SIZE)
+        self._version = 0
+
+    async def _load(self, cache: AsyncTTLCache, key: Tuple, loader):
+        version = self._version
+        value = await cache.get_or_load(key, loader)
+        if version != self._version:
+            # 加载期间有写入，结果可能是旧数据，不保留
+            cache.delete(key)
+        return value
+
+    async def get_user(self, user_id: str, bot_id: str) -> UserPrivacy:
+        from .models import DNAPrivacy
+
+        async def loader():
+            return UserPrivacy(*await DNAPrivacy.get_privacy_flags(user_id, bot_id))
+
+        return await self._load(self._users, (user_id, bot_id), loader)
+
+    async def get_group(self, group_id: str, bot_id: str) -> GroupPrivacy:
+        from .models import DNAGroupPrivacy
+
+        async def loader():
+            record = await DNAGroupPrivacy.get_group_privacy(group_id, bot_id)
+            if record is None:
+                return GroupPrivacy()
+            return GroupPrivacy(record.force_allow_peek, record.force_uid_hidden)
+
+        return await self._load(self._groups, (group_id, bot_id), loader)
+
+    async def resolve(self, user_id: str, bot_id: str, group_id: Optional[str] = None) -> ResolvedPrivacy:
+        user = await self.get_user(user_id, bot_id)
+        group = await self.get_group(group_id, bot_id) if group_id else GroupPrivacy()
+        return ResolvedPrivacy(
+            allow_peek=user.allow_peek if group.force_allow_peek is None else group.force_allow_peek,
+            uid_hidden=user.uid_hidden if group.force_uid_hidden is None else group.force_uid_hidden,
+        )
+
+    def invalidate_user(self, user_id: str, bot_id: str):
+        self._version += 1
+        self._users.delete((user_id, bot_id))
+
+    def invalidate_group(self, group_id: str, bot_id: str):
+        self._version += 1
+        self._groups.delete((group_id, bot_id))
+
+    def clear(self):
+        self._version += 1
+        self._users.clear()
+        self._groups.clear()
+
+    def info(self) -> Dict[str, Dict[str, int]]:
+        return {"users": self._users.info(), "groups": self._groups.info()}
+
+
+privacy_resolver = PrivacyResolver()
+
+
+def invalidates_user_privacy(func):
+    """写入完成后失效用户隐私缓存，需放在 with_session 外层"""
+    get_key = call_key_getter(func, ("user_id", "bot_id"))
+
+    @functools.wraps(func)
+    async def wrapper(cls, *args, **kwargs):
+        try:
+            return await func(cls, *args, **kwargs)
+        finally:
+            privacy_resolver.invalidate_user(*get_key((cls, *args), kwargs))
+
+    return wrapper
+
+
+def invalidates_group_privacy(func):
+    """写入完成后失效群隐私缓存，需放在 with_session 外层"""
+    get_key = call_key_getter(func, ("group_id", "bot_id"))
+
+    @functools.wraps(func)
+    async def wrapper(cls, *args, **kwargs):
+        try:
+            return await func(cls, *args, **kwargs)
+        finally:
+            privacy_resolver.invalidate_group(*get_key((cls, *args), kwargs))
+
+    return wrapper
@@ -0,0 +1,190 @@
+import asyncio
+from typing import Any, Dict, List, Tuple, Optional
+from collections import Counter
+
+from gsuid_core.logger import logger
+
+from ..utils import get_today_date
+from .models import SIGN_FIELDS, DNASign
+
+SignKey = Tuple[str, str]
+
+
+def get_sign_buffer_config() -> Tuple[int, int]:
+    from ...dna_config.dna_config import DNASignConfig
+
+    size = DNASignConfig.get_config("SignWriteBatchSize").data or 100
+    interval = DNASignConfig.get_config("SignWriteFlushInterval").data or 5
+    return max(1, size), max(1, interval)
+
+
+def merge_sign_row(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """合并同一 uid/date 的两次写入，与 upsert 一致只用非 0 字段覆盖"""
+    merged = dict(old)
+    for field in SIGN_FIELDS:
+        if new.get(field):
+            merged[field] = new[field]
+    return merged
+
+
+class SignWriteBuffer:
+    """签到结果写缓冲
+
+    签到结束时只把结果放进内存，累计满 N 行或每 T 秒用多行 upsert 批量写入数据库，
+    签到期间数据库写入不再逐行排队。
+    - 同一 uid/date 的多次写入在内存中合并，读取时合并缓冲中未落库的数据
+    - 整批写入失败时改为逐行写入，仍失败的行放回缓冲下次重试，超过 MAX_RETRIES 次后丢弃
+    - 关闭时写入剩余数据
+    """
+
+    MAX_RETRIES = 3
+
+    def __init__(self):
+        self._pending: Dict[SignKey, Dict[str, Any]] = {}
+        self._flushing: Dict[SignKey, Dict[str, Any]] = {}
+        self._retries: Dict[SignKey, int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self.stats: Counter = Counter()
+
+    def _lookup(self, key: SignKey) -> Optional[Dict[str, Any]]:
+        flushing, pending = self._flushing.get(key), self._pending.get(key)
+        if flushing and pending:
+            return merge_sign_row(flushing, pending)
+        return pending or flushing
+
+    def put(self, dna_sign: DNASign):
+        """放入一条签到结果，需在事件循环中调用"""
+        if not dna_sign.uid:
+            return
+
+        row = {
+            "uid": dna_sign.uid,
+            "date": dna_sign.date or get_today_date(),
+            **{field: getattr(dna_sign, field) or 0 for field in SIGN_FIELDS},
+        }
+        key = (row["uid"], row["date"])
+        old = self._pending.get(key)
+        self._pending[key] = merge_sign_row(old, row) if old else row
+        self.stats["put"] += 1
+
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_loop())
+
+        size, _ = get_sign_buffer_config()
+        if len(self._pending) >= size and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    async def get_sign_data(self, uid: str, date: Optional[str] = None) -> Optional[DNASign]:
+        """与 DNASign.get_sign_data 相同，额外合并缓冲中还未写入的数据"""
+        date = date or get_today_date()
+        key = (uid, date)
+        # 查询前后各取一次缓冲，避免查询期间刚好写入完成而漏掉
+        before = self._lookup(key)
+        record = await DNASign.get_sign_data(uid, date)
+        after = self._lookup(key)
+
+        rows = [row for row in (before, after) if row]
+        if not rows:
+            return record
+        if record is None:
+            record = DNASign(uid=uid, date=date)
+        for row in rows:
+            for field in SIGN_FIELDS:
+                if row.get(field):
+                    setattr(record, field, row[field])
+        return record
+
+    async def _flush_loop(self):
+        while self._pending:
+            _, interval = get_sign_buffer_config()
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.exception(f"[DNAUID] 签到数据写入失败: {e}")
+
+    async def _write(self, rows: List[Tuple[SignKey, Dict[str, Any]]]) -> Dict[SignKey, Dict[str, Any]]:
+        """写入一批数据，返回写入失败的行"""
+        try:
+            await DNASign.bulk_upsert_dna_sign([row for _, row in rows])
+            self.stats["batches"] += 1
+            return {}
+        except Exception as e:
+            logger.warning(f"[DNAUID] 签到数据批量写入失败，改为逐行写入: {e}")
+
+        # 逐行查询后写入，不依赖 (uid, date) 唯一索引，唯一索引迁移失败时也能写入
+        failed: Dict[SignKey, Dict[str, Any]] = {}
+        for key, row in rows:
+            try:
+                await DNASign.bulk_upsert_dna_sign([row], on_conflict=False)
+            except Exception as e:
+                logger.warning(f"[DNAUID] 签到数据写入失败 uid={key[0]}: {e}")
+                failed[key] = row
+        return failed
+
+    def _requeue(self, failed: Dict[SignKey, Dict[str, Any]]):
+        for key, row in failed.items():
+            retries = self._retries.get(key, 0) + 1
+            if retries > self.MAX_RETRIES:
+                self._retries.pop(key, None)
+                self.stats["dropped"] += 1
+                logger.error(f"[DNAUID] 签到数据写入失败 {self.MAX_RETRIES} 次，已丢弃: {row}")
+                continue
+            self._retries[key] = retries
+            # 失败期间可能又有新的写入，新数据优先
+            newer = self._pending.get(key)
+            self._pending[key] = merge_sign_row(row, newer) if newer else row
+
+    async def flush(self) -> int:
+        """写入缓冲中的全部数据，返回成功写入的行数"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            self._flushing, self._pending = self._pending, {}
+            size, _ = get_sign_buffer_config()
+            rows = list(self._flushing.items())
+            written: List[SignKey] = []
+            failed: Dict[SignKey, Dict[str, Any]] = {}
+            done = 0
+            try:
+                for start in range(0, len(rows), size):
+                    chunk = rows[start : start + size]
+                    chunk_failed = await self._write(chunk)
+                    failed.update(chunk_failed)
+                    written.extend(key for key, _ in chunk if key not in chunk_failed)
+                    done = start + len(chunk)
+            finally:
+                # 被取消时未处理的行也放回缓冲
+                failed.update(rows[done:])
+                for key in written:
+                    self._retries.pop(key, None)
+                self._requeue(failed)
+                self._flushing = {}
+
+            self.stats["written"] += len(written)
+            self.stats["failed"] += len(failed)
+            return len(written)
+
+    async def close(self):
+        """停止定时写入并写入剩余数据"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+        if self._pending:
+            logger.error(f"[DNAUID] 关闭时仍有 {len(self._pending)} 条签到数据未能写入")
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending) + len(self._flushing),
+            "written": self.stats["written"],
+            "batches": self.stats["batches"],
+            "failed": self.stats["failed"],
+            "dropped": self.stats["dropped"],
+        }
+
+
+sign_buffer = SignWriteBuffer()
@@ -0,0 +1,79 @@
+import time
+from typing import Set, Dict, Tuple, Optional
+
+from ..utils import get_today_date, get_yesterday_date
+
+
+class StatsSnapshot:
+    """状态页统计快照
+
+    首次读取时用 COUNT 查询初始化，之后由登录/登出/失效与签到增量更新，
+    状态页刷新时不再查询数据库；每 RESYNC_INTERVAL 秒重新 COUNT 一次，
+    修正增量更新覆盖不到的修改（网页控制台编辑等）。
+    签到按 (uid, 日期) 去重计数，同一账号并发保存多次只计一次。
+    """
+
+    RESYNC_INTERVAL = 600
+
+    def __init__(self):
+        self._user_num: Optional[Tuple[int, float]] = None
+        self._sign_num: Dict[str, Tuple[int, float]] = {}
+        # 日期 -> 已计数的 uid
+        self._signed: Dict[str, Set[str]] = {}
+
+    def _stale(self, item: Tuple[int, float]) -> bool:
+        return time.monotonic() - item[1] >= self.RESYNC_INTERVAL
+
+    async def user_num(self) -> int:
+        """有效登录账户数"""
+        from .models import DNAUser
+
+        item = self._user_num
+        if item is None or self._stale(item):
+            item = self._user_num = (await DNAUser.count_dna_all_user(), time.monotonic())
+        return item[0]
+
+    async def sign_num(self, date: Optional[str] = None) -> int:
+        """指定日期（默认今天）的签到账户数"""
+        from .models import DNASign
+
+        date = date or get_today_date()
+        item = self._sign_num.get(date)
+        if item is None or self._stale(item):
+            item = self._sign_num[date] = (await DNASign.count_sign_by_date(date), time.monotonic())
+            self._prune()
+        return item[0]
+
+    def _prune(self):
+        # 状态页只展示今天和昨天
+        keep = (get_today_date(), get_yesterday_date())
+        for data in (self._sign_num, self._signed):
+            for key in [key for key in data if key not in keep]:
+                del data[key]
+
+    def add_user(self, delta: int = 1):
+        """登录成功 +1，登出或登录失效 -1；还没有初始化时忽略，首次读取时会 COUNT"""
+        if self._user_num is not None:
+            num, synced = self._user_num
+            self._user_num = (max(0, num + delta), synced)
+
+    def add_sign(self, uid: str, date: Optional[str] = None):
+        """新增一条签到记录，同一 uid 同一天只计一次"""
+        date = date or get_today_date()
+        if (signed := self._signed.get(date)) is None:
+            signed = self._signed[date] = set()
+            self._prune()
+        if uid in signed:
+            return
+        signed.add(uid)
+        if item := self._sign_num.get(date):
+            num, synced = item
+            self._sign_num[date] = (num + 1, synced)
+
+    def clear(self):
+        self._user_num = None
+        self._sign_num.clear()
+        self._signed.clear()
+
+
+dna_stats = StatsSnapshot()
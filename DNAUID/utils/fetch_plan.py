@@ -0,0 +1,63 @@
+import asyncio
+import inspect
+from typing import Any, Dict, Tuple, Callable, NamedTuple
+
+
+class FetchStep(NamedTuple):
+    func: Callable[..., Any]
+    deps: Tuple[str, ...]
+
+
+class FetchPlan:
+    """按依赖关系并发获取卡片所需的数据
+
+    每一步声明自己依赖的步骤，互不依赖的步骤并发执行，
+    依赖的步骤完成后立即开始，依赖结果为 None 时跳过（结果也为 None）。
+
+        plan = FetchPlan()
+        plan.add("role", fetch_role)
+        plan.add("detail", lambda role: fetch_detail(role.charEid), "role")
+        plan.add("uid_hidden", lambda: is_uid_hidden(user_id, bot_id, group_id))
+        results = await plan.run()
+
+    任意一步抛出异常时取消其余步骤并向上抛出。
+    """
+
+    def __init__(self):
+        self._steps: Dict[str, FetchStep] = {}
+
+    def add(self, name: str, func: Callable[..., Any], *deps: str) -> "FetchPlan":
+        """添加一步，func 按 deps 的顺序接收依赖结果，可以是同步或异步函数
+
+        依赖必须先添加，因此计划中不会出现环。
+        """
+        if name in self._steps:
+            raise ValueError(f"重复的步骤: {name}")
+        if missing := [dep for dep in deps if dep not in self._steps]:
+            raise ValueError(f"步骤 {name} 依赖未定义的步骤: {missing}")
+        self._steps[name] = FetchStep(func, deps)
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def _run(step: FetchStep):
+            values = [await tasks[dep] for dep in step.deps]
+            if any(value is None for value in values):
+                return None
+            result = step.func(*values)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        # 先创建全部任务再让出事件循环，依赖的任务在被等待前一定已存在
+        for name, step in self._steps.items():
+            tasks[name] = asyncio.create_task(_run(step))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        return {name: task.result() for name, task in tasks.items()}
@@ -1,4 +1,5 @@
 import os
+import copy
 import random
 from typing import Tuple, Union, Optional
 from pathlib import Path
@@ -241,6 +242,17 @@ def get_grade_img(grade_level: int) -> Image.Image:
     return grades[grade_level]
 
 
+async def get_user_avatar(ev: Event, avatar_user_id: Optional[str] = None) -> Image.Image:
+    """获取用户头像，avatar_user_id 为 None 时使用发送者自己的头像
+
+    头像可能与同一事件的其他请求并发获取，只修改事件副本的 at，不改动原事件
+    """
+    avatar_ev = copy.copy(ev)
+    # at 为空时获取发送者自己的头像
+    avatar_ev.at = avatar_user_id or None
+    return await get_event_avatar(avatar_ev, avatar_path=AVATAR_PATH)
+
+
 async def get_avatar_title_img(
     ev: Event,
     uid: str,
@@ -249,7 +261,9 @@ async def get_avatar_title_img(
     other_info: Optional[list[tuple[str, str]]] = None,
     avatar_user_id: Optional[str] = None,
     uid_hidden: bool = False,
+    avatar: Optional[Image.Image] = None,
 ):
+    """avatar: 已提前获取的头像（get_user_avatar），为 None 时在此获取"""
     from .fonts.dna_fonts import (
         dna_font_20,
         dna_font_24,
@@ -289,16 +303,8 @@ async def get_avatar_title_img(
 
     avatar_temp = Image.new("RGBA", (avater_size, avater_size))
 
-    # 如果 avatar_user_id 为 None，则使用发送者自己的头像
-    original_at = ev.at
-    if avatar_user_id:
-        ev.at = avatar_user_id
-    else:
-        ev.at = None  # 清空 at，确保获取发送者自己的头像
-    try:
-        avatar = await get_event_avatar(ev, avatar_path=AVATAR_PATH)
-    finally:
-        ev.at = original_at  # 恢复原始值
+    if avatar is None:
+        avatar = await get_user_avatar(ev, avatar_user_id)
 
     avatar = avatar.resize((avater_size - 60, avater_size - 60))
 
@@ -57,7 +57,7 @@ async def refresh_name_convert(is_force: bool = False):
     role_show = await dna_api.get_default_role_for_tool(dna_user.cookie, dna_user.dev_code)
     if not role_show.is_success:
         return False, "获取角色列表信息失败"
-    role_show = DNARoleForToolRes.model_validate(role_show.data)
+    role_show = role_show.parse_data(DNARoleForToolRes)
     await rebuild_name_convert(role_show.roleInfo.roleShow, is_force=is_force)
     return True, "别名恢复成功"
 
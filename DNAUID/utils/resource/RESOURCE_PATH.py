@@ -40,6 +40,9 @@ SIGN_PATH = OTHER_PATH / "sign"
 ANN_CARD_PATH = OTHER_PATH / "ann_card"
 CALENDAR_PATH = OTHER_PATH / "calendar"
 
+# 接口录像
+CASSETTE_PATH = MAIN_PATH / "cassette"
+
 
 def init_dir():
     for i in [
@@ -1,8 +1,9 @@
 import re
 import time
 import asyncio
+import inspect
 import functools
-from typing import Optional
+from typing import Any, Dict, Tuple, Generic, TypeVar, Callable, Hashable, Optional, Sequence, Awaitable
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from collections import OrderedDict
@@ -12,6 +13,7 @@ import httpx
 from gsuid_core.models import Event
 
 TZ = ZoneInfo("Asia/Shanghai")
+T_Config = TypeVar("T_Config")
 
 
 class TimedCache:
@@ -51,50 +53,234 @@ class TimedCache:
             del self.cache[key]
 
 
-def timed_async_cache(expiration, condition=lambda x: True):
+class SingleFlight:
+    """并发请求合并
+
+    同一个 key 同时只会有一个协程真正执行，其余协程等待并共享它的结果（或异常）。
+    结果不做缓存，执行结束后 key 立即释放。
+    执行的协程被取消时，等待的协程不会跟着取消，而是重新选出一个协程执行。
+    """
+
+    # 执行的协程被取消时交给等待者的结果，表示需要重新执行
+    _CANCELLED = object()
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.shared = 0
+
+    async def do(self, key: Optional[Hashable], fn: Callable[[], Awaitable[Any]]) -> Any:
+        if key is None:
+            return await fn()
+
+        while (future := self._inflight.get(key)) is not None:
+            self.shared += 1
+            result = await asyncio.shield(future)
+            if result is not self._CANCELLED:
+                return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.leaders += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.set_result(self._CANCELLED)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 避免无人等待时出现 "exception was never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "inflight": len(self._inflight),
+            "leaders": self.leaders,
+            "shared": self.shared,
+        }
+
+
+class AsyncTTLCache:
+    """按参数分键的异步 TTL + LRU 缓存
+
+    - ttl: 正常结果的有效期（秒）
+    - negative_ttl: 不满足 condition 的结果的有效期（秒），0 表示不缓存
+    - maxsize: 最大条目数，超过后按 LRU 淘汰
+    - 同一个 key 的并发未命中只会执行一次原函数
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        maxsize: int = 128,
+        negative_ttl: float = 0,
+        condition: Callable[[Any], Any] = lambda x: True,
+    ):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.negative_ttl = negative_ttl
+        self.condition = condition
+        self._data: OrderedDict[Hashable, Tuple[Any, float]] = OrderedDict()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        if item := self._data.get(key):
+            value, expiry = item
+            if time.monotonic() < expiry:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self._data[key]
+        self.misses += 1
+        return False, None
+
+    def set(self, key: Hashable, value: Any):
+        ttl = self.ttl if self.condition(value) else self.negative_ttl
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        hit, value = self.get(key)
+        if hit:
+            return value
+
+        async def load():
+            value = await loader()
+            self.set(key, value)
+            return value
+
+        # 同一个 key 的并发未命中共享一次加载
+        return await self._flight.do(key, load)
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+def async_ttl_cache(
+    ttl: float,
+    condition: Callable[[Any], Any] = lambda x: True,
+    key_args: Optional[Sequence[str]] = None,
+    maxsize: int = 128,
+    negative_ttl: float = 0,
+):
+    """异步函数缓存装饰器
+
+    Args:
+        ttl: 缓存有效期（秒）
+        condition: 结果满足该条件时按 ttl 缓存，否则按 negative_ttl 缓存
+        key_args: 作为缓存键的参数名，None 表示除 self/cls 外的全部参数
+        maxsize: 最大缓存条目数
+        negative_ttl: 不满足 condition 的结果缓存时间（秒），0 表示不缓存
+
+    被装饰的函数会附带 cache_info() / cache_clear() / cache_invalidate(*args, **kwargs)
+    """
+
     def decorator(func):
-        cache = {}
-        locks = {}
+        cache = AsyncTTLCache(ttl, maxsize=maxsize, negative_ttl=negative_ttl, condition=condition)
+        sig = inspect.signature(func)
+        names = (
+            tuple(key_args)
+            if key_args is not None
+            else tuple(name for name in sig.parameters if name not in ("self", "cls"))
+        )
+
+        def make_key(*args, **kwargs) -> Hashable:
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = []
+            for name in names:
+                value = bound.arguments.get(name)
+                try:
+                    hash(value)
+                except TypeError:
+                    value = repr(value)
+                key.append(value)
+            return tuple(key)
 
         @functools.wraps(func)
-        async def wrapper(*args):
-            current_time = time.time()
-            # 如果是类方法，args[0]是实例，我们获取类名
-            if args and hasattr(args[0], "__class__"):
-                cache_key = f"{args[0].__class__.__name__}.{func.__name__}"
-            else:
-                cache_key = func.__name__
-
-            # 为每个缓存键创建一个锁
-            if cache_key not in locks:
-                locks[cache_key] = asyncio.Lock()
-
-            # 检查缓存，如果有效则直接返回
-            if cache_key in cache:
-                value, timestamp = cache[cache_key]
-                if current_time - timestamp < expiration:
-                    return value
-
-            # 获取锁以确保并发安全
-            async with locks[cache_key]:
-                # 双重检查，避免等待锁期间其他协程已经更新了缓存
-                if cache_key in cache:
-                    value, timestamp = cache[cache_key]
-                    if current_time - timestamp < expiration:
-                        return value
-
-                # 执行原始函数
-                value = await func(*args)
-                if condition(value):
-                    cache[cache_key] = (value, current_time)
-                return value
+        async def wrapper(*args, **kwargs):
+            return await cache.get_or_load(make_key(*args, **kwargs), lambda: func(*args, **kwargs))
+
+        def cache_invalidate(*args, **kwargs):
+            cache.delete(make_key(*args, **kwargs))
 
+        wrapper.cache = cache  # type: ignore[attr-defined]
+        wrapper.cache_info = cache.info  # type: ignore[attr-defined]
+        wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+        wrapper.cache_invalidate = cache_invalidate  # type: ignore[attr-defined]
         return wrapper
 
     return decorator
 
 
-@timed_async_cache(86400)
+class ConfigSnapshot(Generic[T_Config]):
+    """配置快照
+
+    每隔 interval 秒才重新读取一次配置，配置发生变化时才重新编译，
+    避免在热路径上反复查询配置。
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Hashable],
+        compiler: Callable[[Any], T_Config],
+        interval: float = 5,
+    ):
+        self.loader = loader
+        self.compiler = compiler
+        self.interval = interval
+        self._source: Any = None
+        self._value: Optional[T_Config] = None
+        self._checked_at = float("-inf")
+
+    def get(self) -> T_Config:
+        now = time.monotonic()
+        if now - self._checked_at >= self.interval:
+            self._checked_at = now
+            source = self.loader()
+            if self._value is None or source != self._source:
+                self._source = source
+                self._value = self.compiler(source)
+        return self._value  # type: ignore[return-value]
+
+    def invalidate(self):
+        """下次 get 时立即重新读取配置"""
+        self._checked_at = float("-inf")
+
+
+def timed_async_cache(expiration, condition=lambda x: True):
+    """兼容旧接口，按全部参数分键缓存"""
+    return async_ttl_cache(expiration, condition)
+
+
+@async_ttl_cache(86400)
 async def get_public_ip(host="127.127.127.127"):
     # 尝试从 kurobbs 获取 IP 地址
     try:
@@ -159,7 +345,7 @@ async def get_using_id(ev: Event) -> str:
         str: 要查询的用户ID（如果返回ev.user_id表示被阻止或查询自己）
     """
     from ..dna_config.dna_config import DNAConfig
-    from ..utils.database.models import DNAPrivacy, DNAGroupPrivacy
+    from ..utils.database.privacy_cache import privacy_resolver
 
     # 没有 @ 目标
     if not ev.at:
@@ -174,20 +360,9 @@ async def get_using_id(ev: Event) -> str:
     if not allow_config or not allow_config.data:
         return ev.user_id
 
-    # 检查群是否有强制隐私设置（优先级最高）
-    if ev.group_id:
-        group_privacy = await DNAGroupPrivacy.check_group_force_privacy(ev.group_id, ev.bot_id)
-        if group_privacy is not None:
-            # 群有强制设置
-            if not group_privacy:
-                # 强制全体防偷窥，不允许查询他人
-                return ev.user_id
-            # 强制全体开偷窥，允许查询
-            return ev.at
-
-    # 检查被@用户的隐私设置
-    privacy = await DNAPrivacy.get_privacy_setting(ev.at, ev.bot_id)
-    if privacy and not privacy.allow_peek:
+    # 群强制隐私设置优先于被@用户的个人设置
+    privacy = await privacy_resolver.resolve(ev.at, ev.bot_id, ev.group_id)
+    if not privacy.allow_peek:
         return ev.user_id
     return ev.at
 
@@ -207,16 +382,10 @@ async def is_uid_hidden(user_id: str, bot_id: str, group_id: Optional[str] = Non
     Returns:
         bool: True 表示 UID 应该被隐藏，False 表示可以显示
     """
-    from ..utils.database.models import DNAPrivacy, DNAGroupPrivacy
-
-    # 优先检查群级强制设置
-    if group_id:
-        group_force_hidden = await DNAGroupPrivacy.check_uid_hidden(group_id, bot_id)
-        if group_force_hidden is not None:
-            return group_force_hidden
+    from ..utils.database.privacy_cache import privacy_resolver
 
-    # 检查用户个人设置
-    return await DNAPrivacy.is_uid_hidden(user_id, bot_id)
+    privacy = await privacy_resolver.resolve(user_id, bot_id, group_id)
+    return privacy.uid_hidden
 
 
 # 预编译UID脱敏正则表达式
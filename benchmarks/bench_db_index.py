@@ -0,0 +1,175 @@
+"""数据库热点查询索引基准
+
+用标准库 sqlite3 建立与 DNAUID 数据表结构一致的临时库（默认 5 万用户），
+分别在无索引 + 全量取行（旧查询）与建索引 + LIMIT 1（新查询）下测量单次查询延迟。
+
+用法:
+    python benchmarks/bench_db_index.py --users 50000 --repeat 500
+    python benchmarks/bench_db_index.py --db /tmp/dna.db  # 保留数据库文件
+"""
+
+import random
+import sqlite3
+import argparse
+import tempfile
+import statistics
+from time import perf_counter
+from typing import Dict, List, Tuple, Callable, Optional
+from pathlib import Path
+
+SCHEMA = [
+    """CREATE TABLE DNAUser (
+        id INTEGER PRIMARY KEY, bot_id TEXT, user_id TEXT, status TEXT, cookie TEXT,
+        uid TEXT, dev_code TEXT, d_num TEXT DEFAULT '', refresh_token TEXT DEFAULT ''
+    )""",
+    """CREATE TABLE DNASign (
+        id INTEGER PRIMARY KEY, uid TEXT, game_sign INTEGER DEFAULT 0, bbs_sign INTEGER DEFAULT 0,
+        bbs_detail INTEGER DEFAULT 0, bbs_like INTEGER DEFAULT 0, bbs_share INTEGER DEFAULT 0,
+        bbs_reply INTEGER DEFAULT 0, date TEXT
+    )""",
+    """CREATE TABLE dnaprivacy (
+        id INTEGER PRIMARY KEY, user_id TEXT, bot_id TEXT, group_id TEXT,
+        allow_peek BOOLEAN DEFAULT 1, uid_hidden BOOLEAN DEFAULT 0
+    )""",
+]
+
+# 与 DNAUID/utils/database/models.py 中 exec_list 的索引保持一致
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_dnauser_uid_user_bot ON DNAUser (uid, user_id, bot_id)",
+    "CREATE INDEX IF NOT EXISTS ix_dnauser_cookie ON DNAUser (cookie)",
+    "CREATE INDEX IF NOT EXISTS ix_dnauser_uid_cookie ON DNAUser (uid, cookie)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_dnasign_uid_date ON DNASign (uid, date)",
+    "CREATE INDEX IF NOT EXISTS ix_dnaprivacy_user_bot ON dnaprivacy (user_id, bot_id)",
+]
+
+SIGN_DAYS = ["2026-10-15", "2026-10-16", "2026-10-17"]
+
+# name -> (sql, 取参数的下标)
+QUERIES: Dict[str, Tuple[str, Callable[[Tuple], Tuple]]] = {
+    "select_dna_user": (
+        "SELECT * FROM DNAUser WHERE user_id = ? AND uid = ? AND bot_id = ?",
+        lambda u: (u[2], u[5], u[1]),
+    ),
+    "select_data_by_cookie": (
+        "SELECT * FROM DNAUser WHERE cookie = ?",
+        lambda u: (u[4],),
+    ),
+    "mark_cookie_invalid": (
+        "SELECT id FROM DNAUser WHERE uid = ? AND cookie = ?",
+        lambda u: (u[5], u[4]),
+    ),
+    "_find_sign_record": (
+        "SELECT * FROM DNASign WHERE uid = ? AND date = ?",
+        lambda u: (u[5], SIGN_DAYS[-1]),
+    ),
+    "get_privacy_setting": (
+        "SELECT * FROM dnaprivacy WHERE user_id = ? AND bot_id = ?",
+        lambda u: (u[2], u[1]),
+    ),
+}
+
+
+def populate(conn: sqlite3.Connection, users: int) -> List[Tuple]:
+    rows = [
+        (
+            i + 1,
+            "onebot",
+            str(100000000 + i),
+            "",
+            f"eyJhbGciOiJIUzI1NiJ9.{i:012d}.{random.getrandbits(128):032x}",
+            str(300000000 + i),
+            f"DEV-{i:08d}",
+            "",
+            "",
+        )
+        for i in range(users)
+    ]
+    conn.executemany("INSERT INTO DNAUser VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.executemany(
+        "INSERT INTO DNASign (uid, game_sign, bbs_sign, date) VALUES (?, 1, 1, ?)",
+        ((row[5], day) for day in SIGN_DAYS for row in rows),
+    )
+    conn.executemany(
+        "INSERT INTO dnaprivacy (user_id, bot_id) VALUES (?, ?)",
+        ((row[2], row[1]) for row in rows[::10]),
+    )
+    conn.commit()
+    return rows
+
+
+def measure(conn: sqlite3.Connection, sql: str, params: List[Tuple], limit: bool) -> List[float]:
+    if limit:
+        sql = f"{sql} LIMIT 1"
+    samples = []
+    for param in params:
+        start = perf_counter()
+        cursor = conn.execute(sql, param)
+        cursor.fetchone() if limit else cursor.fetchall()
+        samples.append(perf_counter() - start)
+    return samples
+
+
+def run_all(conn: sqlite3.Connection, sample_users: List[Tuple], limit: bool) -> Dict[str, List[float]]:
+    return {
+        name: measure(conn, sql, [get_params(u) for u in sample_users], limit)
+        for name, (sql, get_params) in QUERIES.items()
+    }
+
+
+def query_plan(conn: sqlite3.Connection, sql: str) -> str:
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", [None] * sql.count("?")).fetchall()
+    return "; ".join(row[-1] for row in rows)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="数据库热点查询索引基准")
+    parser.add_argument("--users", type=int, default=50000, help="用户数量")
+    parser.add_argument("--repeat", type=int, default=500, help="每个查询的采样次数")
+    parser.add_argument("--db", default="", help="数据库文件路径，为空时使用临时文件")
+    args = parser.parse_args(argv)
+
+    tmpdir = None
+    if args.db:
+        db_path = Path(args.db)
+        db_path.unlink(missing_ok=True)
+    else:
+        tmpdir = tempfile.TemporaryDirectory()
+        db_path = Path(tmpdir.name) / "dna_bench.db"
+
+    conn = sqlite3.connect(db_path)
+    for sql in SCHEMA:
+        conn.execute(sql)
+
+    start = perf_counter()
+    rows = populate(conn, args.users)
+    print(f"populated {args.users} users in {perf_counter() - start:.2f}s ({db_path})")
+
+    sample_users = random.choices(rows, k=args.repeat)
+    before = run_all(conn, sample_users, limit=False)
+
+    start = perf_counter()
+    for sql in INDEXES:
+        conn.execute(sql)
+    conn.execute("ANALYZE")
+    print(f"created {len(INDEXES)} indexes in {perf_counter() - start:.2f}s")
+
+    after = run_all(conn, sample_users, limit=True)
+
+    print(f"{'query':<24}{'before p50':>12}{'after p50':>12}{'before p99':>12}{'after p99':>12}{'speedup':>10}")
+    for name in QUERIES:
+        b, a = sorted(before[name]), sorted(after[name])
+        b50, a50 = statistics.median(b) * 1000, statistics.median(a) * 1000
+        b99, a99 = b[int(len(b) * 0.99)] * 1000, a[int(len(a) * 0.99)] * 1000
+        print(f"{name:<24}{b50:>10.3f}ms{a50:>10.3f}ms{b99:>10.3f}ms{a99:>10.3f}ms{b50 / a50:>9.0f}x")
+
+    print()
+    for name, (sql, _) in QUERIES.items():
+        print(f"{name:<24}{query_plan(conn, sql)}")
+
+    conn.close()
+    if tmpdir:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""签名微基准
+
+统计每次签名请求的耗时：generate_headers_120 / generate_headers_122 / xor_encode / sign_shuffled / rsa_encrypt，
+并对比 RSA cipher 缓存命中与每次重新解析公钥的差异。
+
+用法:
+    python benchmarks/bench_sign.py --number 2000
+
+只加载 DNAUID/utils/api 下的签名模块，不需要启动 gsuid_core，需要安装 pycryptodome。
+"""
+
+import sys
+import time
+import types
+import argparse
+import importlib
+import statistics
+from typing import Any, Dict, List, Callable, Optional
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent.parent / "DNAUID" / "utils" / "api"
+PACKAGE = "_dna_sign_bench"
+
+RSA_PUBLIC_KEY = (
+    "MIGfMA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQDGpdbezK+eknQZQzPOjp8mr/dP+"
+    "QHwk8CRkQh6C6qFnfLH3tiyl0pnt3dePuFDnM1PUXGhCkQ157ePJCQgkDU2+mimDmXh0oLFn9zuWSp+"
+    "U8uLSLX3t3PpJ8TmNCROfUDWvzdbnShqg7JfDmnrOJz49qd234W84nrfTHbzdqeigQIDAQAB"
+)
+
+HEADERS = {
+    "token": "eyJhbGciOiJIUzI1NiJ9." + "x" * 120 + ".signature",
+    "devCode": "0F8C2A1E-4B7D-4E3A-9C5F-2D6B8A1E3C7F",
+    "version": "1.2.0",
+}
+PAYLOAD = {"gameId": 268, "postId": "1234567", "forumId": 47, "postType": 1, "likeType": 1, "operateType": 1}
+
+
+def load_sign_modules():
+    """把 utils/api 挂到一个独立包名下，只导入签名相关模块"""
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [str(API_DIR)]  # type: ignore[attr-defined]
+    sys.modules[PACKAGE] = package
+    return (
+        importlib.import_module(f"{PACKAGE}.sign_utils"),
+        importlib.import_module(f"{PACKAGE}.sign_120"),
+        importlib.import_module(f"{PACKAGE}.sign_122"),
+    )
+
+
+def bench(name: str, func: Callable[[], Any], number: int, setup: Optional[Callable[[], None]] = None) -> Dict:
+    samples: List[float] = []
+    for _ in range(number):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "name": name,
+        "mean": statistics.fmean(samples) * 1e6,
+        "p50": samples[len(samples) // 2] * 1e6,
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="签名微基准")
+    parser.add_argument("--number", type=int, default=2000, help="每项运行次数")
+    args = parser.parse_args(argv)
+
+    sign_utils, sign_120, sign_122 = load_sign_modules()
+    cache = sign_utils.rsa_cipher_cache
+    rk = sign_utils.rand_str(16)
+    shuffled = sign_utils.sign_shuffled({**PAYLOAD, "token": HEADERS["token"], "sa": rk * 2}, rk)
+    headers_122 = {**HEADERS, "version": "1.2.2"}
+
+    cache.get(RSA_PUBLIC_KEY)
+    results = [
+        bench("sign_shuffled", lambda: sign_utils.sign_shuffled({**PAYLOAD, "sa": rk}, rk), args.number),
+        bench("xor_encode", lambda: sign_utils.xor_encode(shuffled, rk), args.number),
+        bench("rsa_encrypt (cached)", lambda: sign_utils.rsa_encrypt(rk, RSA_PUBLIC_KEY), args.number),
+        bench(
+            "rsa_encrypt (cold)",
+            lambda: sign_utils.rsa_encrypt(rk, RSA_PUBLIC_KEY),
+            args.number,
+            setup=cache.clear,
+        ),
+        bench(
+            "generate_headers_120",
+            lambda: sign_120.generate_headers_120(dict(HEADERS), PAYLOAD, RSA_PUBLIC_KEY),
+            args.number,
+        ),
+        bench(
+            "generate_headers_122",
+            lambda: sign_122.generate_headers_122(dict(headers_122), PAYLOAD, RSA_PUBLIC_KEY),
+            args.number,
+        ),
+    ]
+
+    print(f"{'benchmark':<24}{'mean(us)':>12}{'p50(us)':>12}{'p99(us)':>12}")
+    for r in results:
+        print(f"{r['name']:<24}{r['mean']:>12.1f}{r['p50']:>12.1f}{r['p99']:>12.1f}")
+    print(f"RSA cipher builds: {cache.builds}")
+
+
+if __name__ == "__main__":
+    main()
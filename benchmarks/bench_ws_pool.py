@@ -0,0 +1,117 @@
+"""WebSocket 连接池基准
+
+在本进程内启动 fake_ws_server，用 WebSocketManager 轮流获取数千个 token 的连接，统计：
+获取延迟（p50/p99）、握手速率、线程数、asyncio 任务数、内存占用与连接池变动。
+
+用法（在 gsuid_core 环境中运行，需要能导入 gsuid_core）:
+    python benchmarks/bench_ws_pool.py --tokens 5000 --concurrency 50 --pool-size 200 --handshake-delay 30
+
+--rounds 大于 1 时会重复遍历全部 token，用于观察命中与淘汰。
+"""
+
+import sys
+import json
+import time
+import base64
+import asyncio
+import argparse
+import resource
+import threading
+import statistics
+import tracemalloc
+from typing import List, Tuple, Optional
+from pathlib import Path
+
+from aiohttp import web
+from fake_ws_server import WS_PATH, FakeWSServer, WSFaultConfig
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from DNAUID.utils.api.ws_manager import WebSocketManager  # noqa: E402
+
+
+def make_token(user_id: int) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"userId": str(user_id)}).encode()).decode().rstrip("=")
+    return f"eyJhbGciOiJIUzI1NiJ9.{payload}.bench"
+
+
+def percentile(samples: List[float], p: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * p))] if samples else 0
+
+
+async def run(args: argparse.Namespace):
+    fault = WSFaultConfig(
+        handshake_delay=args.handshake_delay,
+        handshake_jitter=args.handshake_jitter,
+        drop_rate=args.drop_rate,
+    )
+    server = FakeWSServer(fault)
+    runner = web.AppRunner(server.make_app())
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+
+    manager = WebSocketManager(ws_url=f"ws://127.0.0.1:{args.port}{WS_PATH}")
+    manager.max_pool_size = args.pool_size
+    accounts: List[Tuple[str, str]] = [(make_token(i), f"DEV-{i:08d}") for i in range(args.tokens)]
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    failures = 0
+    peak_threads = threading.active_count()
+    peak_tasks = 0
+
+    async def acquire(token: str, dev_code: str):
+        nonlocal failures, peak_threads, peak_tasks
+        async with semaphore:
+            start = time.perf_counter()
+            ws = await manager.get_connection_async(token, dev_code, timeout=args.timeout)
+            latencies.append(time.perf_counter() - start)
+            if ws is None:
+                failures += 1
+            peak_threads = max(peak_threads, threading.active_count())
+            peak_tasks = max(peak_tasks, len(asyncio.all_tasks()))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        await asyncio.gather(*(acquire(*account) for account in accounts))
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    info = manager.info()
+    print(f"tokens={args.tokens} rounds={args.rounds} concurrency={args.concurrency} pool={args.pool_size}")
+    print(f"elapsed            {elapsed:.2f}s, failures {failures}")
+    print(
+        f"acquire latency    mean {statistics.fmean(latencies) * 1000:.2f}ms"
+        f"  p50 {percentile(latencies, 0.5) * 1000:.2f}ms  p99 {percentile(latencies, 0.99) * 1000:.2f}ms"
+    )
+    print(f"handshake rate     {server.stats['handshakes'] / elapsed:.1f}/s ({server.stats['handshakes']} total)")
+    print(f"threads            {threading.active_count()} (peak {peak_threads})")
+    print(f"asyncio tasks      {len(asyncio.all_tasks())} (peak {peak_tasks})")
+    print(f"traced memory      {current / 1024 / 1024:.1f}MiB (peak {peak / 1024 / 1024:.1f}MiB)")
+    print(f"max RSS            {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f}MiB")
+    print(f"pool               {info}")
+    print(f"server             {server.stats}")
+
+    await manager.close()
+    await runner.cleanup()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="WebSocket 连接池基准")
+    parser.add_argument("--port", type=int, default=18849)
+    parser.add_argument("--tokens", type=int, default=5000, help="token 数量")
+    parser.add_argument("--rounds", type=int, default=1, help="遍历轮数")
+    parser.add_argument("--concurrency", type=int, default=50, help="并发获取数")
+    parser.add_argument("--pool-size", type=int, default=200, help="连接池上限")
+    parser.add_argument("--timeout", type=float, default=5, help="等待连接建立超时(秒)")
+    parser.add_argument("--handshake-delay", type=float, default=0, help="服务端握手延迟(毫秒)")
+    parser.add_argument("--handshake-jitter", type=float, default=0, help="服务端握手延迟抖动(毫秒)")
+    parser.add_argument("--drop-rate", type=float, default=0, help="服务端握手后立即断开的概率")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
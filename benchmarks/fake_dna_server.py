@@ -0,0 +1,560 @@
+"""二重螺旋 API 本地模拟服务
+
+实现 DNAUID/utils/api/api.py 中用到的接口，返回与 utils/api/model.py 一致的数据结构，
+可配置延迟、错误率和限流，用于在没有真实 dnabbs-api.yingxiong.com 的情况下压测。
+
+用法:
+    python benchmarks/fake_dna_server.py --port 8848 --latency 50 --jitter 20 --error-rate 0.01
+
+然后将 DNAUID 配置中的 `DNAUrlProxyUrl` 设置为 `http://127.0.0.1:8848` 并重启。
+WebSocket 服务（fake_ws_server）同时挂载在 `/ws-community-websocket`。
+"""
+
+import json
+import time
+import base64
+import random
+import asyncio
+import argparse
+from typing import Any, Dict, List, Optional
+from dataclasses import field, dataclass
+
+from aiohttp import web
+from fake_ws_server import FakeWSServer, WSFaultConfig
+
+DNA_GAME_ID = 268
+
+# 与 DNAApi.get_rsa_public_key 的兜底公钥一致
+RSA_PUBLIC_KEY = (
+    "MIGfMA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQDGpdbezK+eknQZQzPOjp8mr/dP+"
+    "QHwk8CRkQh6C6qFnfLH3tiyl0pnt3dePuFDnM1PUXGhCkQ157ePJCQgkDU2+mimDmXh0oLFn9zuWSp+"
+    "U8uLSLX3t3PpJ8TmNCROfUDWvzdbnShqg7JfDmnrOJz49qd234W84nrfTHbzdqeigQIDAQAB"
+)
+
+BBS_TASKS = [
+    ("社区签到", 1),
+    ("浏览帖子", 3),
+    ("点赞帖子", 5),
+    ("分享帖子", 1),
+    ("回复帖子", 5),
+]
+
+
+@dataclass
+class FaultConfig:
+    latency: float = 0.0  # 毫秒
+    jitter: float = 0.0  # 毫秒
+    error_rate: float = 0.0  # 返回 HTTP 500 的概率
+    business_error_rate: float = 0.0  # 返回 10100 业务异常的概率
+    rate_limit: float = 0.0  # 每个 token 每秒请求数，超出返回 429，0 为不限制
+    roles: int = 30  # roleForTool 返回的角色数量
+    weapons: int = 40  # roleForTool 返回的武器数量
+    posts: int = 20  # 帖子列表数量
+
+
+@dataclass
+class AccountState:
+    user_id: str
+    game_signed: bool = False
+    bbs_signed: bool = False
+    task_times: Dict[str, int] = field(default_factory=dict)
+    window_start: float = 0.0
+    window_count: int = 0
+
+
+def make_token(user_id: str) -> str:
+    def b64(data: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+    return f"{b64({'alg': 'HS256'})}.{b64({'userId': user_id, 'ts': time.time()})}.fake"
+
+
+def make_d_num(valid_seconds: int = 86400 * 30) -> str:
+    """生成 check_decrypt_dnum 可识别的 dNum（第 6-12 与 21-28 位拼出毫秒时间戳）"""
+    ts = str(int((time.time() + valid_seconds) * 1000))
+    raw = "x" * 6 + ts[:6] + "x" * 9 + ts[6:] + "x" * 4
+    return base64.b64encode(raw.encode()).decode()
+
+
+def ok(data: Any = None, code: int = 200) -> web.Response:
+    return web.json_response({"code": code, "msg": "请求成功", "success": True, "data": data})
+
+
+def fail(msg: str, code: int) -> web.Response:
+    return web.json_response({"code": code, "msg": msg, "success": False, "data": None})
+
+
+class FakeDNAServer:
+    def __init__(self, fault: FaultConfig):
+        self.fault = fault
+        self.accounts: Dict[str, AccountState] = {}
+        self.requests = 0
+        self.ws = FakeWSServer(WSFaultConfig(require_headers=False))
+
+    # ---------- 通用 ----------
+
+    def account(self, request: web.Request) -> Optional[AccountState]:
+        token = request.headers.get("token", "")
+        if not token:
+            return None
+        if token not in self.accounts:
+            self.accounts[token] = AccountState(user_id=str(abs(hash(token)) % 10**12))
+        return self.accounts[token]
+
+    @web.middleware
+    async def fault_middleware(self, request: web.Request, handler):
+        self.requests += 1
+        fault = self.fault
+        if fault.latency or fault.jitter:
+            delay = max(0.0, fault.latency + random.uniform(-fault.jitter, fault.jitter))
+            await asyncio.sleep(delay / 1000)
+
+        if request.path.startswith("/ws-") or request.path.startswith("/_"):
+            return await handler(request)
+
+        if fault.rate_limit > 0 and (account := self.account(request)):
+            now = time.monotonic()
+            if now - account.window_start >= 1:
+                account.window_start, account.window_count = now, 0
+            account.window_count += 1
+            if account.window_count > fault.rate_limit:
+                return web.Response(status=429, text="Too Many Requests")
+
+        if random.random() < fault.error_rate:
+            return web.Response(status=500, text="Internal Server Error")
+        if random.random() < fault.business_error_rate:
+            return fail("业务异常", 10100)
+        return await handler(request)
+
+    # ---------- 用户 ----------
+
+    async def get_rsa_public_key(self, request: web.Request):
+        return ok({"key": RSA_PUBLIC_KEY})
+
+    async def get_sms_code(self, request: web.Request):
+        return ok(None)
+
+    async def sdk_login(self, request: web.Request):
+        form = await request.post()
+        user_id = str(abs(hash(str(form.get("mobile", "")))) % 10**12)
+        token = make_token(user_id)
+        self.accounts[token] = AccountState(user_id=user_id)
+        return ok(
+            {
+                "userId": user_id,
+                "token": token,
+                "refreshToken": make_token(user_id),
+                "dNum": make_d_num(),
+                "userName": f"user{user_id[-4:]}",
+                "headUrl": "",
+                "isComplete": 1,
+                "isRegister": 1,
+                "userGameList": [{"gameId": DNA_GAME_ID, "gameName": "二重螺旋"}],
+            }
+        )
+
+    async def login_log(self, request: web.Request):
+        if not request.headers.get("token"):
+            return fail("登录已过期", 220)
+        return ok(None)
+
+    async def refresh_token(self, request: web.Request):
+        account = self.account(request)
+        user_id = account.user_id if account else "0"
+        token = make_token(user_id)
+        if account:
+            self.accounts[token] = account
+        return ok({"token": token, "dNum": make_d_num()})
+
+    async def role_list(self, request: web.Request):
+        account = self.account(request)
+        uid = (account.user_id if account else "0").rjust(13, "1")[:13]
+        return ok(
+            {
+                "roles": [
+                    {
+                        "gameName": "二重螺旋",
+                        "gameId": DNA_GAME_ID,
+                        "showVoList": [
+                            {
+                                "roleId": uid,
+                                "headUrl": "",
+                                "level": 60,
+                                "roleName": f"角色{uid[-4:]}",
+                                "isDefault": 1,
+                                "roleRegisterTime": "2025-10-28",
+                                "boundType": 1,
+                                "roleBoundId": uid,
+                            }
+                        ],
+                    }
+                ]
+            }
+        )
+
+    # ---------- 角色 ----------
+
+    def _weapons(self, start: int, count: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                "elementIcon": "",
+                "icon": "",
+                "level": 80,
+                "name": f"武器{i}",
+                "unLocked": i % 3 != 0,
+                "weaponEid": f"we{i}",
+                "weaponId": 10000 + i,
+                "skillLevel": i % 5,
+            }
+            for i in range(start, start + count)
+        ]
+
+    async def role_for_tool(self, request: web.Request):
+        account = self.account(request)
+        uid = (account.user_id if account else "0").rjust(13, "1")[:13]
+        fault = self.fault
+        return ok(
+            {
+                "roleInfo": {
+                    "roleShow": {
+                        "roleChars": [
+                            {
+                                "charEid": f"ce{i}",
+                                "charId": 1000 + i,
+                                "elementIcon": "",
+                                "gradeLevel": i % 7,
+                                "icon": "",
+                                "level": 80,
+                                "name": f"角色{i}",
+                                "unLocked": i % 4 != 0,
+                            }
+                            for i in range(fault.roles)
+                        ],
+                        "langRangeWeapons": self._weapons(0, fault.weapons // 2),
+                        "closeWeapons": self._weapons(fault.weapons // 2, fault.weapons - fault.weapons // 2),
+                        "level": 60,
+                        "params": [
+                            {"paramKey": "总活跃天数", "paramValue": "120"},
+                            {"paramKey": "游戏时长", "paramValue": "300h"},
+                            {"paramKey": "获得角色数", "paramValue": str(fault.roles)},
+                        ],
+                        "roleId": uid,
+                        "roleName": f"角色{uid[-4:]}",
+                        "roleAchv": {"total": 100},
+                    }
+                },
+                "instanceInfo": [
+                    {"instances": [{"id": 1, "name": "密函·角色"}]},
+                    {"instances": [{"id": 2, "name": "密函·武器"}]},
+                    {"instances": [{"id": 3, "name": "密函·魔之楔"}]},
+                ],
+            }
+        )
+
+    async def char_detail(self, request: web.Request):
+        form = await request.post()
+        char_id = int(str(form.get("charId", "1000")))
+        return ok(
+            {
+                "charDetail": {
+                    "attribute": {
+                        "skillRange": "100%",
+                        "strongValue": "0%",
+                        "skillIntensity": "150%",
+                        "weaponTags": ["长柄"],
+                        "def": 300,
+                        "enmityValue": "0%",
+                        "skillEfficiency": "100%",
+                        "skillSustain": "100%",
+                        "maxHp": 5000,
+                        "atk": 800,
+                        "maxES": 2000,
+                        "maxSp": 150,
+                    },
+                    "skills": [{"skillId": i, "icon": "", "level": 10, "skillName": f"技能{i}"} for i in range(1, 4)],
+                    "paint": "",
+                    "charName": f"角色{char_id - 1000}",
+                    "elementIcon": "",
+                    "traces": [{"icon": "", "description": f"溯源{i}"} for i in range(6)],
+                    "currentVolume": 100,
+                    "sumVolume": 120,
+                    "level": 80,
+                    "icon": "",
+                    "gradeLevel": 2,
+                    "elementName": "光",
+                    "modes": [{"id": i, "icon": "", "quality": 5, "name": f"魔之楔{i}", "level": 5} for i in range(8)],
+                    "conWeaponEid": "we1",
+                    "conWeaponId": 10001,
+                }
+            }
+        )
+
+    async def weapon_detail(self, request: web.Request):
+        form = await request.post()
+        weapon_id = int(str(form.get("weaponId", "10001")))
+        return ok(
+            {
+                "weaponDetail": {
+                    "attribute": {"atk": 500, "crd": 0.2, "cri": 1.5, "speed": 1.0, "trigger": 0.3},
+                    "currentVolume": 80,
+                    "elementIcon": "",
+                    "elementName": "光",
+                    "icon": "",
+                    "id": weapon_id,
+                    "level": 80,
+                    "modes": [{"id": i, "icon": "", "quality": 5, "name": f"魔之楔{i}", "level": 5} for i in range(8)],
+                    "name": f"武器{weapon_id - 10000}",
+                    "skillLevel": 3,
+                    "sumVolume": 100,
+                }
+            }
+        )
+
+    async def short_note(self, request: web.Request):
+        now = int(time.time())
+        return ok(
+            {
+                "rougeLikeRewardCount": 2,
+                "rougeLikeRewardTotal": 5,
+                "currentTaskProgress": 60,
+                "maxDailyTaskProgress": 100,
+                "hardBossRewardCount": 1,
+                "hardBossRewardTotal": 3,
+                "dungeonReward": 4,
+                "dungeonRewardTotal": 10,
+                "draftInfo": {
+                    "draftDoingNum": 1,
+                    "draftMaxNum": 3,
+                    "draftDoingInfo": [
+                        {
+                            "draftCompleteNum": 0,
+                            "draftDoingNum": 1,
+                            "endTime": str(now + 3600),
+                            "productId": 1,
+                            "productName": "锻造物",
+                            "startTime": str(now - 3600),
+                        }
+                    ],
+                },
+            }
+        )
+
+    # ---------- 签到 ----------
+
+    async def sign_calendar(self, request: web.Request):
+        account = self.account(request)
+        signed = bool(account and account.game_signed)
+        now = int(time.time() * 1000)
+        return ok(
+            {
+                "todaySignin": signed,
+                "userGoldNum": 100,
+                "signinTime": 3 if signed else 2,
+                "dayAward": [
+                    {
+                        "gameId": DNA_GAME_ID,
+                        "periodId": 1,
+                        "iconUrl": "",
+                        "id": i,
+                        "dayInPeriod": i + 1,
+                        "updateTime": now,
+                        "awardNum": 10,
+                        "thirdProductId": str(i),
+                        "createTime": now,
+                        "awardName": f"奖励{i}",
+                    }
+                    for i in range(28)
+                ],
+                "period": {
+                    "gameId": DNA_GAME_ID,
+                    "retryCos": 0,
+                    "endDate": now + 86400000 * 20,
+                    "id": 1,
+                    "startDate": now - 86400000 * 8,
+                    "retryTimes": 0,
+                    "overDays": 20,
+                    "createTime": now,
+                    "name": "签到周期",
+                },
+                "roleInfo": {"headUrl": "", "roleId": "1", "roleName": "角色", "level": 60, "roleBoundId": "1"},
+            }
+        )
+
+    async def game_sign(self, request: web.Request):
+        account = self.account(request)
+        if account and account.game_signed:
+            return fail("今日已签到", 711)
+        if account:
+            account.game_signed = True
+        return ok({"signin": True})
+
+    async def bbs_sign(self, request: web.Request):
+        account = self.account(request)
+        if account and account.bbs_signed:
+            return fail("今日已签到", 10000)
+        if account:
+            account.bbs_signed = True
+            account.task_times["社区签到"] = 1
+        return ok({"signin": True})
+
+    async def have_sign_in(self, request: web.Request):
+        return ok({"totalSignInDay": 10})
+
+    async def task_process(self, request: web.Request):
+        account = self.account(request)
+        times = account.task_times if account else {}
+        return ok(
+            {
+                "dailyTask": [
+                    {
+                        "remark": remark,
+                        "completeTimes": min(times.get(remark, 0), total),
+                        "times": total,
+                        "skipType": 0,
+                        "gainExp": 10,
+                        "process": min(times.get(remark, 0), total) / total,
+                        "gainGold": 10,
+                    }
+                    for remark, total in BBS_TASKS
+                ]
+            }
+        )
+
+    def _bump(self, request: web.Request, remark: str):
+        if account := self.account(request):
+            account.task_times[remark] = account.task_times.get(remark, 0) + 1
+
+    # ---------- 社区 ----------
+
+    async def post_list(self, request: web.Request):
+        return ok(
+            {
+                "postList": [
+                    {
+                        "postId": str(100000 + i),
+                        "gameForumId": 47,
+                        "postType": 1,
+                        "userId": str(200000 + i),
+                        "postTitle": f"帖子{i}",
+                    }
+                    for i in range(self.fault.posts)
+                ]
+            }
+        )
+
+    async def post_detail(self, request: web.Request):
+        self._bump(request, "浏览帖子")
+        form = await request.post()
+        return ok({"postDetail": {"postId": form.get("postId"), "postContent": [{"content": "内容" * 200}]}})
+
+    async def like(self, request: web.Request):
+        self._bump(request, "点赞帖子")
+        return ok({"like": True})
+
+    async def share(self, request: web.Request):
+        self._bump(request, "分享帖子")
+        return ok(None)
+
+    async def reply(self, request: web.Request):
+        self._bump(request, "回复帖子")
+        return ok({"commentId": str(random.randint(1, 10**9))})
+
+    async def ann_list(self, request: web.Request):
+        return ok(
+            {
+                "postList": [
+                    {"postId": str(300000 + i), "postTitle": f"公告{i}", "showTime": int(time.time() * 1000)}
+                    for i in range(10)
+                ]
+            }
+        )
+
+    async def wiki_calendar(self, request: web.Request):
+        return ok({"vos": []})
+
+    async def activity_list(self, request: web.Request):
+        return ok([])
+
+    # ---------- 控制 ----------
+
+    async def stats(self, request: web.Request):
+        return web.json_response(
+            {
+                "requests": self.requests,
+                "accounts": len(self.accounts),
+                "ws": self.ws.stats,
+            }
+        )
+
+    async def reset(self, request: web.Request):
+        self.accounts.clear()
+        self.requests = 0
+        return web.json_response({"ok": True})
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self.fault_middleware])
+        routes = {
+            "/config/getRsaPublicKey": self.get_rsa_public_key,
+            "/user/getSmsCode": self.get_sms_code,
+            "/user/sdkLogin": self.sdk_login,
+            "/user/login/log": self.login_log,
+            "/user/refreshToken": self.refresh_token,
+            "/role/list": self.role_list,
+            "/role/defaultRoleForTool": self.role_for_tool,
+            "/role/getCharDetail": self.char_detail,
+            "/role/getWeaponDetail": self.weapon_detail,
+            "/role/getShortNoteInfo": self.short_note,
+            "/encourage/signin/show": self.sign_calendar,
+            "/encourage/signin/signin": self.game_sign,
+            "/user/signIn": self.bbs_sign,
+            "/user/haveSignInNew": self.have_sign_in,
+            "/encourage/level/getTaskProcess": self.task_process,
+            "/forum/list": self.post_list,
+            "/forum/getPostDetail": self.post_detail,
+            "/forum/like": self.like,
+            "/encourage/level/shareTask": self.share,
+            "/forum/comment/createComment": self.reply,
+            "/user/mine": self.ann_list,
+            "/forum/wiki/home/page/list": self.wiki_calendar,
+            "/encourage/calendar/Activity/list": self.activity_list,
+        }
+        for path, handler in routes.items():
+            app.router.add_post(path, handler)
+        self.ws.add_routes(app)
+        app.router.add_get("/_stats", self.stats)
+        app.router.add_post("/_reset", self.reset)
+        return app
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="二重螺旋 API 本地模拟服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8848)
+    parser.add_argument("--latency", type=float, default=0, help="固定延迟(毫秒)")
+    parser.add_argument("--jitter", type=float, default=0, help="延迟抖动(毫秒)")
+    parser.add_argument("--error-rate", type=float, default=0, help="HTTP 500 概率")
+    parser.add_argument("--business-error-rate", type=float, default=0, help="10100 业务异常概率")
+    parser.add_argument("--rate-limit", type=float, default=0, help="每个 token 每秒请求数上限，0 为不限制")
+    parser.add_argument("--roles", type=int, default=30, help="角色数量")
+    parser.add_argument("--weapons", type=int, default=40, help="武器数量")
+    parser.add_argument("--posts", type=int, default=20, help="帖子数量")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    fault = FaultConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        business_error_rate=args.business_error_rate,
+        rate_limit=args.rate_limit,
+        roles=args.roles,
+        weapons=args.weapons,
+        posts=args.posts,
+    )
+    web.run_app(FakeDNAServer(fault).make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
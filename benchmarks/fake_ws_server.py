@@ -0,0 +1,140 @@
+"""皎皎角社区 WebSocket 本地模拟服务
+
+模拟 wss://dnabbs-api.yingxiong.com:8180/ws-community-websocket：
+校验 token/devCode 请求头，回复 ping 事件，可配置握手延迟、随机断开与定时断开。
+
+用法:
+    python benchmarks/fake_ws_server.py --port 8849 --handshake-delay 50 --drop-rate 0.01
+
+然后将 DNAUID 配置中的 `DNAWsUrl` 设置为 `ws://127.0.0.1:8849/ws-community-websocket` 并重启，
+或在代码中使用 `WebSocketManager(ws_url=...)`。
+"""
+
+import json
+import random
+import asyncio
+import argparse
+from typing import Dict, List, Optional
+from dataclasses import dataclass
+
+from aiohttp import WSMsgType, web
+
+WS_PATH = "/ws-community-websocket"
+
+
+@dataclass
+class WSFaultConfig:
+    handshake_delay: float = 0.0  # 握手前延迟（毫秒）
+    handshake_jitter: float = 0.0  # 握手延迟抖动（毫秒）
+    reject_rate: float = 0.0  # 握手直接返回 503 的概率
+    drop_rate: float = 0.0  # 握手成功后立即断开的概率
+    drop_after: float = 0.0  # 连接保持多少秒后由服务端断开，0 为不断开
+    require_headers: bool = True  # 缺少 token/devCode 时返回 401
+
+
+class FakeWSServer:
+    def __init__(self, fault: Optional[WSFaultConfig] = None):
+        self.fault = fault or WSFaultConfig()
+        self.stats: Dict[str, int] = {
+            "handshakes": 0,
+            "active": 0,
+            "max_active": 0,
+            "pings": 0,
+            "rejected": 0,
+            "dropped": 0,
+        }
+
+    async def websocket(self, request: web.Request):
+        fault = self.fault
+        if fault.require_headers and not (request.headers.get("token") and request.headers.get("devCode")):
+            self.stats["rejected"] += 1
+            return web.Response(status=401, text="missing token/devCode")
+
+        if fault.handshake_delay or fault.handshake_jitter:
+            delay = fault.handshake_delay + random.uniform(-fault.handshake_jitter, fault.handshake_jitter)
+            await asyncio.sleep(max(0.0, delay) / 1000)
+
+        if random.random() < fault.reject_rate:
+            self.stats["rejected"] += 1
+            return web.Response(status=503, text="Service Unavailable")
+
+        ws = web.WebSocketResponse(heartbeat=None)
+        await ws.prepare(request)
+        stats = self.stats
+        stats["handshakes"] += 1
+        stats["active"] += 1
+        stats["max_active"] = max(stats["max_active"], stats["active"])
+
+        drop_task = None
+        if fault.drop_after > 0:
+            drop_task = asyncio.create_task(self._close_later(ws, fault.drop_after))
+        try:
+            if random.random() < fault.drop_rate:
+                stats["dropped"] += 1
+                await ws.close()
+                return ws
+
+            async for msg in ws:
+                if msg.type == WSMsgType.TEXT:
+                    try:
+                        event = json.loads(msg.data)
+                    except ValueError:
+                        continue
+                    if event.get("event") == "ping":
+                        stats["pings"] += 1
+                        await ws.send_str(json.dumps({"event": "pong", "data": event.get("data")}))
+                elif msg.type in (WSMsgType.ERROR, WSMsgType.CLOSE):
+                    break
+        finally:
+            stats["active"] -= 1
+            if drop_task:
+                drop_task.cancel()
+        return ws
+
+    async def _close_later(self, ws: web.WebSocketResponse, seconds: float):
+        await asyncio.sleep(seconds)
+        if not ws.closed:
+            self.stats["dropped"] += 1
+            await ws.close()
+
+    async def get_stats(self, request: web.Request):
+        return web.json_response(self.stats)
+
+    def add_routes(self, app: web.Application):
+        app.router.add_get(WS_PATH, self.websocket)
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        self.add_routes(app)
+        app.router.add_get("/_stats", self.get_stats)
+        return app
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="皎皎角社区 WebSocket 本地模拟服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8849)
+    parser.add_argument("--handshake-delay", type=float, default=0, help="握手延迟(毫秒)")
+    parser.add_argument("--handshake-jitter", type=float, default=0, help="握手延迟抖动(毫秒)")
+    parser.add_argument("--reject-rate", type=float, default=0, help="握手返回 503 的概率")
+    parser.add_argument("--drop-rate", type=float, default=0, help="握手后立即断开的概率")
+    parser.add_argument("--drop-after", type=float, default=0, help="连接保持多少秒后断开，0 为不断开")
+    parser.add_argument("--no-require-headers", action="store_true", help="不校验 token/devCode 请求头")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    fault = WSFaultConfig(
+        handshake_delay=args.handshake_delay,
+        handshake_jitter=args.handshake_jitter,
+        reject_rate=args.reject_rate,
+        drop_rate=args.drop_rate,
+        drop_after=args.drop_after,
+        require_headers=not args.no_require_headers,
+    )
+    web.run_app(FakeWSServer(fault).make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
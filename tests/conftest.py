@@ -0,0 +1,55 @@
+"""测试公共夹具
+
+只加载 DNAUID/utils/utils.py，不执行插件的 __init__，不需要启动 gsuid_core。
+"""
+
+import sys
+import types
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+UTILS_PATH = Path(__file__).resolve().parent.parent / "DNAUID" / "utils" / "utils.py"
+
+
+def _load_utils() -> types.ModuleType:
+    if "gsuid_core.models" not in sys.modules:
+        try:
+            importlib.import_module("gsuid_core.models")
+        except ImportError:
+            # utils.py 只把 Event 用作类型注解
+            gsuid_core = sys.modules.setdefault("gsuid_core", types.ModuleType("gsuid_core"))
+            models = types.ModuleType("gsuid_core.models")
+            models.Event = object  # type: ignore[attr-defined]
+            gsuid_core.models = models  # type: ignore[attr-defined]
+            sys.modules["gsuid_core.models"] = models
+
+    spec = importlib.util.spec_from_file_location("_dna_utils_test", UTILS_PATH)
+    module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+@pytest.fixture(scope="session")
+def utils() -> types.ModuleType:
+    return _load_utils()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(utils, monkeypatch) -> FakeClock:
+    """替换 utils 模块中的 time，不影响事件循环的计时"""
+    fake = FakeClock()
+    monkeypatch.setattr(utils, "time", types.SimpleNamespace(monotonic=fake.monotonic, time=fake.monotonic))
+    return fake
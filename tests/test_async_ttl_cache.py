@@ -0,0 +1,183 @@
+import asyncio
+
+import pytest
+
+
+def test_ttl_expiry(utils, clock):
+    cache = utils.AsyncTTLCache(ttl=10)
+    cache.set("a", 1)
+
+    clock.advance(9.9)
+    assert cache.get("a") == (True, 1)
+
+    clock.advance(0.2)
+    assert cache.get("a") == (False, None)
+    assert cache.info()["size"] == 0
+    assert cache.info()["hits"] == 1
+    assert cache.info()["misses"] == 1
+
+
+def test_maxsize_evicts_least_recently_used(utils, clock):
+    cache = utils.AsyncTTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # 访问 a 后 b 成为最久未使用
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+    assert cache.info()["evictions"] == 1
+    assert cache.info()["size"] == 2
+
+
+def test_condition_uses_negative_ttl(utils, clock):
+    cache = utils.AsyncTTLCache(ttl=60, negative_ttl=5, condition=lambda x: x is not None)
+    cache.set("ok", 1)
+    cache.set("miss", None)
+
+    clock.advance(6)
+    assert cache.get("miss") == (False, None)
+    assert cache.get("ok") == (True, 1)
+
+
+def test_condition_without_negative_ttl_is_not_cached(utils, clock):
+    cache = utils.AsyncTTLCache(ttl=60, condition=lambda x: x is not None)
+    cache.set("a", 1)
+    # 不满足条件的结果不缓存，并清除旧值
+    cache.set("a", None)
+    assert cache.get("a") == (False, None)
+
+
+def test_decorator_keys_and_invalidate(utils, clock):
+    calls = []
+
+    @utils.async_ttl_cache(60, key_args=("uid",))
+    async def load(uid: str, token: str = ""):
+        calls.append(uid)
+        return f"{uid}-{len(calls)}"
+
+    async def main():
+        assert await load("1", token="x") == "1-1"
+        # token 不参与缓存键
+        assert await load("1", token="y") == "1-1"
+        assert await load("2") == "2-2"
+
+        load.cache_invalidate("1")
+        assert await load("1") == "1-3"
+
+        load.cache_clear()
+        assert await load("2") == "2-4"
+
+    asyncio.run(main())
+    assert calls == ["1", "2", "1", "2"]
+    assert load.cache_info()["size"] == 1
+
+
+def test_decorator_expires(utils, clock):
+    calls = 0
+
+    @utils.async_ttl_cache(10)
+    async def load():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def main():
+        assert await load() == 1
+        clock.advance(5)
+        assert await load() == 1
+        clock.advance(6)
+        assert await load() == 2
+
+    asyncio.run(main())
+
+
+def test_concurrent_misses_share_one_load(utils, clock):
+    calls = 0
+
+    @utils.async_ttl_cache(60)
+    async def load(key: str):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return key.upper()
+
+    async def main():
+        return await asyncio.gather(*(load("a") for _ in range(10)), load("b"))
+
+    assert asyncio.run(main()) == ["A"] * 10 + ["B"]
+    assert calls == 2
+    assert load.cache.info()["size"] == 2
+    assert load.cache._flight.info() == {"inflight": 0, "leaders": 2, "shared": 9}
+
+
+def test_concurrent_failure_is_shared_and_not_cached(utils, clock):
+    calls = 0
+
+    @utils.async_ttl_cache(60)
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if calls == 1:
+            raise ValueError("boom")
+        return calls
+
+    async def main():
+        results = await asyncio.gather(*(load() for _ in range(5)), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        assert calls == 1
+        assert load.cache.info()["size"] == 0
+        # 失败结果不缓存，下一次重新加载
+        assert await load() == 2
+        assert await load() == 2
+
+    asyncio.run(main())
+    assert calls == 2
+
+
+def test_waiter_cancel_does_not_cancel_leader(utils, clock):
+    @utils.async_ttl_cache(60)
+    async def load():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        leader = asyncio.create_task(load())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(load())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert await leader == "done"
+
+    asyncio.run(main())
+
+
+def test_leader_cancel_elects_new_leader(utils, clock):
+    calls = 0
+
+    @utils.async_ttl_cache(60)
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return calls
+
+    async def main():
+        leader = asyncio.create_task(load())
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(load()) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        # 等待者不受影响，由其中一个重新执行，其余共享结果
+        assert await asyncio.gather(*waiters) == [2, 2, 2]
+        assert load.cache._flight.info()["inflight"] == 0
+
+    asyncio.run(main())
+    assert calls == 2